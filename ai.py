@@ -9,8 +9,11 @@
 
 
 import random
+from config import GRID_SIZE
+from game_logic import CellPool
+from placement_index import free_placements, random_fleet
+from strategies import HuntTargetStrategy, ProbabilityDensityStrategy
 
-GRID_SIZE = 10  
 """This class would be later replaced with the fully functional boat class."""
 class Boat:
     def __init__(self, length):
@@ -18,49 +21,53 @@ class Boat:
         self.positions = []
 
 class Board:
-    def __init__(self):
-        self.grid = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
+    def __init__(self, size=GRID_SIZE):
+        self.size = size
+        self.grid = [[0] * size for _ in range(size)]
         self.boats = []
+        self.occupied = 0  # Placement mask of the boats, bit y * size + x
+        self.boat_at = {}  # (x, y) -> boat on that cell
+        self.untargeted = CellPool(size, size)  # Cells not shot at yet
 
-    def place_boat(self, boat):
-        placed = False
-        while not placed:
-            orientation = random.choice(["H", "V"])
-            if orientation == "H":
-                x = random.randint(0, GRID_SIZE - boat.length)
-                y = random.randint(0, GRID_SIZE - 1)
-                if all(self.grid[x + i][y] == 0 for i in range(boat.length)):
-                    for i in range(boat.length):
-                        self.grid[x + i][y] = 1
-                        boat.positions.append((x + i, y))
-                    placed = True
+    def set_boat(self, boat, placement):
+        x, y = placement.start
+        for i in range(boat.length):
+            if placement.orientation == "horizontal":
+                position = (x + i, y)
             else:
-                x = random.randint(0, GRID_SIZE - 1)
-                y = random.randint(0, GRID_SIZE - boat.length)
-                if all(self.grid[x][y + i] == 0 for i in range(boat.length)):
-                    for i in range(boat.length):
-                        self.grid[x][y + i] = 1
-                        boat.positions.append((x, y + i))
-                    placed = True
+                position = (x, y + i)
+            self.grid[position[0]][position[1]] = 1
+            boat.positions.append(position)
+            self.boat_at[position] = boat
+        self.occupied |= placement.mask
+
+    def place_boat(self, boat):
+        # Pick uniformly from the placements that are still free instead of retrying random spots
+        options = free_placements(self.size, self.size, boat.length, self.occupied)
+        if not options:
+            raise ValueError(f"No room left for a boat of length {boat.length}")
+        self.set_boat(boat, random.choice(options))
 
     def place_ai_boats(self, num_boats):
-        for _ in range(num_boats):
-            boat_length = random.randint(2, 5)
-            boat = Boat(boat_length)
-            self.place_boat(boat)
+        boats = [Boat(random.randint(2, 5)) for _ in range(num_boats)]
+        for boat, placement in zip(boats, random_fleet(self.size, self.size, [boat.length for boat in boats], self.occupied)):
+            self.set_boat(boat, placement)
             self.boats.append(boat)
 
     def is_hit(self, x, y):
         return self.grid[x][y] == 1
 
 class AIPlayer:
-    def __init__(self, difficulty, num_boats):
+    def __init__(self, difficulty, num_boats, size=GRID_SIZE):
         self.difficulty = difficulty
-        self.board = Board()
+        self.board = Board(size)
         self.board.place_ai_boats(num_boats)
         # Add hits and misses attributes
         self.hits = []
         self.misses = []
+        self.sunk_ships = []  # Positions of each opponent boat this player has sunk
+        self.hunt_target = None  # Medium mode target frontier, built on the first move
+        self.density = None  # Hard mode placement counts, built on the first move
     def make_move(self, opponent_board):
         if self.difficulty == "Easy":
             x, y = self.easy_move(opponent_board)
@@ -70,35 +77,41 @@ class AIPlayer:
             x, y = self.hard_move(opponent_board)
         else:
             raise ValueError("Invalid difficulty level")
+        opponent_board.untargeted.remove(x, y)
         # Check if the move hits or misses
         if opponent_board.is_hit(x, y):
             self.hits.append((x, y))
             opponent_board.grid[x][y] = 2  # Mark as hit
+            boat = opponent_board.boat_at[(x, y)]
+            if all(opponent_board.grid[bx][by] == 2 for bx, by in boat.positions):
+                self.sunk_ships.append(boat.positions)
         else:
             self.misses.append((x, y))
             opponent_board.grid[x][y] = -1  # Mark as miss
         return x, y
 
     def easy_move(self, opponent_board):
-        x, y = random.randint(0, GRID_SIZE - 1), random.randint(0, GRID_SIZE - 1)
-        while opponent_board.grid[x][y] == -1:
-            x, y = random.randint(0, GRID_SIZE - 1), random.randint(0, GRID_SIZE - 1)
-        return x, y
+        # Random cell that has not been shot at, drawn in O(1) from the board's pool
+        return opponent_board.untargeted.random_cell()
 
     def medium_move(self, opponent_board):
-        hits = [(x, y) for x in range(GRID_SIZE) for y in range(GRID_SIZE) if opponent_board.grid[x][y] == 2]
-        if hits:
-            last_hit = hits[-1]
-            x, y = last_hit
-            options = [(x + dx, y + dy) for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]]
-            options = [(x, y) for x, y in options if 0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE and opponent_board.grid[x][y] == 0]
-            if options:
-                return random.choice(options)
-        return self.easy_move(opponent_board)
+        # Work the frontier around unsunk hits, kept up to date from our own shot results
+        if self.hunt_target is None:
+            # grid is indexed [x][y], so its length is the number of columns
+            self.hunt_target = HuntTargetStrategy(len(opponent_board.grid[0]), len(opponent_board.grid))
+        self.hunt_target.observe(self.hits, self.misses, self.sunk_ships)
+        x, y = self.hunt_target.choose_move()
+        if x is None:
+            return self.easy_move(opponent_board)
+        return x, y
 
     def hard_move(self, opponent_board):
-        for x in range(GRID_SIZE):
-            for y in range(GRID_SIZE):
-                if opponent_board.is_hit(x, y) and opponent_board.grid[x][y] != -1:
-                    return x, y
-        return self.easy_move(opponent_board)
+        # Shoot where the most placements of the opponent's boats fit the hits and misses so far
+        if self.density is None:
+            self.density = ProbabilityDensityStrategy(
+                len(opponent_board.grid[0]), len(opponent_board.grid), [boat.length for boat in opponent_board.boats])
+        self.density.observe(self.hits, self.misses, self.sunk_ships)
+        x, y = self.density.choose_move()
+        if x is None:
+            return self.easy_move(opponent_board)
+        return x, y
@@ -0,0 +1,117 @@
+"""Compute AI moves off the render thread.
+
+The game loop asks an AIMoveWorker for a move and gets a MoveRequest back straight away; it
+keeps drawing and handling events and polls ready() once per frame. Each move has a time budget:
+the player's make_move(board, deadline) receives the deadline (a time.monotonic() value) so a
+searching strategy can stop and return its best move so far. If the strategy overruns the budget
+by more than GRACE_MS, the request settles on a random unplayed cell instead of freezing the game.
+
+The worker thread never touches the live game: it moves for a copy of the player's shot lists and
+strategy state, against a copy of the opponent's board. A move that arrives in time hands its
+strategy state back to the player; one that overran keeps running on its copy, which is then
+dropped, and the next request starts on a fresh thread instead of queueing behind it.
+"""
+
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import AI_MOVE_BUDGET_MS
+
+GRACE_MS = 250  # How long past the deadline to wait for the strategy before falling back
+SHARED_ATTRIBUTES = ("board", "hits", "misses", "sunk_ships")  # Owned by the game, never adopted back
+
+
+def detach(player):
+    """
+    Return a copy of `player` whose shot lists and strategy state can change without affecting
+    the player. Its own board is shared: making a move never writes to it.
+    """
+    shadow = copy.copy(player)
+    for name, value in vars(player).items():
+        if name != "board":
+            setattr(shadow, name, copy.deepcopy(value))
+    return shadow
+
+
+def adopt(player, shadow):
+    """
+    Hand the strategy state `shadow` built while moving back to `player`.
+    """
+    for name, value in vars(shadow).items():
+        if name not in SHARED_ATTRIBUTES:
+            setattr(player, name, value)
+
+
+def compute_move(player, opponent_board, deadline=None):
+    """
+    Return the next move of an AI player. Players without a strategy shoot at random.
+    """
+    if hasattr(player, "make_move"):
+        return player.make_move(opponent_board, deadline)
+    return player.board.random_attack(opponent_board)
+
+
+class MoveRequest:
+    """
+    A move being computed on the worker thread for a detached copy of the player.
+    """
+    def __init__(self, future, deadline, player, shadow, opponent_board):
+        self.future = future
+        self.deadline = deadline
+        self.player = player
+        self.shadow = shadow
+        self.opponent_board = opponent_board
+
+    def ready(self, now=None):
+        """
+        True once the move is known or the budget and grace period have run out.
+        """
+        if self.future.done():
+            return True
+        now = time.monotonic() if now is None else now
+        return now > self.deadline + GRACE_MS / 1000
+
+    def result(self):
+        """
+        Return the move (x, y). Errors raised by the strategy are re-raised here.
+        """
+        if self.future.done():
+            move = self.future.result()
+            adopt(self.player, self.shadow)
+            return move
+        # The strategy overran its budget: it finishes on its copy, which is thrown away
+        self.future.cancel()
+        return self.opponent_board.random_untargeted()
+
+
+class AIMoveWorker:
+    """
+    Background thread that computes AI moves one at a time.
+    """
+    def __init__(self, budget_ms=AI_MOVE_BUDGET_MS):
+        self.budget_ms = budget_ms
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-move")
+        self.last = None  # Latest MoveRequest
+
+    def request(self, player, opponent_board, budget_ms=None):
+        """
+        Start computing `player`'s move against `opponent_board` and return a MoveRequest.
+        """
+        budget_ms = self.budget_ms if budget_ms is None else budget_ms
+        if self.last is not None and not self.last.future.done():
+            # An abandoned move is still running; leave its thread to finish on its own
+            self.executor.shutdown(wait=False)
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-move")
+        shadow = detach(player)
+        board = copy.deepcopy(opponent_board)
+        deadline = time.monotonic() + budget_ms / 1000
+        future = self.executor.submit(compute_move, shadow, board, deadline)
+        self.last = MoveRequest(future, deadline, player, shadow, opponent_board)
+        return self.last
+
+    def shutdown(self):
+        """
+        Stop the worker without waiting for a move still being computed.
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
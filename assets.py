@@ -0,0 +1,85 @@
+"""Shared image cache for every screen.
+
+Images are decoded on first use and kept as display-format surfaces keyed by
+(path, size, rotation, alpha), so a background scaled for one screen is reused by the next and a
+rotated sprite is only built once. The cache is an LRU bounded by the pixel memory it holds
+(NAVAL_ASSET_CACHE_MB). Cached surfaces are shared: blit them, don't draw on them, and copy()
+one before changing it.
+"""
+
+import os
+from collections import OrderedDict
+
+import pygame
+
+from config import ASSET_CACHE_BYTES
+
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+
+
+def surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+class AssetManager:
+    """
+    Lazy, size-bounded LRU cache of converted image surfaces.
+    """
+    def __init__(self, base_dir=IMAGE_DIR, max_bytes=ASSET_CACHE_BYTES):
+        self.base_dir = base_dir
+        self.max_bytes = max_bytes
+        self.cache = OrderedDict()  # (path, size, rotation, alpha) -> Surface, least recently used first
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def image(self, path, size=None, rotation=0, alpha=False):
+        """
+        Return the image at `path` (relative to base_dir), scaled to `size` (width, height) if
+        given and then rotated by `rotation` degrees. alpha keeps per-pixel transparency.
+        """
+        key = (path, tuple(size) if size else None, rotation % 360, alpha)
+        surface = self.cache.get(key)
+        if surface is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+
+        if key[2]:
+            # Rotate the cached upright image rather than decoding again
+            surface = pygame.transform.rotate(self.image(path, size, 0, alpha), key[2])
+        else:
+            surface = self._load(path, alpha)
+            if size:
+                surface = pygame.transform.scale(surface, key[1])
+        if pygame.display.get_surface() is not None:  # Only keep surfaces in the display format
+            self._store(key, surface)
+        return surface
+
+    def _load(self, path, alpha):
+        surface = pygame.image.load(os.path.join(self.base_dir, path))
+        if pygame.display.get_surface() is None:  # No window yet, converting needs one
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def _store(self, key, surface):
+        size = surface_bytes(surface)
+        if size > self.max_bytes:
+            return  # Too big to keep, the caller still gets it
+        while self.cache and self.bytes + size > self.max_bytes:
+            _, evicted = self.cache.popitem(last=False)
+            self.bytes -= surface_bytes(evicted)
+        self.cache[key] = surface
+        self.bytes += size
+
+    def clear(self):
+        """
+        Drop every cached surface, e.g. after the display format changed.
+        """
+        self.cache.clear()
+        self.bytes = 0
+
+
+# Shared by every screen
+assets = AssetManager()
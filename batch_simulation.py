@@ -0,0 +1,222 @@
+"""Vectorised multi-game simulator.
+
+Holds K AI-vs-AI games as stacked NumPy arrays and advances all of them one turn per array
+operation. Each game follows the same rules as GamePlay: players alternate single shots, a hit
+does not grant an extra turn, and the game ends when the defender has no unhit ship cells left.
+Both sides shoot at random unattacked cells (the Easy strategy).
+
+Usage:
+    python batch_simulation.py --games 1000000 --batch-size 20000 --boats 5
+"""
+
+import argparse
+import json
+import random
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from config import GRID_SIZE
+from placement_index import legal_placements, random_fleet
+from simulation import fleet_for
+
+TurnResult = namedtuple("TurnResult", ["games", "cells", "hit", "sunk", "won"])
+
+
+def placement_masks(rows, cols, length):
+    """
+    Return a (P, rows * cols) bool array with one row per legal placement of a ship of `length`.
+    """
+    placements = legal_placements(rows, cols, length)
+    masks = np.zeros((len(placements), rows * cols), dtype=bool)
+    for index, placement in enumerate(placements):
+        x, y = placement.start
+        step = 1 if placement.orientation == 'horizontal' else cols
+        masks[index, y * cols + x:y * cols + x + step * length:step] = True
+    return masks
+
+
+class BatchGamePlay:
+    """
+    K independent two-player games stored as arrays.
+    ships[k, p, cell] is the 1-based ship id on player p's board (0 for water) and
+    shots[k, p, cell] marks the cells of player p's board that have been attacked.
+    """
+    def __init__(self, num_games, num_boats=5, rows=GRID_SIZE, cols=GRID_SIZE, seed=None):
+        self.num_games = num_games
+        self.rows = rows
+        self.cols = cols
+        self.ship_lengths = fleet_for(num_boats)
+        self.rng = np.random.default_rng(seed)
+
+        cells = rows * cols
+        self.ships = np.zeros((num_games, 2, cells), dtype=np.int8)
+        self.shots = np.zeros((num_games, 2, cells), dtype=bool)
+        # Remaining unhit cells per ship; column 0 is water and stays 0
+        self.health = np.zeros((num_games, 2, len(self.ship_lengths) + 1), dtype=np.int16)
+        self.remaining = np.full((num_games, 2), sum(self.ship_lengths), dtype=np.int16)
+        self.shots_fired = np.zeros((num_games, 2), dtype=np.int32)
+        self.active = np.ones(num_games, dtype=bool)
+        self.winner = np.full(num_games, -1, dtype=np.int8)  # 0 for player 1, 1 for player 2
+        self.current_player = 0  # Games advance in lockstep, so they share whose turn it is
+        self.turns = 0
+        self.place_fleets()
+        # Shooting at a random unattacked cell every turn is the same as walking a random
+        # permutation of the cells, so each attacker's order is drawn once up front
+        self.fire_order = self.rng.permuted(
+            np.tile(np.arange(cells, dtype=np.int32), (num_games, 2, 1)), axis=2)
+
+    @property
+    def occupancy(self):
+        """
+        (K, 2, rows, cols) bool view of ship cells.
+        """
+        return (self.ships > 0).reshape(self.num_games, 2, self.rows, self.cols)
+
+    @property
+    def shot_masks(self):
+        """
+        (K, 2, rows, cols) bool view of attacked cells.
+        """
+        return self.shots.reshape(self.num_games, 2, self.rows, self.cols)
+
+    def place_fleets(self):
+        """
+        Place every fleet at random, one ship length at a time across all boards at once. Boards
+        whose earlier ships leave no room for the next one are cleared and placed again with
+        random_fleet, which backtracks.
+        """
+        boards = self.ships.reshape(self.num_games * 2, -1)
+        health = self.health.reshape(self.num_games * 2, -1)
+        stuck = np.zeros(len(boards), dtype=bool)
+        for ship_id, length in enumerate(self.ship_lengths, start=1):
+            masks = placement_masks(self.rows, self.cols, length)
+            if not len(masks):
+                raise ValueError(f"A ship of length {length} does not fit on a {self.rows}x{self.cols} board")
+            occupied = (boards > 0).astype(np.float32)
+            overlaps = occupied @ masks.T.astype(np.float32)  # (boards, placements)
+            legal = overlaps == 0
+            stuck |= ~legal.any(axis=1)
+            scores = self.rng.random(legal.shape)
+            scores[~legal] = -1.0
+            chosen = masks[scores.argmax(axis=1)]  # (boards, cells)
+            chosen[stuck] = False
+            boards[chosen] = ship_id
+            health[:, ship_id] = length
+
+        for board in np.flatnonzero(stuck):
+            boards[board] = 0
+            seed = int(self.rng.integers(2 ** 63))
+            fleet = random_fleet(self.rows, self.cols, self.ship_lengths, rng=random.Random(seed))
+            for ship_id, placement in enumerate(fleet, start=1):
+                x, y = placement.start
+                step = 1 if placement.orientation == 'horizontal' else self.cols
+                boards[board, y * self.cols + x:y * self.cols + x + step * placement.length:step] = ship_id
+
+    def choose_cells(self, games, attacker):
+        """
+        Pick a random unattacked cell on the defender's board for each game in `games`.
+        """
+        return self.fire_order[games, attacker, self.shots_fired[games, attacker]]
+
+    def step(self):
+        """
+        Advance every unfinished game by one shot and return what happened as a TurnResult.
+        """
+        attacker = self.current_player
+        defender = 1 - attacker
+        games = np.flatnonzero(self.active)
+        cells = self.choose_cells(games, attacker)
+
+        self.shots[games, defender, cells] = True
+        self.shots_fired[games, attacker] += 1
+        ship_ids = self.ships[games, defender, cells]
+        hit = ship_ids > 0
+        self.health[games[hit], defender, ship_ids[hit]] -= 1
+        self.remaining[games[hit], defender] -= 1
+        sunk = hit & (self.health[games, defender, ship_ids] == 0)
+        won = self.remaining[games, defender] == 0
+
+        self.winner[games[won]] = attacker
+        self.active[games[won]] = False
+        self.current_player = defender
+        self.turns += 1
+        return TurnResult(games, cells, hit, sunk, won)
+
+    def run(self):
+        """
+        Play every game to completion.
+        """
+        while self.active.any():
+            self.step()
+
+    def shots_to_win(self):
+        """
+        Number of shots each finished game's winner fired.
+        """
+        finished = np.flatnonzero(self.winner >= 0)
+        return self.shots_fired[finished, self.winner[finished]]
+
+
+def run_batches(games, batch_size=10000, num_boats=5, rows=GRID_SIZE, cols=GRID_SIZE, seed=None):
+    """
+    Play `games` games in batches of `batch_size` and return the summary report.
+    """
+    seeds = np.random.SeedSequence(seed).spawn((games + batch_size - 1) // batch_size)
+    shots = []
+    player1_wins = 0
+    start_time = time.perf_counter()
+    for batch_index, start in enumerate(range(0, games, batch_size)):
+        batch = BatchGamePlay(min(batch_size, games - start), num_boats, rows, cols, seeds[batch_index])
+        batch.run()
+        shots.append(batch.shots_to_win())
+        player1_wins += int((batch.winner == 0).sum())
+    elapsed = time.perf_counter() - start_time
+
+    shots = np.concatenate(shots) if shots else np.zeros(0, dtype=np.int32)
+    counts = np.bincount(shots) if len(shots) else np.zeros(0, dtype=np.int64)
+    return {
+        "games": int(len(shots)),
+        "elapsed_seconds": elapsed,
+        "games_per_second": len(shots) / elapsed if elapsed > 0 else float("inf"),
+        "player1_wins": player1_wins,
+        "player2_wins": int(len(shots)) - player1_wins,
+        "shots_to_win": {
+            "mean": float(shots.mean()) if len(shots) else None,
+            "min": int(shots.min()) if len(shots) else None,
+            "p50": int(np.percentile(shots, 50, method="inverted_cdf")) if len(shots) else None,
+            "p90": int(np.percentile(shots, 90, method="inverted_cdf")) if len(shots) else None,
+            "p99": int(np.percentile(shots, 99, method="inverted_cdf")) if len(shots) else None,
+            "max": int(shots.max()) if len(shots) else None,
+            "histogram": {int(value): int(count) for value, count in enumerate(counts) if count},
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run vectorised random-vs-random Battleship simulations.")
+    parser.add_argument("--games", type=int, default=100000, help="number of games to play")
+    parser.add_argument("--batch-size", type=int, default=10000, help="games held in memory at once")
+    parser.add_argument("--boats", type=int, default=5, choices=range(1, 6), help="number of boats per fleet")
+    parser.add_argument("--rows", type=int, default=GRID_SIZE)
+    parser.add_argument("--cols", type=int, default=GRID_SIZE)
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible runs")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run_batches(args.games, args.batch_size, args.boats, args.rows, args.cols, args.seed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    shots = report["shots_to_win"]
+    print(f"{report['games']} games in {report['elapsed_seconds']:.2f}s "
+          f"({report['games_per_second']:.1f} games/sec)")
+    print(f"Wins: Player 1 {report['player1_wins']}, Player 2 {report['player2_wins']}")
+    if report["games"]:
+        print(f"Shots to win: mean {shots['mean']:.2f}, min {shots['min']}, p50 {shots['p50']}, "
+              f"p90 {shots['p90']}, p99 {shots['p99']}, max {shots['max']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""Benchmarks for the engine hot paths.
+
+Times board placement, GamePlay attacks/turns/victory checks, every AI move function and full
+headless games across grid sizes and fleet sizes. Results are seconds per operation (best of
+several rounds) and can be saved as a JSON baseline and compared against later runs.
+
+Usage:
+    python benchmarks.py --save benchmark_baseline.json
+    python benchmarks.py --compare benchmark_baseline.json --threshold 0.15
+"""
+
+import argparse
+import fnmatch
+import json
+import platform
+import random
+import sys
+import time
+
+import ai
+from game_logic import GameBoard, FLEET_LENGTHS
+from naval_warfare_game import GamePlay
+from placement_index import random_fleet
+from player import Player, AIPlayer
+from simulation import BOARD_ENGINES, play_game
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+GRID_SIZES = [10, 20, 40]
+FLEET_SIZES = [1, 3, 5]
+QUICK_GRID_SIZES = [10]
+QUICK_FLEET_SIZES = [5]
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+
+
+def measure(run, repeat=5, min_time=0.05):
+    """
+    Return the best seconds-per-op over `repeat` rounds.
+    run() builds its own state and returns (elapsed seconds, ops) for the timed part only;
+    each round calls it until at least min_time seconds have been timed.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        elapsed = 0.0
+        ops = 0
+        while elapsed < min_time:
+            run_elapsed, run_ops = run()
+            elapsed += run_elapsed
+            ops += run_ops
+        best = min(best, elapsed / ops)
+    return best
+
+
+def new_game(engine, size, num_boats, player_class=Player):
+    board_class = BOARD_ENGINES[engine]
+    player1 = player_class("Player 1", board_class(size, size))
+    player2 = player_class("Player 2", board_class(size, size))
+    for player in (player1, player2):
+        player.board.randomly_place_ships(FLEET_LENGTHS[:num_boats])
+    return GamePlay(player1, player2, verbose=False)
+
+
+def shot_order(size):
+    cells = [(x, y) for y in range(size) for x in range(size)]
+    random.shuffle(cells)
+    return cells
+
+
+def bench_place_ship(engine, size, num_boats):
+    def run():
+        board = BOARD_ENGINES[engine](size, size)
+        fleet = random_fleet(size, size, FLEET_LENGTHS[:num_boats])
+        start = time.perf_counter()
+        for placement in fleet:
+            board.place_ship(placement.length, placement.orientation, placement.start)
+        return time.perf_counter() - start, len(fleet)
+    return run
+
+
+def bench_randomly_place_ships(engine, size, num_boats):
+    def run():
+        board = BOARD_ENGINES[engine](size, size)
+        start = time.perf_counter()
+        board.randomly_place_ships(FLEET_LENGTHS[:num_boats])
+        return time.perf_counter() - start, 1
+    return run
+
+
+def bench_attack(engine, size, num_boats):
+    def run():
+        game = new_game(engine, size, num_boats)
+        shots = shot_order(size)
+        start = time.perf_counter()
+        for x, y in shots:
+            game.attack(x, y)
+        return time.perf_counter() - start, len(shots)
+    return run
+
+
+def bench_process_turn(engine, size, num_boats):
+    def run():
+        game = new_game(engine, size, num_boats)
+        orders = {game.player1.name: shot_order(size), game.player2.name: shot_order(size)}
+        turns = 0
+        start = time.perf_counter()
+        while not game.game_over:
+            game.process_turn(*orders[game.current_player.name].pop())
+            turns += 1
+        return time.perf_counter() - start, turns
+    return run
+
+
+def bench_check_victory(engine, size, num_boats):
+    def run():
+        game = new_game(engine, size, num_boats)
+        for x, y in shot_order(size)[:size * size // 2]:  # Half-played board, no winner yet
+            game.attack(x, y)
+        game.opponent.board.ship_cells_left += 1  # Make sure the check keeps returning False
+        calls = 1000
+        start = time.perf_counter()
+        for _ in range(calls):
+            game.check_victory()
+        return time.perf_counter() - start, calls
+    return run
+
+
+def bench_player_move(difficulty, size, num_boats):
+    """
+    player.AIPlayer.make_move over a whole game against a passive opponent.
+    """
+    def run():
+        attacker = AIPlayer("AI", difficulty, num_boats, GameBoard(size, size))
+        defender = Player("Target", GameBoard(size, size))
+        defender.board.randomly_place_ships(FLEET_LENGTHS[:num_boats])
+        game = GamePlay(attacker, defender, verbose=False)
+        elapsed = 0.0
+        moves = 0
+        while defender.board.has_remaining_ships():
+            start = time.perf_counter()
+            x, y = attacker.make_move(defender.board)
+            elapsed += time.perf_counter() - start
+            game.attack(x, y)
+            moves += 1
+        return elapsed, moves
+    return run
+
+
+def bench_ai_move(difficulty, size, num_boats):
+    """
+    ai.AIPlayer.make_move (choose and apply a shot) over a whole game against a passive opponent.
+    """
+    def run():
+        attacker = ai.AIPlayer(difficulty, num_boats, size)
+        defender = ai.AIPlayer("Easy", num_boats, size)
+        ship_cells = sum(boat.length for boat in defender.board.boats)
+        moves = 0
+        start = time.perf_counter()
+        while len(attacker.hits) < ship_cells:
+            attacker.make_move(defender.board)
+            moves += 1
+        return time.perf_counter() - start, moves
+    return run
+
+
+def bench_full_game(difficulty, size, num_boats):
+    def run():
+        spec = f"player:{difficulty}"
+        start = time.perf_counter()
+        play_game(spec, spec, num_boats, size, size)
+        return time.perf_counter() - start, 1
+    return run
+
+
+def cases(grid_sizes, fleet_sizes):
+    """
+    Yield (name, run factory) for every benchmark case.
+    """
+    for size in grid_sizes:
+        for num_boats in fleet_sizes:
+            params = f"size={size},boats={num_boats}"
+            for engine in BOARD_ENGINES:
+                yield f"place_ship[engine={engine},{params}]", bench_place_ship(engine, size, num_boats)
+                yield f"randomly_place_ships[engine={engine},{params}]", bench_randomly_place_ships(engine, size, num_boats)
+                yield f"attack[engine={engine},{params}]", bench_attack(engine, size, num_boats)
+                yield f"process_turn[engine={engine},{params}]", bench_process_turn(engine, size, num_boats)
+                yield f"check_victory[engine={engine},{params}]", bench_check_victory(engine, size, num_boats)
+            for difficulty in DIFFICULTIES:
+                yield f"player_move[{difficulty},{params}]", bench_player_move(difficulty, size, num_boats)
+                yield f"ai_move[{difficulty},{params}]", bench_ai_move(difficulty, size, num_boats)
+                yield f"full_game[{difficulty},{params}]", bench_full_game(difficulty, size, num_boats)
+
+
+def run_benchmarks(grid_sizes, fleet_sizes, pattern="*", repeat=5, min_time=0.05, seed=0, out=sys.stdout):
+    """
+    Run every case whose name matches pattern and return {name: seconds per op}.
+    """
+    random.seed(seed)
+    results = {}
+    for name, run in cases(grid_sizes, fleet_sizes):
+        if not fnmatch.fnmatch(name, pattern):
+            continue
+        results[name] = measure(run, repeat, min_time)
+        print(f"{name:70s} {format_seconds(results[name]):>12s}", file=out)
+    return results
+
+
+def format_seconds(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def compare(results, baseline, threshold):
+    """
+    Return (name, baseline, current, ratio) for every case slower than baseline by more than threshold.
+    """
+    regressions = []
+    for name, current in sorted(results.items()):
+        previous = baseline.get(name)
+        if previous and current > previous * (1 + threshold):
+            regressions.append((name, previous, current, current / previous))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Battleship engine hot paths.")
+    parser.add_argument("--filter", default="*", help="only run cases matching this glob, e.g. 'attack*'")
+    parser.add_argument("--sizes", type=int, nargs="+", default=None, help="grid sizes to benchmark")
+    parser.add_argument("--boats", type=int, nargs="+", default=None, help="fleet sizes to benchmark")
+    parser.add_argument("--quick", action="store_true", help="only the 10x10, 5 boat cases")
+    parser.add_argument("--repeat", type=int, default=5, help="rounds per case, the best one counts")
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds timed per round")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, help="write results to a JSON baseline")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before flagging, 0.10 = 10%%")
+    args = parser.parse_args(argv)
+
+    grid_sizes = args.sizes or (QUICK_GRID_SIZES if args.quick else GRID_SIZES)
+    fleet_sizes = args.boats or (QUICK_FLEET_SIZES if args.quick else FLEET_SIZES)
+    results = run_benchmarks(grid_sizes, fleet_sizes, args.filter, args.repeat, args.min_time)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "results": results,
+            }, file, indent=2, sort_keys=True)
+        print(f"Saved {len(results)} results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, previous, current, ratio in regressions:
+            print(f"REGRESSION {name}: {format_seconds(previous)} -> {format_seconds(current)} ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
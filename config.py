@@ -0,0 +1,41 @@
+import os
+
+# Board size shared by every screen, AI and simulator.
+# Set NAVAL_GRID_SIZE to play or simulate on a custom square grid.
+GRID_SIZE = int(os.environ.get("NAVAL_GRID_SIZE", "10"))
+
+# Headless mode for servers and CI (see headless.py): SDL's dummy video and audio drivers, so
+# the screens draw to off-screen surfaces. NAVAL_HEADLESS=1 also drops the feedback pauses.
+HEADLESS = os.environ.get("NAVAL_HEADLESS", "") not in ("", "0")
+if HEADLESS:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Frame-time profiling for the pygame screens (see instrumentation.py).
+# NAVAL_PROFILE=1 records from the start and shows the overlay; F3 toggles it at any time.
+# The per-section report is written to NAVAL_PROFILE_REPORT on exit, or to stderr if unset.
+PROFILE = os.environ.get("NAVAL_PROFILE", "") not in ("", "0")
+PROFILE_REPORT = os.environ.get("NAVAL_PROFILE_REPORT")
+
+# Frame-rate cap for the pygame screens (see frame_loop.py).
+FRAME_RATE = int(os.environ.get("NAVAL_FRAME_RATE", "60"))
+
+# Memory cap for decoded and scaled images (see assets.py).
+ASSET_CACHE_BYTES = int(os.environ.get("NAVAL_ASSET_CACHE_MB", "64")) * 1024 * 1024
+
+# Seconds the hit/miss feedback and the turn blackout stay on screen; 0 skips them.
+FEEDBACK_SECONDS = float(os.environ.get("NAVAL_FEEDBACK_SECONDS", "0" if HEADLESS else "2"))
+TRANSITION_SECONDS = float(os.environ.get("NAVAL_TRANSITION_SECONDS", "0" if HEADLESS else "2"))
+
+# Time budget for one AI move in the GUI, in milliseconds (see ai_worker.py).
+AI_MOVE_BUDGET_MS = int(os.environ.get("NAVAL_AI_BUDGET_MS", "1000"))
+
+# Precomputed opening heatmaps for the Hard AI (see heatmap_cache.py).
+HEATMAP_DIR = os.environ.get("NAVAL_HEATMAP_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "heatmaps"))
+
+# Network game server (see server.py): where it listens and how long a player may take to move.
+SERVER_HOST = os.environ.get("NAVAL_SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.environ.get("NAVAL_SERVER_PORT", "8765"))
+TURN_TIMEOUT = float(os.environ.get("NAVAL_TURN_TIMEOUT", "30"))
+# Seconds between writes of the queued --archive snapshots; a crash loses at most this much play.
+ARCHIVE_FLUSH_SECONDS = float(os.environ.get("NAVAL_ARCHIVE_FLUSH_SECONDS", "1"))
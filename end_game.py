@@ -1,5 +1,8 @@
 import pygame
 import sys
+from frame_loop import FrameLoop
+from assets import assets
+from fonts import get_font, render_text
 
 def scorecard_screen(game_stats, background_image_path):
     pygame.init()
@@ -9,28 +12,28 @@ def scorecard_screen(game_stats, background_image_path):
     window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption("Scorecard")
 
-    # Background image load and scaling here
-    background_image = pygame.image.load("images/bg4.png").convert()
-    background_image = pygame.transform.scale(background_image, (WINDOW_WIDTH, WINDOW_HEIGHT))
+    # Background image, shared with the other screens through the asset manager
+    background_image = assets.image("bg4.png", (WINDOW_WIDTH, WINDOW_HEIGHT))
 
     # FONT
-    title_font = pygame.font.Font(None, 72)
-    table_font = pygame.font.Font(None, 36)
-    button_font = pygame.font.Font(None, 28)
+    title_font = get_font(72)
+    table_font = get_font(36)
+    button_font = get_font(28)
 
     # Button
     main_menu_button = pygame.Rect(WINDOW_WIDTH // 2 - 150, WINDOW_HEIGHT - 100, 140, 40)
     exit_button = pygame.Rect(WINDOW_WIDTH // 2 + 10, WINDOW_HEIGHT - 100, 140, 40)
 
+    loop = FrameLoop("scorecard")
     running = True
     while running:
-        for event in pygame.event.get():
+        for event in loop.events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
 
             if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
+                mouse_x, mouse_y = event.pos
 
                 if main_menu_button.collidepoint(mouse_x, mouse_y):
                     print("Return to Main Menu")  # backend integration PLACEHOLDER
@@ -40,12 +43,15 @@ def scorecard_screen(game_stats, background_image_path):
                     pygame.quit()
                     sys.exit()
 
+        # The scorecard is static, so it is only drawn when the window needs it
+        if not running or not loop.redraw_needed():
+            continue
         # background
         window.blit(background_image, (0, 0))
 
         # Draw winner
         winner_text = f"Winner: {game_stats['winner']}"
-        winner_surface = title_font.render(winner_text, True, (200, 200, 200))
+        winner_surface = render_text(title_font, winner_text, (200, 200, 200))
         winner_rect = winner_surface.get_rect(center=(WINDOW_WIDTH // 2, 50))
         window.blit(winner_surface, winner_rect)
 
@@ -65,26 +71,26 @@ def scorecard_screen(game_stats, background_image_path):
 
         # Draw text headers
         for i, header in enumerate(stats_headers):
-            header_surface = table_font.render(header, True, (200, 200, 200))
+            header_surface = render_text(table_font, header, (200, 200, 200))
             header_x = 50 + i * 300
             window.blit(header_surface, (header_x, header_y))
 
         # Draw table rows
         for row_index, row_data in enumerate(stats_data):
             for col_index, cell in enumerate(row_data):
-                cell_surface = table_font.render(str(cell), True, (0, 0, 0))
+                cell_surface = render_text(table_font, str(cell), (0, 0, 0))
                 cell_x = 50 + col_index * 300
                 cell_y = table_start_y + (row_index + 1) * row_height
                 window.blit(cell_surface, (cell_x, cell_y))
 
         # Draw the button
         pygame.draw.rect(window, (0, 255, 0), main_menu_button)
-        main_menu_text = button_font.render("Main Menu", True, (0, 0, 0))
+        main_menu_text = render_text(button_font, "Main Menu", (0, 0, 0))
         window.blit(main_menu_text, (main_menu_button.x + 20, main_menu_button.y + 10))
 
         pygame.draw.rect(window, (255, 0, 0), exit_button)
-        exit_text = button_font.render("Exit", True, (0, 0, 0))
+        exit_text = render_text(button_font, "Exit", (0, 0, 0))
         window.blit(exit_text, (exit_button.x + 50, exit_button.y + 10))
 
-        pygame.display.flip()
+        loop.present(window)
 
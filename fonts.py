@@ -0,0 +1,56 @@
+"""Shared fonts and rendered text.
+
+Each font is resolved once per (family, size, style) and each rendered string once per
+(font, text, colour, background), so menus that rebuild their buttons and screens that redraw
+the same labels reuse surfaces instead of looking up system fonts and rasterising glyphs again.
+Cached surfaces are shared: blit them, don't draw on them.
+"""
+
+import functools
+
+import pygame
+import pygame.freetype
+
+TEXT_CACHE_SIZE = 512  # Rendered strings kept, least recently used dropped first
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(size, name=None):
+    """
+    Return the pygame.font.Font for a font file (None for the default font) at `size`.
+    """
+    return pygame.font.Font(name, size)
+
+
+@functools.lru_cache(maxsize=None)
+def get_sys_font(family, size, bold=False, italic=False):
+    """
+    Return the freetype system font for (family, size, style).
+    The system font lookup is slow, so it only happens once per combination.
+    """
+    if not pygame.freetype.get_init():
+        pygame.freetype.init()
+    return pygame.freetype.SysFont(family, size, bold=bold, italic=italic)
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(font, text, colour, background=None):
+    """
+    Return `text` rendered antialiased with `font` (a pygame.font.Font or a freetype font from
+    get_sys_font) in `colour`, on `background` or transparent.
+    """
+    if isinstance(font, pygame.freetype.Font):
+        surface, _ = font.render(text=text, fgcolor=colour, bgcolor=background)
+        return surface.convert_alpha() if pygame.display.get_surface() is not None else surface
+    if background is None:
+        return font.render(text, True, colour)
+    return font.render(text, True, colour, background)
+
+
+def clear():
+    """
+    Forget every font and rendered string, e.g. after pygame.quit() invalidated them.
+    """
+    get_font.cache_clear()
+    get_sys_font.cache_clear()
+    render_text.cache_clear()
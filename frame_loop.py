@@ -0,0 +1,120 @@
+"""Shared loop driver for the pygame screens.
+
+Each screen creates a FrameLoop and, once per iteration, takes its events from events(), asks
+redraw_needed() whether anything visible changed and, if so, draws and calls present(). The
+driver caps the frame rate with a pygame Clock and, when nothing is animating and nothing needs
+drawing, blocks in pygame.event.wait with a timeout so an idle screen uses no CPU.
+
+    loop = FrameLoop("title")
+    while True:
+        for event in loop.events():
+            ...
+        if loop.redraw_needed(state):
+            ...draw...
+            loop.present(screen)
+
+In headless mode (see headless.py) a driver is installed in `driver`: frames are not capped,
+nothing blocks, scripted input is posted whenever a screen waits for the player and every
+presented frame is handed to the driver, which may save it to disk.
+"""
+
+import pygame
+
+from config import FRAME_RATE
+from instrumentation import TOGGLE_KEY, profiler
+
+IDLE_TIMEOUT_MS = 250  # Longest block in event.wait, so screens still poll their state
+EXPOSE_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.VIDEORESIZE, pygame.WINDOWFOCUSGAINED)
+
+_UNSET = object()
+
+# HeadlessDriver installed by headless.run(), None when a player is at the window
+driver = None
+
+
+class FrameLoop:
+    """
+    Frame pacing, idle blocking and redraw tracking for one screen.
+    animating: redraw every frame (at most frame_rate per second) instead of on change only.
+    """
+    def __init__(self, name, frame_rate=FRAME_RATE, idle_timeout=IDLE_TIMEOUT_MS, animating=False):
+        self.name = name
+        self.frame_rate = frame_rate
+        self.idle_timeout = idle_timeout
+        self.animating = animating
+        self.clock = pygame.time.Clock()
+        self.dirty = True  # The first frame is always drawn
+        self.drawn_state = _UNSET
+        self.mouse_pos = pygame.mouse.get_pos()
+        self.frames = 0  # Frames presented
+
+    def invalidate(self):
+        """
+        Force a redraw on the next redraw_needed() call.
+        """
+        self.dirty = True
+
+    def _idle(self):
+        return not (self.dirty or self.animating or profiler.show_overlay)
+
+    def events(self, timeout=None):
+        """
+        Finish the previous frame, wait for the next one and return its events.
+        Waits for the frame cap and, if idle, until an event arrives or idle_timeout ms (or
+        `timeout` ms, if shorter) pass. Pass a timeout while the screen is busy without input
+        (an overlay, the AI's move), so headless scripts hold their input back until it ends.
+        """
+        if profiler.screen == self.name:
+            profiler.end_frame()
+        profiler.begin_frame(self.name, section="wait")
+        events = []
+        if driver is not None:
+            self.clock.tick()  # Headless: no frame cap and no blocking
+            if timeout is None and not self.animating:
+                driver.feed(self)  # The screen is waiting for the player
+        else:
+            self.clock.tick(self.frame_rate)
+            if self._idle():
+                event = pygame.event.wait(min(self.idle_timeout, timeout or self.idle_timeout))
+                if event.type != pygame.NOEVENT:
+                    events.append(event)
+        events.extend(pygame.event.get())
+        profiler.phase("events")
+
+        for event in events:
+            profiler.handle_event(event)
+            if event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+                self.dirty = True  # Show or clear the overlay
+            if event.type in EXPOSE_EVENTS:
+                self.dirty = True
+            if hasattr(event, "pos"):
+                self.mouse_pos = event.pos
+        return events
+
+    def redraw_needed(self, state=None):
+        """
+        Return True if the frame must be drawn: something forced a redraw, the screen is
+        animating, or `state` (any comparable summary of what is on screen, such as hover flags
+        or a turn counter) differs from the last drawn frame.
+        """
+        if self.dirty or self.animating or profiler.show_overlay or state != self.drawn_state:
+            self.drawn_state = state
+            profiler.phase("draw")
+            return True
+        return False
+
+    def present(self, surface, rects=None):
+        """
+        Draw the profiler overlay and show the frame: the whole surface, or only `rects`.
+        """
+        overlay = profiler.draw_overlay(surface)
+        if rects is None:
+            pygame.display.flip()
+        else:
+            if overlay is not None:
+                rects.append(overlay)
+            pygame.display.update(rects)
+        if driver is not None:
+            driver.presented(self.name, surface)
+        self.dirty = False
+        self.frames += 1
@@ -4,11 +4,17 @@ from naval_warfare_game import GamePlay
 from player import Player
 from end_game import scorecard_screen
 import time
+from collections import deque
+from config import GRID_SIZE, FEEDBACK_SECONDS, TRANSITION_SECONDS
+from instrumentation import profiler
+from frame_loop import FrameLoop
+from ai_worker import AIMoveWorker
+from assets import assets
+from fonts import get_font, render_text
 
 # Constants
 WINDOW_WIDTH, WINDOW_HEIGHT = 1100, 600
-GRID_SIZE = 10
-CELL_SIZE = 30
+CELL_SIZE = max(1, 300 // GRID_SIZE)  # Each board is drawn 300px wide
 WHITE = (255, 255, 255)
 BLUE = (0, 0, 255)
 RED = (255, 0, 0)
@@ -16,6 +22,10 @@ BLACK = (0, 0, 0)
 LIGHT_GREY = (200, 200, 200)
 GRID_SPACING = 10  # Spacing between the two grids
 GREEN = (0, 255, 0)
+PLAYER1_OFFSET = (50, 50)  # Top left corner of Player 1's board
+PLAYER2_OFFSET = (450 + GRID_SPACING, 50)  # Top left corner of Player 2's board
+SCORECARD_OFFSET = (50, 450)
+AI_POLL_MS = 15  # How often the board checks whether the AI's move is ready
 
 def draw_grid(window, offset_x, offset_y):
     for row in range(GRID_SIZE):
@@ -27,175 +37,343 @@ def draw_grid(window, offset_x, offset_y):
                 1,
             )
 
+def cell_colour(cell, show_ships=False):
+    """
+    Fill colour of a board cell, or None if only the background shows.
+    """
+    if cell == 'X':  # Hit
+        return RED
+    elif cell == 'O':  # Miss
+        return BLUE
+    elif cell == 'S' and show_ships:  # Ship
+        return GREEN
+    return None
+
 def draw_board(window, board, offset_x, offset_y, show_ships=False):
     for y, row in enumerate(board):
         for x, cell in enumerate(row):
-            if cell == 'X':  # Hit
-                pygame.draw.rect(window, RED, pygame.Rect(offset_x + x * CELL_SIZE, offset_y + y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
-            elif cell == 'O':  # Miss
-                pygame.draw.rect(window, BLUE, pygame.Rect(offset_x + x * CELL_SIZE, offset_y + y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
-            elif cell == 'S' and show_ships:  # Ship
-                pygame.draw.rect(window, GREEN, pygame.Rect(offset_x + x * CELL_SIZE, offset_y + y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+            colour = cell_colour(cell, show_ships)
+            if colour is not None:
+                pygame.draw.rect(window, colour, pygame.Rect(offset_x + x * CELL_SIZE, offset_y + y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
             pygame.draw.rect(window, WHITE, pygame.Rect(offset_x + x * CELL_SIZE, offset_y + y * CELL_SIZE, CELL_SIZE, CELL_SIZE), 1)
 
 
 def draw_scorecard(window, font, player1, player2, offset_x, offset_y):
     """
     Render the scorecard showing player hits and misses.
+    Returns the rects that were drawn.
     """
     score_texts = [
         f"Player 1: Hits {len(player1.hits)} Misses {len(player1.misses)}",
         f"Player 2: Hits {len(player2.hits)} Misses {len(player2.misses)}"
     ]
+    rects = []
     for i, text in enumerate(score_texts):
-        text_surface = font.render(text, True, LIGHT_GREY)
-        window.blit(text_surface, (offset_x, offset_y + i * 30))
+        text_surface = render_text(font, text, LIGHT_GREY)
+        rects.append(window.blit(text_surface, (offset_x, offset_y + i * 30)))
+    return rects
 
 
-def display_turn(window, font, player_name):
-    text = f"{player_name}'s Turn"
-    text_surface = font.render(text, True, LIGHT_GREY)
-    window.blit(text_surface, (WINDOW_WIDTH // 2 - text_surface.get_width() // 2, 10))
+def display_turn(window, font, player_name, text=None):
+    text = text or f"{player_name}'s Turn"
+    text_surface = render_text(font, text, LIGHT_GREY)
+    return window.blit(text_surface, (WINDOW_WIDTH // 2 - text_surface.get_width() // 2, 10))
 
 
-def blackout_transition(window, font):
-    """
-    Display a blackout screen for 3 seconds during turn transitions.
+class BoardRenderer:
     """
-    blackout_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-    blackout_surface.fill(BLACK)
-
-    text = "Switching Turns..."
-    text_surface = font.render(text, True, WHITE)
-    text_x = (WINDOW_WIDTH - text_surface.get_width()) // 2
-    text_y = (WINDOW_HEIGHT - text_surface.get_height()) // 2
-    blackout_surface.blit(text_surface, (text_x, text_y))
-
-    # Draw the blackout screen
-    window.blit(blackout_surface, (0, 0))
-    pygame.display.flip()
-
-    # Pause for 2 seconds
-    time.sleep(2)
+    Draws the gameplay screen from a cached static layer (background plus both sets of grid
+    lines) and, between full redraws, repaints only the cells and text that changed.
 
-
-def display_feedback(window, font, message, duration=2):
+    Changed cells are found the way the AI strategies follow a game: the shots each player has
+    appended to its hits and misses since the last frame, plus the ship cells of a board whose
+    ships were shown or hidden by a turn switch.
+    """
+    def __init__(self, window, background_image, font, game):
+        self.window = window
+        self.font = font
+        self.game = game
+        self.static = background_image.copy()
+        draw_grid(self.static, *PLAYER1_OFFSET)
+        draw_grid(self.static, *PLAYER2_OFFSET)
+        self.drawn = [{}, {}]  # Per board: (x, y) -> colour currently on screen
+        self.ships_shown = [False, False]
+        self.observed_shots = [(0, 0), (0, 0)]  # Per attacker: (hits, misses) already drawn
+        self.text_rects = []
+        self.turn_text = None  # Replaces "<name>'s Turn", e.g. while the AI is thinking
+
+    def _boards(self):
+        """
+        Yield (index, defending player, attacking player, offset) for both boards on screen.
+        """
+        yield 0, self.game.player1, self.game.player2, PLAYER1_OFFSET
+        yield 1, self.game.player2, self.game.player1, PLAYER2_OFFSET
+
+    def _cell_rect(self, offset, x, y):
+        return pygame.Rect(offset[0] + x * CELL_SIZE, offset[1] + y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+
+    def _paint_cell(self, rect, colour):
+        self.window.blit(self.static, rect, rect)  # Restore the background and grid lines
+        if colour is not None:
+            pygame.draw.rect(self.window, colour, rect)
+            pygame.draw.rect(self.window, WHITE, rect, 1)
+
+    def _draw_text(self):
+        for rect in self.text_rects:
+            self.window.blit(self.static, rect, rect)
+        rects = self.text_rects
+        self.text_rects = [display_turn(self.window, self.font, self.game.current_player.name, self.turn_text)]
+        self.text_rects += draw_scorecard(self.window, self.font, self.game.player1, self.game.player2, *SCORECARD_OFFSET)
+        return rects + self.text_rects
+
+    def draw_full(self):
+        """
+        Redraw the whole screen, e.g. after an overlay covered it.
+        """
+        self.window.blit(self.static, (0, 0))
+        for index, defender, attacker, offset in self._boards():
+            show_ships = self.game.current_player == defender
+            drawn = self.drawn[index] = {}
+            for y, row in enumerate(defender.board.grid):
+                for x, cell in enumerate(row):
+                    colour = cell_colour(cell, show_ships)
+                    if colour is not None:
+                        self._paint_cell(self._cell_rect(offset, x, y), colour)
+                        drawn[x, y] = colour
+            self.ships_shown[index] = show_ships
+            self.observed_shots[index] = (len(attacker.hits), len(attacker.misses))
+        self.text_rects = []
+        self._draw_text()
+
+    def draw_changes(self):
+        """
+        Repaint what changed since the last draw and return the dirty rects.
+        """
+        rects = []
+        for index, defender, attacker, offset in self._boards():
+            seen_hits, seen_misses = self.observed_shots[index]
+            changed = set(attacker.hits[seen_hits:]) | set(attacker.misses[seen_misses:])
+            self.observed_shots[index] = (len(attacker.hits), len(attacker.misses))
+            show_ships = self.game.current_player == defender
+            if show_ships != self.ships_shown[index]:
+                self.ships_shown[index] = show_ships
+                for ship in defender.board.ships:
+                    changed.update(ship["coordinates"])
+            drawn = self.drawn[index]
+            grid = defender.board.grid
+            for x, y in changed:
+                colour = cell_colour(grid[y][x], show_ships)
+                if drawn.get((x, y)) != colour:
+                    rect = self._cell_rect(offset, x, y)
+                    self._paint_cell(rect, colour)
+                    drawn[x, y] = colour
+                    rects.append(rect)
+        return rects + self._draw_text()
+
+
+class TimedOverlay:
+    """
+    A full-window message (hit/miss feedback or the turn blackout) that stays up for `duration`
+    seconds while the game loop keeps handling events. A click skips it.
     """
-    Display feedback message like 'Hit' or 'Miss' for a specified duration.
+    def __init__(self, message, duration, alpha=255):
+        self.message = message
+        self.duration = duration
+        self.alpha = alpha  # 255 hides the board completely
+        self.ends_at = None  # Set when the overlay is first shown
+        self.backdrop = None  # The frame under a translucent overlay, kept for repaints
+
+    def start(self, now):
+        if self.ends_at is None:
+            self.ends_at = now + self.duration
+
+    def skip(self):
+        self.ends_at = 0
+
+    def finished(self, now):
+        return self.ends_at is not None and now >= self.ends_at
+
+    def remaining_ms(self, now):
+        return max(1, int((self.ends_at - now) * 1000)) if self.ends_at is not None else None
+
+    def draw(self, window, font):
+        """
+        Draw the overlay over the frame that was on the window when it first appeared.
+        """
+        overlay_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        overlay_surface.fill(BLACK)
+        if self.alpha < 255:
+            overlay_surface.set_alpha(self.alpha)  # Slight transparency
+
+        text_surface = render_text(font, self.message, WHITE)
+        text_x = (WINDOW_WIDTH - text_surface.get_width()) // 2
+        text_y = (WINDOW_HEIGHT - text_surface.get_height()) // 2
+        overlay_surface.blit(text_surface, (text_x, text_y))
+
+        if self.alpha < 255:
+            if self.backdrop is None:
+                self.backdrop = window.copy()
+            window.blit(self.backdrop, (0, 0))
+        window.blit(overlay_surface, (0, 0))
+
+
+def blackout_transition(duration=TRANSITION_SECONDS):
     """
-    feedback_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-    feedback_surface.set_alpha(200)  # Slight transparency
-    feedback_surface.fill(BLACK)
+    Blackout screen shown during turn transitions.
+    """
+    return TimedOverlay("Switching Turns...", duration)
 
-    text_surface = font.render(message, True, WHITE)
-    text_x = (WINDOW_WIDTH - text_surface.get_width()) // 2
-    text_y = (WINDOW_HEIGHT - text_surface.get_height()) // 2
-    feedback_surface.blit(text_surface, (text_x, text_y))
 
-    # Draw the feedback screen
-    window.blit(feedback_surface, (0, 0))
-    pygame.display.flip()
+def display_feedback(message, duration=FEEDBACK_SECONDS):
+    """
+    Feedback message like 'Hit' or 'Miss' shown over the board.
+    """
+    return TimedOverlay(message, duration, alpha=200)
 
-    # Pause for the specified duration
-    time.sleep(duration)
 
-def game_loop(game):
+def game_statistics(game):
+    """
+    Gather the statistics shown on the scorecard.
+    """
+    player1_accuracy = (len(game.player1.hits) / (len(game.player1.hits) + len(game.player1.misses))) * 100 if len(game.player1.hits) + len(game.player1.misses) > 0 else 0
+    player2_accuracy = (len(game.player2.hits) / (len(game.player2.hits) + len(game.player2.misses))) * 100 if len(game.player2.hits) + len(game.player2.misses) > 0 else 0
+    return {
+        'player1_hits': len(game.player1.hits),
+        'player1_misses': len(game.player1.misses),
+        'player2_hits': len(game.player2.hits),
+        'player2_misses': len(game.player2.misses),
+        'turns': game.turns,
+        'player1_turns': game.player1_turns,  # Player 1's turns
+        'player2_turns': game.player2_turns,  # Player 2's turns
+        'player1_accuracy': player1_accuracy,
+        'player2_accuracy': player2_accuracy,
+        'winner': game.winner
+    }
+
+
+def game_loop(game, feedback_duration=FEEDBACK_SECONDS, transition_duration=TRANSITION_SECONDS):
+    """
+    Run the gameplay screen until the game is over and the scorecard was shown.
+    feedback_duration / transition_duration: seconds the hit/miss feedback and the turn
+    blackout stay up (a click skips them); 0 leaves them out.
+    """
     pygame.init()
     window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption("Battleship Gameplay")
-    font = pygame.font.Font(None, 36)
+    font = get_font(36)
 
-    background_image = pygame.image.load("images/bg4.png").convert()
-    background_image = pygame.transform.scale(background_image, (1100, 600))
+    background_image = assets.image("bg4.png", (WINDOW_WIDTH, WINDOW_HEIGHT))
 
+    renderer = BoardRenderer(window, background_image, font, game)
+    worker = AIMoveWorker()
+    ai_move = None  # MoveRequest of the AI move being computed
+    overlays = deque()  # Timed overlays waiting to be shown, the first one is on screen
+    loop = FrameLoop("game")
     running = True
     while running:
-        for event in pygame.event.get():
+        # Retire finished overlays; the board is repainted once the last one is gone
+        now = time.monotonic()
+        while overlays and overlays[0].finished(now):
+            overlays.popleft()
+            if not overlays:
+                loop.invalidate()
+        if overlays:
+            overlays[0].start(now)
+
+        # Wake up for the end of an overlay, or often enough to pick up the AI's move
+        ai_turn = game.mode == "PvAI" and game.current_player == game.player2 and not game.game_over
+        if overlays:
+            timeout = overlays[0].remaining_ms(now)
+        elif ai_turn:
+            timeout = AI_POLL_MS
+        else:
+            timeout = None
+        for event in loop.events(timeout):
             if event.type == pygame.QUIT:
+                worker.shutdown()
                 pygame.quit()
                 sys.exit()
 
             if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
+                if overlays:
+                    overlays[0].skip()  # A click dismisses the overlay on screen
+                    continue
+                if game.game_over or ai_turn:
+                    continue  # The board is locked while the AI moves
+
+                mouse_x, mouse_y = event.pos
                 if game.current_player == game.player1:
-                    offset_x, offset_y = 450 + GRID_SPACING, 50
+                    offset_x, offset_y = PLAYER2_OFFSET
                 else:
-                    offset_x, offset_y = 50, 50
+                    offset_x, offset_y = PLAYER1_OFFSET
 
                 grid_x = (mouse_x - offset_x) // CELL_SIZE
                 grid_y = (mouse_y - offset_y) // CELL_SIZE
 
                 if 0 <= grid_x < GRID_SIZE and 0 <= grid_y < GRID_SIZE:
                     # Process the player's turn
-                    result = game.process_turn(grid_x, grid_y)
+                    with profiler.section("logic"):
+                        result = game.process_turn(grid_x, grid_y)
 
                     if not result["valid"]:
                         # Invalid move feedback in the console
                         print(result["message"])
                     else:
-                        # Show feedback based on the result
-                        if result.get("hit", False):  # Safely check for "hit"
-                            display_feedback(window, font, "Hit!", duration=2)
-                        else:
-                            display_feedback(window, font, "Miss!", duration=2)
-
-
-                        # Check for game over
-                        if game.game_over:
-                            print(f"Game Over! {game.winner} wins!")
-                            running = False
-
-                            # Gather game statistics
-                            player1_accuracy = (len(game.player1.hits) / (len(game.player1.hits) + len(game.player1.misses))) * 100 if len(game.player1.hits) + len(game.player1.misses) > 0 else 0
-                            player2_accuracy = (len(game.player2.hits) / (len(game.player2.hits) + len(game.player2.misses))) * 100 if len(game.player2.hits) + len(game.player2.misses) > 0 else 0
-                            game_stats = {
-                                'player1_hits': len(game.player1.hits),
-                                'player1_misses': len(game.player1.misses),
-                                'player2_hits': len(game.player2.hits),
-                                'player2_misses': len(game.player2.misses),
-                                'turns': game.turns,
-                                'player1_turns': game.player1_turns,  # Player 1's turns
-                                'player2_turns': game.player2_turns,  # Player 2's turns
-                                'player1_accuracy': player1_accuracy,
-                                'player2_accuracy': player2_accuracy,
-                                'winner': game.winner
-                            }
-
-                            # Transition to the scorecard screen
-                            scorecard_screen(game_stats, "images/bg4.png")
+                        # Show feedback based on the result, then black out the board for the turn switch
+                        if result.get("sunk", False):
+                            message = "Hit! Ship sunk!"
+                        elif result.get("hit", False):  # Safely check for "hit"
+                            message = "Hit!"
                         else:
-                            # Trigger blackout for turn transition
-                            blackout_transition(window, font)
+                            message = "Miss!"
+                        if feedback_duration > 0:
+                            overlays.append(display_feedback(message, feedback_duration))
+                        if not game.game_over and transition_duration > 0:
+                            overlays.append(blackout_transition(transition_duration))
                 else:
                     print("Click outside valid grid area.")
 
-        # AI's turn (automatic)
-        if game.mode == "PvAI" and game.current_player == game.player2:
-            print("AI is thinking...")
-            result = game.process_turn()  # AI automatically attacks
-            if not result["valid"]:
-                print(result["message"])
-            elif game.game_over:
-                print(f"Game Over! {game.winner} wins!")
-                running = False
-                scorecard_screen(game_stats, "images/bg4.png")
-
-        # Draw background
-        window.blit(background_image, (0, 0))
-
-        # Draw Player 1's grid
-        draw_grid(window, 50, 50)
-        draw_board(window, game.player1.board.grid, 50, 50, show_ships=(game.current_player == game.player1))
-
-        # Draw Player 2's grid
-        draw_grid(window, 450 + GRID_SPACING, 50)
-        draw_board(window, game.player2.board.grid, 450 + GRID_SPACING, 50, show_ships=(game.current_player == game.player2))
-
-        # Display the current player's turn
-        display_turn(window, font, game.current_player.name)
-
-        # Draw the scorecard
-        draw_scorecard(window, font, game.player1, game.player2, 50, 450)
-
-        # Update the display
-        pygame.display.flip()
\ No newline at end of file
+        # Check for game over once the last feedback was seen
+        if game.game_over and not overlays:
+            print(f"Game Over! {game.winner} wins!")
+            running = False
+
+            # Transition to the scorecard screen
+            worker.shutdown()
+            scorecard_screen(game_statistics(game), "images/bg4.png")
+            continue
+
+        # AI's turn (automatic), computed on the worker thread while the window stays live
+        if ai_turn and not overlays:
+            if ai_move is None:
+                print("AI is thinking...")
+                ai_move = worker.request(game.current_player, game.opponent.board)
+            elif ai_move.ready():
+                with profiler.section("ai"):
+                    x, y = ai_move.result()
+                    result = game.process_turn(x, y)  # AI attacks with the move it picked
+                ai_move = None
+                if not result["valid"]:
+                    print(result["message"])
+        if ai_move is not None:
+            dots = "." * int(time.monotonic() * 3 % 4)
+            renderer.turn_text = f"{game.current_player.name} is thinking{dots}"
+        else:
+            renderer.turn_text = None
+
+        if overlays:
+            # Draw an overlay once when it appears, over the frame the player was looking at
+            now = time.monotonic()
+            overlays[0].start(now)
+            if loop.redraw_needed(id(overlays[0])):
+                overlays[0].draw(window, font)
+                loop.present(window)
+
+        # Redraw only when a turn was played, and only the cells that changed unless the
+        # whole window needs repainting
+        elif loop.redraw_needed((game.turns, game.current_player.name, game.game_over, renderer.turn_text)):
+            if loop.dirty:
+                renderer.draw_full()
+                loop.present(window)
+            else:
+                loop.present(window, renderer.draw_changes())
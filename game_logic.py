@@ -1,5 +1,48 @@
 
+import hashlib
 import random
+from placement_index import PLACEMENT_RULES_REVISION, random_fleet, occupied_mask
+
+FLEET_LENGTHS = [5, 4, 3, 2, 1]  # Ship lengths in placement order; a game with n boats uses the first n
+# Fingerprint of the fleet and the placement rules: changing either gives a new version, and
+# heatmap_cache tables built under the old one are then ignored
+RULES_VERSION = hashlib.sha256(repr((FLEET_LENGTHS, PLACEMENT_RULES_REVISION)).encode()).hexdigest()[:16]
+
+class CellPool:
+    """
+    The cells of a board that have not been attacked yet, kept in a list with swap-remove
+    so removing a cell and picking a random one are both O(1).
+    """
+    def __init__(self, rows, cols):
+        self.cols = cols
+        self.cells = list(range(rows * cols))  # Cell index y * cols + x
+        self.position = list(range(rows * cols))  # Cell index -> slot in self.cells, -1 once removed
+
+    def __len__(self):
+        return len(self.cells)
+
+    def remove(self, x, y):
+        """
+        Take (x, y) out of the pool if it is still there.
+        """
+        cell = y * self.cols + x
+        index = self.position[cell]
+        if index < 0:
+            return
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[index] = last
+            self.position[last] = index
+        self.position[cell] = -1
+
+    def random_cell(self):
+        """
+        Return a random (x, y) still in the pool, or (None, None) if it is empty.
+        """
+        if not self.cells:
+            return None, None
+        cell = self.cells[random.randrange(len(self.cells))]
+        return cell % self.cols, cell // self.cols
 
 class GameBoard:
     def __init__(self, rows=10, cols=10):
@@ -8,7 +51,11 @@ class GameBoard:
         self.grid = [['-' for _ in range(cols)] for _ in range(rows)]
         self.attack_grid = [['-' for _ in range(cols)] for _ in range(rows)]  # Attack results
         self.attacked_positions = set()  # Tracks all attacked positions (x, y) on this board
+        self.untargeted = CellPool(rows, cols)  # Positions not attacked yet, for O(1) random picks
         self.ships = []
+        self.ship_at = {}  # (x, y) -> id of the ship on that cell
+        self.ship_health = {}  # Ship id -> cells not hit yet
+        self.ship_cells_left = 0  # Unhit ship cells on the whole board
 
     def is_valid_placement(self, ship_length, orientation, start_position):
         """
@@ -40,6 +87,13 @@ class GameBoard:
         Marks a position as attacked on this board.
         """
         self.attacked_positions.add((x, y))
+        self.untargeted.remove(x, y)
+
+    def random_untargeted(self):
+        """
+        Return a random position on this board that has not been attacked, or (None, None).
+        """
+        return self.untargeted.random_cell()
 
     def place_ship(self, ship_length, orientation, start_position):
         """
@@ -60,25 +114,27 @@ class GameBoard:
                 ship_coordinates.append((x, y + i))
 
         # Add the ship to the ships list
+        ship_id = len(self.ships) + 1
         self.ships.append({
-            "id": len(self.ships) + 1,
+            "id": ship_id,
             "length": ship_length,
             "orientation": orientation,
             "coordinates": ship_coordinates
         })
+        for coordinate in ship_coordinates:
+            self.ship_at[coordinate] = ship_id
+        self.ship_health[ship_id] = ship_length
+        self.ship_cells_left += ship_length
         return True
 
 
     def randomly_place_ships(self, ship_lengths):
         """
         Randomly place multiple ships on the grid.
+        Raises ValueError if the ships cannot all fit around the ones already placed.
         """
-        for ship_length in ship_lengths:
-            placed = False
-            while not placed:
-                orientation = random.choice(['horizontal', 'vertical'])
-                start_position = (random.randint(0, self.cols - 1), random.randint(0, self.rows - 1))
-                placed = self.place_ship(ship_length, orientation, start_position)
+        for placement in random_fleet(self.rows, self.cols, ship_lengths, occupied_mask(self.grid)):
+            self.place_ship(placement.length, placement.orientation, placement.start)
 
     def display_grid(self):
         """
@@ -97,15 +153,9 @@ class GameBoard:
     def random_attack(self, opponent_board):
         """
         Randomly select an unplayed cell on the opponent's board for an attack.
+        Returns (None, None) if there are no available moves.
         """
-        available_moves = [
-            (x, y) for x in range(self.cols)
-                for y in range(self.rows)
-                if not opponent_board.is_attacked(x, y)
-        ]
-        if not available_moves:
-            return None, None  # No available moves
-        return random.choice(available_moves)
+        return opponent_board.random_untargeted()
 
     def display_ship_placements(self):
         """
@@ -115,6 +165,39 @@ class GameBoard:
         for row in self.grid:
             print(" ".join(str(cell) for cell in row))
 
+    def is_ship(self, x, y):
+        """
+        Check if an unhit ship cell is at (x, y).
+        """
+        return self.grid[y][x] == 'S'
+
+    def receive_attack(self, x, y):
+        """
+        Resolve an attack on this board's grid.
+        Returns (hit, ship_id, sunk); ship_id is None on a miss.
+        """
+        ship_id = self.ship_at.get((x, y))
+        if ship_id is not None and self.grid[y][x] == 'S':
+            self.grid[y][x] = 'X'  # Mark hit
+            self.ship_health[ship_id] -= 1
+            self.ship_cells_left -= 1
+            return True, ship_id, self.ship_health[ship_id] == 0
+        if self.grid[y][x] == '-':
+            self.grid[y][x] = 'O'  # Mark miss
+        return False, None, False
+
+    def is_sunk(self, ship_id):
+        """
+        Check if every cell of a ship has been hit.
+        """
+        return self.ship_health[ship_id] == 0
+
+    def has_remaining_ships(self):
+        """
+        Check if any ship cell on this board has not been hit yet.
+        """
+        return self.ship_cells_left > 0
+
     def update_attack_grid(self, x, y, result):
         """
         Updates the attack grid based on the attack result.
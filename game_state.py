@@ -1,19 +1,16 @@
 import pygame
 import sys
 from enum import Enum
-from ui import UIElement  # Import the button class
+from ui import UIElement, create_surface_with_text  # Import the button class
+from frame_loop import FrameLoop
+from assets import assets
 
 # Define color constants for UI elements
 BLUE = (106, 159, 181)
 WHITE = (255, 255, 255)
 global ships_selected
 
-# Load background images for different game screens
-bg = pygame.image.load("images/bg.png")
-bg2 = pygame.image.load("images/bg2.png")
-bg3 = pygame.image.load("images/bg3.png")
-bg4 = pygame.image.load("images/bg4.png")
-bg5 = pygame.image.load("images/bg5.png")
+# Background images for the different game screens, loaded on first use by the asset manager
 
 class GameState(Enum):
     QUIT = -1            # Enumeration for quitting the game
@@ -22,12 +19,6 @@ class GameState(Enum):
     AIMODE = 2           # Enumeration for AI mode
     HUMAN = 3            # Enumeration for human player mode
 
-def create_surface_with_text(text, font_size, text_rgb, bg_rgb):
-    """ Create a surface with the specified text written on it. """
-    font = pygame.freetype.SysFont("Courier", font_size, bold=True)
-    surface, _ = font.render(text=text, fgcolor=text_rgb, bgcolor=bg_rgb)
-    return surface.convert_alpha()
-
 def title_screen(screen):
     """ Display the title screen with start and quit buttons. """
     start_btn = UIElement(
@@ -48,21 +39,25 @@ def title_screen(screen):
     )
 
     buttons = [start_btn, quit_btn]
+    loop = FrameLoop("title")
 
     while True:
         mouse_up = False
-        for event in pygame.event.get():
+        for event in loop.events():
             if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                 mouse_up = True
-        screen.blit(bg, (0, 0))  # Draw the title background
 
         for button in buttons:
-            ui_action = button.update(pygame.mouse.get_pos(), mouse_up)
+            ui_action = button.update(loop.mouse_pos, mouse_up)
             if ui_action is not None:
                 return ui_action
-            button.draw(screen)
 
-        pygame.display.flip()
+        # Only redraw when a button's hover state changes
+        if loop.redraw_needed([button.mouse_over for button in buttons]):
+            screen.blit(assets.image("bg.png"), (0, 0))  # Draw the title background
+            for button in buttons:
+                button.draw(screen)
+            loop.present(screen)
         
 def get_selectedAIMode():
     global selectedAIMode
@@ -97,26 +92,24 @@ def game_mode(screen):
     )
 
     buttons = [ai_btn, human_btn]
+    loop = FrameLoop("game_mode")
 
     while True:
         mouse_up = False
-        for event in pygame.event.get():
+        for event in loop.events():
             if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                 mouse_up = True
-        screen.blit(bg2, (0, 0))  # Draw the background for game mode
-
-        ui_action = return_btn.update(pygame.mouse.get_pos(), mouse_up)
-        if ui_action is not None:
-            return ui_action
-        return_btn.draw(screen)
 
-        for button in buttons:
-            ui_action = button.update(pygame.mouse.get_pos(), mouse_up)
+        for button in [return_btn] + buttons:
+            ui_action = button.update(loop.mouse_pos, mouse_up)
             if ui_action is not None:
                 return ui_action
-            button.draw(screen)
 
-        pygame.display.flip()
+        if loop.redraw_needed([button.mouse_over for button in [return_btn] + buttons]):
+            screen.blit(assets.image("bg2.png"), (0, 0))  # Draw the background for game mode
+            for button in [return_btn] + buttons:
+                button.draw(screen)
+            loop.present(screen)
 
 selectedAIMode = 0
 
@@ -157,29 +150,31 @@ def ai_mode(screen):
     )
 
     buttons = [easy_btn, medium_btn, hard_btn]
-    
+    loop = FrameLoop("ai_mode")
+
     while True:
         mouse_up = False
-        for event in pygame.event.get():
+        for event in loop.events():
             if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                 mouse_up = True
-        screen.blit(bg3, (0, 0))  # Draw the background for AI mode
 
-        ui_action = return_btn.update(pygame.mouse.get_pos(), mouse_up)
+        ui_action = return_btn.update(loop.mouse_pos, mouse_up)
         if ui_action is not None:
             return ui_action
-        return_btn.draw(screen)
 
         for button in buttons:
-            ui_action = button.update(pygame.mouse.get_pos(), mouse_up)
+            ui_action = button.update(loop.mouse_pos, mouse_up)
             if ui_action is not None:
                 global selectedAIMode
                 selectedAIMode = ui_action  # Store the user's selection
                 print(f"Selected AI Mode: {selectedAIMode}")
                 return GameState.HUMAN
-            button.draw(screen)
 
-        pygame.display.flip()
+        if loop.redraw_needed([button.mouse_over for button in [return_btn] + buttons]):
+            screen.blit(assets.image("bg3.png"), (0, 0))  # Draw the background for AI mode
+            for button in [return_btn] + buttons:
+                button.draw(screen)
+            loop.present(screen)
 
 def human_mode(screen):
     """ Display the human player options with a return button. """
@@ -195,26 +190,24 @@ def human_mode(screen):
     # Human Mode Buttons (e.g., Button for ships, difficulty levels, etc.)
     # Just an example here, you can modify with your own game logic
     buttons = []  # Add your buttons here for human mode
-    
+    loop = FrameLoop("human_mode")
+
     while True:
         mouse_up = False
-        for event in pygame.event.get():
+        for event in loop.events():
             if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                 mouse_up = True
-        screen.blit(bg4, (0, 0))  # Draw the background for human mode
-        
-        ui_action = return_btn.update(pygame.mouse.get_pos(), mouse_up)
-        if ui_action is not None:
-            return ui_action
-        return_btn.draw(screen)
 
-        for button in buttons:
-            ui_action = button.update(pygame.mouse.get_pos(), mouse_up)
+        for button in [return_btn] + buttons:
+            ui_action = button.update(loop.mouse_pos, mouse_up)
             if ui_action is not None:
                 return ui_action
-            button.draw(screen)
 
-        pygame.display.flip()
+        if loop.redraw_needed([button.mouse_over for button in [return_btn] + buttons]):
+            screen.blit(assets.image("bg4.png"), (0, 0))  # Draw the background for human mode
+            for button in [return_btn] + buttons:
+                button.draw(screen)
+            loop.present(screen)
 
 def select_number_of_boats(screen):
     """Display the screen to select the number of boats and record the selection."""
@@ -243,33 +236,34 @@ def select_number_of_boats(screen):
 
     # Variable to store the user's choice
     selected_number_of_boats = None
+    loop = FrameLoop("select_boats")
 
     while True:
         mouse_up = False
-        for event in pygame.event.get():
+        for event in loop.events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                 mouse_up = True
 
-        # Draw the background
-        screen.blit(bg4, (0, 0))
-
         # Handle return button
-        ui_action = return_btn.update(pygame.mouse.get_pos(), mouse_up)
+        ui_action = return_btn.update(loop.mouse_pos, mouse_up)
         if ui_action == GameState.NEWGAME:  # Check if return button was clicked
             return GameState.NEWGAME  # Return the NEWGAME state
-        return_btn.draw(screen)
 
         # Handle boat selection buttons
         for button in buttons:
-            ui_action = button.update(pygame.mouse.get_pos(), mouse_up)
+            ui_action = button.update(loop.mouse_pos, mouse_up)
             if ui_action is not None:
                 selected_number_of_boats = ui_action  # Record the selection
                 print(selected_number_of_boats)
                 return selected_number_of_boats  # Return the selected number of boats
-            button.draw(screen)
 
-        # Update the display
-        pygame.display.flip()
\ No newline at end of file
+        if loop.redraw_needed([button.mouse_over for button in [return_btn] + buttons]):
+            # Draw the background
+            screen.blit(assets.image("bg4.png"), (0, 0))
+            for button in [return_btn] + buttons:
+                button.draw(screen)
+            # Update the display
+            loop.present(screen)
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""List-of-lists style views for boards that don't store their grid as lists.
+
+SparseBoard and the simulator's LegacyBoardView keep their cells elsewhere, and expose them
+through a GridView so existing grid[y][x] consumers keep working.
+"""
+
+
+class GridRow:
+    """
+    A single row of a GridView. Reads and writes are forwarded to the owning board.
+    """
+    def __init__(self, view, y):
+        self.view = view
+        self.y = y
+
+    def __len__(self):
+        return self.view.cols
+
+    def __getitem__(self, x):
+        if isinstance(x, slice):
+            return [self.view.get_cell(i, self.y) for i in range(*x.indices(self.view.cols))]
+        if x < 0:
+            x += self.view.cols
+        if not 0 <= x < self.view.cols:
+            raise IndexError("grid column out of range")
+        return self.view.get_cell(x, self.y)
+
+    def __setitem__(self, x, value):
+        if x < 0:
+            x += self.view.cols
+        if not 0 <= x < self.view.cols:
+            raise IndexError("grid column out of range")
+        self.view.set_cell(x, self.y, value)
+
+    def __iter__(self):
+        for x in range(self.view.cols):
+            yield self.view.get_cell(x, self.y)
+
+    def __contains__(self, value):
+        return self.view.row_contains(self.y, value)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class GridView:
+    """
+    A list-of-lists style view over a board so existing code can keep using grid[y][x].
+    get_cell/set_cell/row_contains are supplied by the board that owns the view.
+    """
+    def __init__(self, rows, cols, get_cell, set_cell, row_contains=None):
+        self.rows = rows
+        self.cols = cols
+        self.get_cell = get_cell
+        self.set_cell = set_cell
+        self.row_contains = row_contains or self._scan_row
+
+    def _scan_row(self, y, value):
+        return any(self.get_cell(x, y) == value for x in range(self.cols))
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, y):
+        if isinstance(y, slice):
+            return [GridRow(self, i) for i in range(*y.indices(self.rows))]
+        if y < 0:
+            y += self.rows
+        if not 0 <= y < self.rows:
+            raise IndexError("grid row out of range")
+        return GridRow(self, y)
+
+    def __iter__(self):
+        for y in range(self.rows):
+            yield GridRow(self, y)
@@ -0,0 +1,272 @@
+"""Headless mode for servers and CI.
+
+Runs the real game flow (menus, ship placement, the board and the scorecard) under SDL's dummy
+video driver, so the screens draw to off-screen surfaces and no display is needed. Input comes
+from a script instead of the mouse, frames are not capped and, optionally, presented frames are
+saved as PNG files.
+
+A script is a list of steps, one input each, taken in order whenever a screen waits for the
+player (never while an overlay is up or the AI is thinking):
+
+    {"click": [x, y]}                   move there, press and release the left button
+    {"drag": [[x1, y1], [x2, y2]]}      press at the first point, move, release at the second
+    {"key": "r"}                        press and release a key
+    {"wait": 3}                         let 3 frames pass without input
+    {"quit": true}                      close the window
+
+"screen" restricts a step to one screen (the FrameLoop name: title, game_mode, ai_mode,
+select_boats, ship_placement, game, scorecard) and "optional": true drops it if another screen
+is showing, e.g. board clicks left over once the game is won. The run stops when the game exits
+or the script runs out.
+
+Usage:
+    python headless.py script.json --capture frames/ --every 10 --format bmp
+    python headless.py --game pvai --difficulty Hard --boats 5 --quiet
+"""
+
+import os
+
+os.environ.setdefault("NAVAL_HEADLESS", "1")  # Before config is imported by anything below
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import time
+
+import pygame
+
+import assets
+import fonts
+import frame_loop
+import frontend_game_board
+import shipplacement
+from config import GRID_SIZE
+
+STALL_FRAMES = 1000  # Idle frames a step may wait for its screen before the run fails
+
+# Centres of the menu buttons in game_state.py and the scorecard buttons in end_game.py
+MENU_BUTTONS = {
+    "start": (400, 400),
+    "ai": (400, 370),
+    "human": (400, 410),
+    "Easy": (400, 340),
+    "Medium": (400, 380),
+    "Hard": (400, 420),
+    "exit": (630, 520),
+}
+
+
+class ScriptFinished(Exception):
+    """
+    Raised into the running screen when the script has no steps left.
+    """
+
+
+class HeadlessDriver:
+    """
+    Feeds scripted input to the screens and captures their frames. Installed as
+    frame_loop.driver by run().
+    """
+    def __init__(self, steps, capture_dir=None, capture_every=1, capture_format="png"):
+        self.steps = list(steps)
+        self.index = 0  # Next step
+        self.waiting = 0  # Frames left of a "wait" step
+        self.stalled = 0  # Idle frames the next step has waited for its screen
+        self.capture_dir = capture_dir
+        self.capture_every = max(1, capture_every)
+        self.capture_format = capture_format  # Any pygame.image.save format; bmp is ~100x faster than png
+        self.frames = {}  # Screen name -> frames presented
+        self.captured = 0
+        if capture_dir:
+            os.makedirs(capture_dir, exist_ok=True)
+
+    def feed(self, loop):
+        """
+        Post the next step's input if it is meant for the screen of `loop` (a FrameLoop).
+        Nothing is posted before the screen's first frame was presented.
+        """
+        screen = loop.name
+        if not loop.frames:
+            return
+        if self.waiting:
+            self.waiting -= 1
+            return
+        while self.index < len(self.steps):
+            step = self.steps[self.index]
+            if step.get("screen", screen) == screen:
+                break
+            if step.get("optional"):
+                self.index += 1
+                continue
+            self.stalled += 1
+            if self.stalled > STALL_FRAMES:
+                raise RuntimeError(f"Script stalled at step {self.index}: waiting for screen "
+                                   f"{step['screen']!r} on {screen!r}")
+            return
+        else:
+            raise ScriptFinished(f"Script finished on {screen!r}")
+
+        self.index += 1
+        self.stalled = 0
+        for event in step_events(step):
+            pygame.event.post(event)
+        self.waiting = step.get("wait", 0)
+
+    def presented(self, screen, surface):
+        """
+        Count a presented frame and save every capture_every-th one.
+        """
+        self.frames[screen] = self.frames.get(screen, 0) + 1
+        total = sum(self.frames.values())
+        if self.capture_dir and total % self.capture_every == 0:
+            pygame.image.save(surface, os.path.join(self.capture_dir, f"{total:06d}_{screen}.{self.capture_format}"))
+            self.captured += 1
+
+
+def step_events(step):
+    """
+    Return the pygame events of one script step.
+    """
+    if "click" in step:
+        pos = tuple(step["click"])
+        button = step.get("button", 1)
+        return [
+            pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0)),
+            pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=button),
+            pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=button),
+        ]
+    if "drag" in step:
+        start, end = (tuple(point) for point in step["drag"])
+        return [
+            pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=start, button=1),
+            pygame.event.Event(pygame.MOUSEMOTION, pos=end, rel=(end[0] - start[0], end[1] - start[1]), buttons=(1, 0, 0)),
+            pygame.event.Event(pygame.MOUSEBUTTONUP, pos=end, button=1),
+        ]
+    if "key" in step:
+        key = pygame.key.key_code(step["key"])
+        return [
+            pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode=step["key"]),
+            pygame.event.Event(pygame.KEYUP, key=key, mod=0),
+        ]
+    if step.get("quit"):
+        return [pygame.event.Event(pygame.QUIT)]
+    if "wait" in step:
+        return []
+    raise ValueError(f"Unknown script step: {step}")
+
+
+def placement_steps(num_boats):
+    """
+    Steps that drag the first num_boats ships onto even rows of the placement grid and confirm.
+    """
+    cell = shipplacement.CELL_SIZE
+    steps = []
+    for index in range(num_boats):
+        y = 2 * index * cell + cell // 2  # Ships start at (COLS + 1, 2 * index)
+        start = ((shipplacement.COLS + 1) * cell + cell // 2, y)
+        steps.append({"screen": "ship_placement", "drag": [start, (cell // 2, y)]})
+    width, height = shipplacement.WINDOW_WIDTH, shipplacement.WINDOW_HEIGHT
+    steps.append({"screen": "ship_placement", "click": (width - 240, height - 30)})  # Confirm
+    return steps
+
+
+def full_game_script(mode="pvp", difficulty="Easy", num_boats=5):
+    """
+    Return a script that plays a whole game from the title screen to the scorecard: both
+    players (or the player against the AI) sweep the opponent's board row by row, and the
+    scorecard's Exit button ends the run.
+    """
+    if mode not in ("pvp", "pvai"):
+        raise ValueError(f"Unknown mode: {mode}")
+    width, height = shipplacement.WINDOW_WIDTH, shipplacement.WINDOW_HEIGHT
+    steps = [{"screen": "title", "click": MENU_BUTTONS["start"]}]
+    if mode == "pvai":
+        steps.append({"screen": "game_mode", "click": MENU_BUTTONS["ai"]})
+        steps.append({"screen": "ai_mode", "click": MENU_BUTTONS[difficulty]})
+    else:
+        steps.append({"screen": "game_mode", "click": MENU_BUTTONS["human"]})
+    steps.append({"screen": "select_boats", "click": (300 + (num_boats - 1) * 50, 450)})
+
+    steps += placement_steps(num_boats)
+    steps.append({"screen": "ship_placement", "click": (width - 240, height - 80)})  # Next
+    if mode == "pvp":
+        steps += placement_steps(num_boats)
+        steps.append({"screen": "ship_placement", "click": (width - 90, height - 30)})  # Play
+
+    cell = frontend_game_board.CELL_SIZE
+    for y in range(GRID_SIZE):
+        for x in range(GRID_SIZE):
+            offsets = [frontend_game_board.PLAYER2_OFFSET]
+            if mode == "pvp":
+                offsets.append(frontend_game_board.PLAYER1_OFFSET)
+            for offset_x, offset_y in offsets:
+                pos = (offset_x + x * cell + cell // 2, offset_y + y * cell + cell // 2)
+                steps.append({"screen": "game", "click": pos, "optional": True})
+    steps.append({"screen": "scorecard", "click": MENU_BUTTONS["exit"]})
+    return steps
+
+
+def run(steps, capture_dir=None, capture_every=1, capture_format="png", entry=None):
+    """
+    Drive the game (main.main, or `entry`) with the scripted steps and return the driver,
+    which holds the frame counts.
+    """
+    if entry is None:
+        from main import main as entry
+    driver = HeadlessDriver(steps, capture_dir, capture_every, capture_format)
+    frame_loop.driver = driver
+    try:
+        entry()
+    except (SystemExit, ScriptFinished):
+        pass  # The game exited or the script ran out
+    finally:
+        frame_loop.driver = None
+        # pygame.quit() invalidated the cached fonts and display-format surfaces
+        fonts.clear()
+        assets.assets.clear()
+        pygame.quit()
+    return driver
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Battleship screens without a display.")
+    parser.add_argument("script", nargs="?", help="JSON file with a list of script steps")
+    parser.add_argument("--game", choices=["pvp", "pvai"], help="play a whole scripted game instead of a script file")
+    parser.add_argument("--difficulty", choices=["Easy", "Medium", "Hard"], default="Easy", help="AI difficulty for --game pvai")
+    parser.add_argument("--boats", type=int, choices=range(1, 6), default=5, help="fleet size for --game")
+    parser.add_argument("--capture", help="directory to save presented frames to")
+    parser.add_argument("--every", type=int, default=1, help="save every n-th frame")
+    parser.add_argument("--format", choices=["png", "bmp", "tga", "jpg"], default="png", help="image format of saved frames")
+    parser.add_argument("--seed", type=int, default=None, help="seed the AI's random choices")
+    parser.add_argument("--quiet", action="store_true", help="discard the game's console output")
+    args = parser.parse_args(argv)
+
+    if args.game:
+        steps = full_game_script(args.game, args.difficulty, args.boats)
+    elif args.script:
+        with open(args.script) as file:
+            steps = json.load(file)
+    else:
+        parser.error("give a script file or --game")
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    start = time.perf_counter()
+    output = io.StringIO() if args.quiet else sys.stdout
+    with contextlib.redirect_stdout(output):
+        driver = run(steps, args.capture, args.every, args.format)
+    elapsed = time.perf_counter() - start
+
+    frames = sum(driver.frames.values())
+    per_screen = ", ".join(f"{screen} {count}" for screen, count in driver.frames.items())
+    print(f"{frames} frames in {elapsed:.2f}s ({frames / elapsed:.0f} FPS): {per_screen}")
+    print(f"{driver.index}/{len(driver.steps)} steps played")
+    if args.capture:
+        print(f"Saved {driver.captured} frames to {args.capture}")
+
+
+if __name__ == "__main__":
+    main()
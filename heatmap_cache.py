@@ -0,0 +1,211 @@
+"""Precomputed opening heatmaps per grid size and fleet.
+
+Before the first hit, every AI game faces the same question: where does a fleet placed by the
+rules tend to be? The answer only depends on the board size and the fleet, so it is computed once
+offline and stored as a small JSON table per (rows, cols, fleet):
+
+    prior    the chance of a ship on each cell (row-major), from random fleets drawn with the
+             same generator as randomly_place_ships
+    opening  the cells to shoot, in order, while every shot misses: each is the likeliest ship
+             cell among the sampled fleets that avoid the cells before it
+
+AIPlayer's Hard mode plays the opening straight from the table until the first hit, mirrored or
+rotated at random per game so the AI doesn't always open the same way, and only then builds its
+placement counts, weighted by the prior. Tables are loaded on first use and kept in memory; a
+table built under another RULES_VERSION (see game_logic), or missing altogether, is ignored and
+the AI computes its counts live without a prior.
+
+Usage:
+    python heatmap_cache.py --sizes 10 --boats 1 2 3 4 5 --workers 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+
+from config import GRID_SIZE, HEATMAP_DIR
+from game_logic import FLEET_LENGTHS, RULES_VERSION
+from placement_index import random_fleet
+
+DEFAULT_SAMPLES = 1000000
+MAX_OPENING = 30  # Longest opening stored
+MIN_SURVIVORS = 2000  # Stop the opening once fewer sampled fleets avoid all of it
+
+_tables = {}  # (rows, cols, fleet) -> loaded table, or None if there is no usable file
+
+
+def table_path(rows, cols, fleet, directory=HEATMAP_DIR):
+    """
+    Return the file a table is stored in.
+    """
+    return os.path.join(directory, f"heatmap_{rows}x{cols}_{'-'.join(map(str, fleet))}.json")
+
+
+def _sample_chunk(args):
+    """
+    Worker entry point: return the masks of `count` random fleets.
+    """
+    rows, cols, fleet, count, seed = args
+    rng = random.Random(seed)
+    masks = []
+    for _ in range(count):
+        mask = 0
+        for placement in random_fleet(rows, cols, fleet, rng=rng):
+            mask |= placement.mask
+        masks.append(mask)
+    return masks
+
+
+def _cell_counts(masks, cells):
+    counts = [0] * cells
+    for mask in masks:
+        while mask:
+            low = mask & -mask
+            counts[low.bit_length() - 1] += 1
+            mask ^= low
+    return counts
+
+
+def build(rows, cols, fleet, samples=DEFAULT_SAMPLES, workers=None, seed=None):
+    """
+    Sample `samples` fleets across a worker pool and return the table for (rows, cols, fleet).
+    """
+    fleet = list(fleet)
+    workers = workers or multiprocessing.cpu_count()
+    chunk_size = max(1000, samples // (workers * 4))
+    rng = random.Random(seed)
+    chunks = [(rows, cols, fleet, min(chunk_size, samples - start), rng.getrandbits(64))
+              for start in range(0, samples, chunk_size)]
+    masks = []
+    if workers == 1:
+        for chunk in chunks:
+            masks.extend(_sample_chunk(chunk))
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            for chunk_masks in pool.imap_unordered(_sample_chunk, chunks):
+                masks.extend(chunk_masks)
+
+    cells = rows * cols
+    counts = _cell_counts(masks, cells)
+    prior = [count / len(masks) for count in counts]
+    opening = []
+    survivors = masks
+    while len(opening) < min(MAX_OPENING, cells) and len(survivors) >= MIN_SURVIVORS:
+        shot = set(opening)
+        # Likeliest cell among the fleets that avoid every shot so far, lowest index on ties
+        cell = max((cell for cell in range(cells) if cell not in shot), key=lambda cell: (counts[cell], -cell))
+        opening.append(cell)
+        bit = 1 << cell
+        survivors = [mask for mask in survivors if not mask & bit]
+        counts = _cell_counts(survivors, cells)
+
+    return {
+        "rules_version": RULES_VERSION,
+        "rows": rows,
+        "cols": cols,
+        "fleet": fleet,
+        "samples": len(masks),
+        "prior": [round(chance, 6) for chance in prior],
+        "opening": [[cell % cols, cell // cols] for cell in opening],
+    }
+
+
+def save(table, directory=HEATMAP_DIR):
+    """
+    Write a table to its file, replacing any older one.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = table_path(table["rows"], table["cols"], table["fleet"], directory)
+    temporary = path + ".tmp"
+    with open(temporary, "w") as file:
+        json.dump(table, file)
+    os.replace(temporary, path)  # Readers never see a half-written table
+    _tables.pop((table["rows"], table["cols"], tuple(table["fleet"])), None)
+    return path
+
+
+def load(rows, cols, fleet):
+    """
+    Return the table for (rows, cols, fleet), reading it on first use, or None if there is no
+    table built under the current RULES_VERSION.
+    """
+    key = (rows, cols, tuple(fleet))
+    if key not in _tables:
+        table = None
+        try:
+            with open(table_path(rows, cols, fleet)) as file:
+                table = json.load(file)
+        except (OSError, ValueError):
+            pass
+        if table is not None and (table.get("rules_version") != RULES_VERSION or table.get("rows") != rows
+                                  or table.get("cols") != cols or table.get("fleet") != list(fleet)):
+            table = None  # Built for other rules; rebuild with this script
+        _tables[key] = table
+    return _tables[key]
+
+
+def prior(rows, cols, fleet):
+    """
+    Return the chance of a ship on each cell (index y * cols + x), or None without a table.
+    """
+    table = load(rows, cols, fleet)
+    return None if table is None else table["prior"]
+
+
+def symmetries(rows, cols):
+    """
+    Return the board symmetries as functions (x, y) -> (x, y): 8 on a square board, 4 otherwise.
+    """
+    transforms = [
+        lambda x, y: (x, y),
+        lambda x, y: (cols - 1 - x, y),
+        lambda x, y: (x, rows - 1 - y),
+        lambda x, y: (cols - 1 - x, rows - 1 - y),
+    ]
+    if rows == cols:
+        transforms += [
+            lambda x, y: (y, x),
+            lambda x, y: (rows - 1 - y, x),
+            lambda x, y: (y, cols - 1 - x),
+            lambda x, y: (rows - 1 - y, cols - 1 - x),
+        ]
+    return transforms
+
+
+def opening(rows, cols, fleet, rng=random):
+    """
+    Return the opening for (rows, cols, fleet) as a list of (x, y), under a random symmetry of the
+    board, or an empty list without a table.
+    """
+    table = load(rows, cols, fleet)
+    if table is None:
+        return []
+    transform = rng.choice(symmetries(rows, cols))
+    return [transform(x, y) for x, y in table["opening"]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the opening heatmaps used by the Hard AI.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[GRID_SIZE], help="square grid sizes")
+    parser.add_argument("--boats", type=int, nargs="+", default=list(range(1, len(FLEET_LENGTHS) + 1)),
+                        choices=range(1, len(FLEET_LENGTHS) + 1), help="fleet sizes")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="random fleets per table")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible tables")
+    parser.add_argument("--dir", default=HEATMAP_DIR, help="directory to write the tables to")
+    args = parser.parse_args(argv)
+
+    for size in args.sizes:
+        for boats in args.boats:
+            start = time.perf_counter()
+            table = build(size, size, FLEET_LENGTHS[:boats], args.samples, args.workers, args.seed)
+            path = save(table, args.dir)
+            print(f"{path}: {table['samples']} fleets, {len(table['opening'])}-shot opening "
+                  f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""Frame-time instrumentation for the pygame screens.
+
+Every screen loop calls begin_frame() at the top of a frame, phase() when it moves from event
+handling to drawing, and end_frame() after the display update. Work nested inside a phase, such
+as a turn or an AI move triggered by a click, is wrapped in section() so its time is charged to
+that section instead of the enclosing one. Time spent blocked in "wait" (sleeps, clock ticks,
+event waits) counts towards the frame rate but not the frame time.
+
+Profiling is off unless NAVAL_PROFILE is set or F3 is pressed, and costs a few attribute
+lookups per frame while off.
+"""
+
+import atexit
+import math
+import sys
+import time
+from collections import deque
+
+import pygame
+
+from config import PROFILE, PROFILE_REPORT
+from fonts import get_font
+
+SECTIONS = ("events", "logic", "ai", "draw", "wait")
+SAMPLES = 2000  # Frames kept per screen for the percentiles
+OVERLAY_REFRESH = 0.5  # Seconds between overlay text updates
+TOGGLE_KEY = pygame.K_F3
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class ScreenStats:
+    """
+    Frame and per-section timings of one screen.
+    """
+    def __init__(self):
+        self.frames = 0
+        self.frame_times = deque(maxlen=SAMPLES)  # Busy seconds per frame, wait excluded
+        self.intervals = deque(maxlen=SAMPLES)  # Seconds between frame starts, for the frame rate
+        self.totals = dict.fromkeys(SECTIONS, 0.0)
+        self.section_times = {name: deque(maxlen=SAMPLES) for name in SECTIONS}
+
+    def fps(self, frames=60):
+        recent = list(self.intervals)[-frames:]
+        return len(recent) / sum(recent) if recent and sum(recent) > 0 else 0.0
+
+
+class _Section:
+    """
+    Reusable context manager returned by FrameProfiler.section().
+    """
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.names = []
+        self.previous = []
+
+    def __enter__(self):
+        self.previous.append(self.profiler.phase(self.names.pop()))
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.phase(self.previous.pop())
+        return False
+
+
+class FrameProfiler:
+    """
+    Records frame and section times per screen and draws the optional overlay.
+    """
+    def __init__(self, enabled=False, clock=time.perf_counter):
+        self.enabled = enabled
+        self.show_overlay = enabled
+        self.clock = clock
+        self.screens = {}
+        self.screen = None  # Name of the screen whose frame is in progress
+        self.current = None  # Section the running time is charged to
+        self.started = 0.0  # When the current section started
+        self.frame = dict.fromkeys(SECTIONS, 0.0)
+        self.last_frame_start = {}
+        self.overlay_surface = None
+        self.overlay_updated = 0.0
+        self.overlay_width = 0
+        self.font = None
+        self._section = _Section(self)
+
+    def toggle(self):
+        """
+        Turn recording and the overlay on or off.
+        """
+        self.enabled = not self.enabled
+        self.show_overlay = self.enabled
+        self.screen = None
+        self.last_frame_start.clear()
+        self.overlay_surface = None
+
+    def handle_event(self, event):
+        """
+        Toggle profiling when the F3 key is pressed. Screens pass every event through here.
+        """
+        if event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+            self.toggle()
+
+    def begin_frame(self, screen, section="events"):
+        """
+        Start timing a frame of `screen`. A frame left unfinished, for example by a screen that
+        returned mid-frame, is dropped.
+        """
+        if not self.enabled:
+            return
+        now = self.clock()
+        if screen in self.last_frame_start:
+            self.stats(screen).intervals.append(now - self.last_frame_start[screen])
+        self.last_frame_start[screen] = now
+        self.screen = screen
+        for name in SECTIONS:
+            self.frame[name] = 0.0
+        self.current = section
+        self.started = now
+
+    def phase(self, section):
+        """
+        Charge the time since the last switch to the current section and start `section`.
+        Returns the section that was running.
+        """
+        previous = self.current
+        if self.enabled and self.screen is not None:
+            now = self.clock()
+            if previous is not None:
+                self.frame[previous] += now - self.started
+            self.started = now
+        self.current = section
+        return previous
+
+    def section(self, name):
+        """
+        Context manager that charges the time inside it to `name` and then resumes the
+        enclosing section.
+        """
+        self._section.names.append(name)
+        return self._section
+
+    def end_frame(self):
+        """
+        Finish the frame in progress and record its timings.
+        """
+        if not self.enabled or self.screen is None:
+            return
+        self.phase(None)
+        stats = self.stats(self.screen)
+        stats.frames += 1
+        busy = 0.0
+        for name in SECTIONS:
+            spent = self.frame[name]
+            stats.totals[name] += spent
+            stats.section_times[name].append(spent)
+            if name != "wait":
+                busy += spent
+        stats.frame_times.append(busy)
+        self.screen = None
+
+    def stats(self, screen):
+        if screen not in self.screens:
+            self.screens[screen] = ScreenStats()
+        return self.screens[screen]
+
+    def draw_overlay(self, surface):
+        """
+        Draw FPS and p50/p99 frame time of the current screen in the top left corner.
+        The text is re-rendered at most every OVERLAY_REFRESH seconds. Returns the rect drawn,
+        or None.
+        """
+        if not self.show_overlay or self.screen is None:
+            return None
+        now = self.clock()
+        if self.overlay_surface is None or now - self.overlay_updated > OVERLAY_REFRESH:
+            self.overlay_surface = self._render_overlay(self.stats(self.screen))
+            self.overlay_updated = now
+        return surface.blit(self.overlay_surface, (4, 4))
+
+    def _render_overlay(self, stats):
+        if self.font is None:
+            self.font = get_font(20)
+        frame_times = sorted(stats.frame_times)
+        lines = [
+            f"{self.screen}  {stats.fps():.1f} FPS",
+            f"frame p50 {_percentile(frame_times, 0.5) * 1000:.2f} ms  p99 {_percentile(frame_times, 0.99) * 1000:.2f} ms",
+            "ms " + "  ".join(f"{name} {self._mean(stats.section_times[name]) * 1000:.2f}" for name in SECTIONS),
+        ]
+        rendered = [self.font.render(line, True, (255, 255, 0)) for line in lines]
+        # Opaque and never shrinking, so screens that only update dirty rects can redraw it
+        # in place without clearing what was under the previous one
+        width = max([text.get_width() + 8 for text in rendered] + [self.overlay_width])
+        self.overlay_width = width
+        height = sum(text.get_height() for text in rendered) + 8
+        overlay = pygame.Surface((width, height))
+        y = 4
+        for text in rendered:
+            overlay.blit(text, (4, y))
+            y += text.get_height()
+        return overlay
+
+    def _mean(self, values):
+        return sum(values) / len(values) if values else 0.0
+
+    def report(self):
+        """
+        Return the per-screen, per-section timing report as text.
+        """
+        lines = ["Frame timings (ms)"]
+        for screen, stats in self.screens.items():
+            frame_times = sorted(stats.frame_times)
+            lines.append(f"{screen}: {stats.frames} frames, {stats.fps(len(stats.intervals)):.1f} FPS, "
+                         f"frame p50 {_percentile(frame_times, 0.5) * 1000:.2f} "
+                         f"p99 {_percentile(frame_times, 0.99) * 1000:.2f} "
+                         f"max {(frame_times[-1] if frame_times else 0) * 1000:.2f}")
+            total = sum(stats.totals.values()) or 1.0
+            for name in SECTIONS:
+                times = sorted(stats.section_times[name])
+                lines.append(f"  {name:7s} {stats.totals[name] / total:6.1%}  "
+                             f"mean {self._mean(times) * 1000:8.3f}  "
+                             f"p50 {_percentile(times, 0.5) * 1000:8.3f}  "
+                             f"p99 {_percentile(times, 0.99) * 1000:8.3f}")
+        return "\n".join(lines)
+
+    def dump(self, path=None):
+        """
+        Write the report to `path`, or to stderr. Does nothing if no frame was recorded.
+        """
+        if not self.screens:
+            return
+        if path:
+            with open(path, "w") as file:
+                file.write(self.report() + "\n")
+        else:
+            print(self.report(), file=sys.stderr)
+
+
+# Shared by every screen
+profiler = FrameProfiler(enabled=PROFILE)
+atexit.register(lambda: profiler.dump(PROFILE_REPORT))
@@ -0,0 +1,162 @@
+"""Load generator for server.py.
+
+Simulates many concurrent players: each client connects, joins, fires at random untargeted cells
+as soon as it is its turn and rejoins until it has played its games. The move latency is the
+time from sending a move to receiving its "shot" message. Reports throughput, the latency
+percentiles and how the games ended.
+
+Usage:
+    python load_generator.py --clients 1000 --games 5 --host 127.0.0.1 --port 8765
+    python load_generator.py --clients 1000 --local      # also runs the server in this process
+    python load_generator.py --clients 1000 --local --binary   # protocol.py frames instead of JSON
+
+Thousands of clients need a matching open file limit (ulimit -n) on both ends.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from config import SERVER_HOST, SERVER_PORT
+from protocol import PREAMBLE, BinaryCodec, JsonCodec
+from server import GameServer, MAX_LINE
+from simulation import percentile
+
+
+class LoadStats:
+    """
+    What every simulated client saw.
+    """
+    def __init__(self):
+        self.latencies = []  # Seconds from each move to its result
+        self.games = 0  # Games finished, counted once per client
+        self.wins = 0
+        self.invalid = 0
+        self.errors = 0  # Clients that failed to connect or lost their connection
+        self.endings = {}  # Reason -> games finished for it, counted once per client
+
+
+async def play(host, port, name, games, boats, stats, binary=False):
+    """
+    One simulated player: play `games` games in a row on one connection.
+    binary: speak the protocol.py binary frames instead of JSON lines.
+    """
+    try:
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+    except OSError:
+        stats.errors += 1
+        return
+    codec = BinaryCodec() if binary else JsonCodec()
+    if binary:
+        writer.write(PREAMBLE)
+    try:
+        for _ in range(games):
+            writer.write(codec.encode({"type": "join", "name": name, "boats": boats}))
+            cells = []
+            sent = None  # When the move awaiting its result was sent
+            while True:
+                message = await codec.read(reader)
+                if message is None:
+                    raise ConnectionError("server closed the connection")
+                kind = message["type"]
+                your_turn = False
+                if kind == "start":
+                    size = message["size"]
+                    cells = [(x, y) for y in range(size) for x in range(size)]
+                    random.shuffle(cells)
+                    your_turn = message["your_turn"]
+                elif kind == "shot":
+                    if message["by"] == "you":
+                        stats.latencies.append(time.perf_counter() - sent)
+                        sent = None
+                    your_turn = message["your_turn"]
+                elif kind == "invalid":
+                    stats.invalid += 1
+                    sent = None
+                    your_turn = True
+                elif kind == "end":
+                    stats.games += 1
+                    stats.wins += message["you_won"]
+                    stats.endings[message["reason"]] = stats.endings.get(message["reason"], 0) + 1
+                    break
+                elif kind == "error":
+                    raise ConnectionError(message["message"])
+
+                if your_turn and sent is None and cells:
+                    x, y = cells.pop()
+                    sent = time.perf_counter()
+                    writer.write(codec.encode({"type": "move", "x": x, "y": y}))
+            await writer.drain()
+    except (ConnectionError, ValueError):
+        stats.errors += 1
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def run_load(clients, games, boats=5, host=SERVER_HOST, port=SERVER_PORT, ramp=0.0, local=False, binary=False):
+    """
+    Run `clients` simulated players of `games` games each and return (LoadStats, elapsed seconds).
+    local starts a GameServer in this process on a free port instead of using host:port.
+    """
+    listener = None
+    if local:
+        listener = await GameServer(turn_timeout=0).start(host, 0)
+        port = listener.sockets[0].getsockname()[1]
+
+    stats = LoadStats()
+
+    async def client(number):
+        if ramp:
+            await asyncio.sleep(ramp * number / clients)  # Spread the connections over the ramp
+        await play(host, port, f"load-{number}", games, boats, stats, binary)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(number) for number in range(clients)))
+    elapsed = time.perf_counter() - start
+    if listener is not None:
+        listener.close()
+        await listener.wait_closed()
+    return stats, elapsed
+
+
+def print_report(stats, elapsed, clients):
+    latencies = sorted(stats.latencies)
+    games = stats.games / 2  # Both players count each game
+    print(f"{clients} clients: {games:.0f} games and {len(latencies)} moves in {elapsed:.2f}s "
+          f"({games / elapsed:.1f} games/s, {len(latencies) / elapsed:.0f} moves/s)")
+    if latencies:
+        print(f"Move latency ms: p50 {percentile(latencies, 0.50) * 1000:.2f}, "
+              f"p90 {percentile(latencies, 0.90) * 1000:.2f}, p99 {percentile(latencies, 0.99) * 1000:.2f}, "
+              f"max {latencies[-1] * 1000:.2f}")
+    endings = ", ".join(f"{reason} {count // 2}" for reason, count in sorted(stats.endings.items()))
+    print(f"Endings: {endings or 'none'}; invalid moves {stats.invalid}, client errors {stats.errors}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent players against the Battleship server.")
+    parser.add_argument("--clients", type=int, default=100, help="concurrent simulated players (pairs play each other)")
+    parser.add_argument("--games", type=int, default=1, help="games each client plays")
+    parser.add_argument("--boats", type=int, default=5, choices=range(1, 6), help="fleet size to queue for")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--ramp", type=float, default=0.0, help="seconds over which the clients connect")
+    parser.add_argument("--local", action="store_true", help="start a server in this process on a free port")
+    parser.add_argument("--binary", action="store_true", help="use the binary protocol instead of JSON lines")
+    parser.add_argument("--seed", type=int, default=None, help="seed the clients' shot order")
+    args = parser.parse_args(argv)
+
+    if args.clients % 2:
+        parser.error("--clients must be even, players are paired")
+    random.seed(args.seed)
+    stats, elapsed = asyncio.run(run_load(args.clients, args.games, args.boats, args.host, args.port,
+                                          args.ramp, args.local, args.binary))
+    print_report(stats, elapsed, args.clients)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import pygame
 from game_state import GameState, title_screen, game_mode, ai_mode, select_number_of_boats, get_selectedAIMode
 from shipplacement import ship_placement_main
-from player import Player
+from player import Player, AIPlayer
 from naval_warfare_game import GamePlay
 from frontend_game_board import game_loop
 
@@ -36,7 +36,8 @@ def main():
                 if selected_boats > 0:  # Ensure the user selects a valid number of ships
                     # Step 2: Initialize Players
                     player1 = Player(name="Player 1")
-                    ai_player = Player(name="AI")
+                    difficulty = ["Easy", "Medium", "Hard"][selected_ai_mode - 1]
+                    ai_player = AIPlayer("AI", difficulty, selected_boats)
 
                     print(f"Player 1 placing {selected_boats} ships...")
                     ship_placement_main(player1, selected_boats, is_player1=True)
@@ -1,16 +1,17 @@
 from game_logic import GameBoard
 from player import Player
-import random
 
 class GamePlay:
-    def __init__(self, player1, player2, mode="PvP"):
+    def __init__(self, player1, player2, mode="PvP", verbose=True):
         """
         Initialize the gameplay logic.
         mode: "PvP" for Player vs. Player, "PvAI" for Player vs. AI.
+        verbose: Print both boards to the terminal after every turn.
         """
         self.player1 = player1
         self.player2 = player2
         self.mode = mode
+        self.verbose = verbose
         self.current_player = player1
         self.opponent = player2
         self.winner = None
@@ -30,38 +31,33 @@ class GamePlay:
         # Record the attack on the opponent's board
         self.opponent.board.mark_attacked(x, y)
 
-        if self.opponent.board.grid[y][x] == 'S':  # Hit
-            self.opponent.board.grid[y][x] = 'X'  # Mark hit on the opponent's grid
+        hit, ship_id, sunk = self.opponent.board.receive_attack(x, y)  # Marked on the opponent's grid
+        if hit:
             self.current_player.board.update_attack_grid(x, y, True)  # Update attack_grid
             self.current_player.hits.append((x, y))  # Track hit
-            return {"valid": True, "hit": True, "message": "Hit!"}
+            if sunk:
+                self.current_player.sunk_ships.append(self.opponent.board.ships[ship_id - 1]["coordinates"])
+                return {"valid": True, "hit": True, "sunk": True, "ship_id": ship_id, "message": "Hit! Ship sunk!"}
+            return {"valid": True, "hit": True, "sunk": False, "ship_id": ship_id, "message": "Hit!"}
 
-        elif self.opponent.board.grid[y][x] == '-':  # Miss
-            self.opponent.board.grid[y][x] = 'O'  # Mark miss on the opponent's grid
+        else:  # Miss
             self.current_player.board.update_attack_grid(x, y, False)  # Update attack_grid
             self.current_player.misses.append((x, y))  # Track miss
-            return {"valid": True, "hit": False, "message": "Miss!"}
+            return {"valid": True, "hit": False, "sunk": False, "ship_id": None, "message": "Miss!"}
 
     def random_attack(self, opponent_board):
         """
         Randomly select an unplayed cell on the opponent's board for an attack.
+        Returns (None, None) if there are no available moves.
         """
-        available_moves = [
-            (x, y) for x in range(self.cols)
-                    for y in range(self.rows)
-                    if not opponent_board.is_attacked(x, y)
-        ]
-        if not available_moves:
-            return None, None  # No available moves
-        return random.choice(available_moves)
+        return opponent_board.random_untargeted()
 
     def check_victory(self):
         """
-        Check if the opponent has lost all their ships.
+        Check if the opponent has lost all their ships (a counter compare on the board).
         """
-        for row in self.opponent.board.grid:
-            if 'S' in row:  # Check if any ships remain
-                return False
+        if self.opponent.board.has_remaining_ships():  # Check if any ships remain
+            return False
         self.winner = self.current_player.name
         self.game_over = True
         return True
@@ -75,11 +71,14 @@ class GamePlay:
     def process_turn(self, x=None, y=None):
         """
         Process the current player's turn.
-        For AI, make a move automatically.
+        For AI, make a move automatically unless (x, y) was already computed, e.g. on a worker thread.
         """
-        if self.mode == "PvAI" and self.current_player == self.player2:
-            # AI's turn
-            x, y = self.current_player.board.random_attack(self.opponent.board)
+        if self.mode == "PvAI" and self.current_player == self.player2 and (x is None or y is None):
+            # AI's turn: ask its strategy, or shoot at random for a plain Player
+            if hasattr(self.current_player, "make_move"):
+                x, y = self.current_player.make_move(self.opponent.board)
+            else:
+                x, y = self.current_player.board.random_attack(self.opponent.board)
 
         # Validate the move coordinates
         if x is None or y is None:
@@ -95,11 +94,12 @@ class GamePlay:
         attack_result["hit"] = attack_result.get("hit", False)
 
         # Display the updated game state
-        self.display_game_state()
+        if self.verbose:
+            self.display_game_state()
 
         # Check if the game is over
         if self.check_victory():
-            return {"valid": True, "winner": self.winner, "message": f"{self.winner} wins!", "hit": attack_result["hit"]}
+            return dict(attack_result, winner=self.winner, message=f"{self.winner} wins!")
 
         # Increment total and player-specific turn counters
         self.turns += 1
@@ -135,8 +135,9 @@ class GamePlay:
         self.opponent = self.player2
         self.winner = None
         self.game_over = False
-        self.player1.board = GameBoard()
-        self.player2.board = GameBoard()
+        # Keep each player's board engine (GameBoard or SparseBoard) and size
+        self.player1.board = type(self.player1.board)(self.player1.board.rows, self.player1.board.cols)
+        self.player2.board = type(self.player2.board)(self.player2.board.rows, self.player2.board.cols)
 
 
         
\ No newline at end of file
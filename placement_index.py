@@ -0,0 +1,121 @@
+"""Precomputed ship placements and a random fleet generator that always terminates.
+
+Every legal placement of a ship of a given length on a rows x cols board is computed once and
+cached as a Placement with the mask of the cells it covers: cell (x, y) is bit y * cols + x.
+"""
+
+import functools
+import random
+from collections import namedtuple
+
+Placement = namedtuple("Placement", ["length", "orientation", "start", "mask"])
+
+# Bump whenever a change here or in randomly_place_ships changes which layouts are drawn, or how often
+PLACEMENT_RULES_REVISION = 1
+DEFAULT_MAX_STEPS = 100000  # Placement attempts before random_fleet gives up
+QUICK_DRAWS = 8  # Draws from the full index before enumerating the free placements
+
+
+@functools.lru_cache(maxsize=None)
+def legal_placements(rows, cols, length):
+    """
+    Return a tuple of every in-bounds Placement of a ship of `length`.
+    A one-cell ship only gets horizontal placements so each cell appears once.
+    """
+    placements = []
+    row_run = (1 << length) - 1
+    for y in range(rows):
+        for x in range(cols - length + 1):
+            placements.append(Placement(length, 'horizontal', (x, y), row_run << (y * cols + x)))
+    if length > 1:
+        column_run = 0
+        for i in range(length):
+            column_run |= 1 << (i * cols)
+        for y in range(rows - length + 1):
+            for x in range(cols):
+                placements.append(Placement(length, 'vertical', (x, y), column_run << (y * cols + x)))
+    return tuple(placements)
+
+
+def free_placements(rows, cols, length, occupied=0):
+    """
+    Return the placements of a ship of `length` that do not touch any bit of `occupied`.
+    """
+    return [placement for placement in legal_placements(rows, cols, length) if not placement.mask & occupied]
+
+
+def occupied_mask(grid, empty='-'):
+    """
+    Build an occupancy mask from a grid[y][x] list of lists.
+    """
+    mask = 0
+    cols = len(grid[0]) if grid else 0
+    for y, row in enumerate(grid):
+        for x, cell in enumerate(row):
+            if cell != empty:
+                mask |= 1 << (y * cols + x)
+    return mask
+
+
+def quick_draw(rows, cols, length, occupied, rng=random, draws=QUICK_DRAWS):
+    """
+    Draw from the cached index until a placement misses `occupied`, at most `draws` times.
+    Returns None if every draw collided.
+    """
+    placements = legal_placements(rows, cols, length)
+    for _ in range(draws if placements else 0):
+        placement = placements[int(rng.random() * len(placements))]
+        if not placement.mask & occupied:
+            return placement
+    return None
+
+
+def random_fleet(rows, cols, ship_lengths, occupied=0, rng=random, max_steps=DEFAULT_MAX_STEPS):
+    """
+    Choose a random non-overlapping placement for every ship, in the order given.
+    Each ship is drawn uniformly from the placements still free: first with quick_draw, and after
+    QUICK_DRAWS collisions from the enumerated free placements. When a ship has none left the
+    search backtracks to the previous ship.
+    Returns a list of Placements. Raises ValueError if the fleet cannot fit, or if no layout is
+    found within max_steps placement attempts.
+    """
+    free_cells = rows * cols - bin(occupied & ((1 << (rows * cols)) - 1)).count("1")
+    if sum(ship_lengths) > free_cells:
+        raise ValueError(f"Fleet {list(ship_lengths)} does not fit on a {rows}x{cols} board")
+
+    chosen = []
+    masks = [occupied]  # masks[i] is the occupancy before ship i is placed
+    untried = [None] * len(ship_lengths)  # Shuffled alternatives per ship, enumerated on demand
+    steps = 0
+    depth = 0
+    while depth < len(ship_lengths):
+        length = ship_lengths[depth]
+        placement = None
+        if untried[depth] is None:
+            placement = quick_draw(rows, cols, length, masks[depth], rng)
+            if placement is None:
+                untried[depth] = free_placements(rows, cols, length, masks[depth])
+                rng.shuffle(untried[depth])
+        if placement is None and untried[depth]:
+            placement = untried[depth].pop()
+
+        if placement is None:  # Dead end, move the previous ship
+            if depth == 0:
+                raise ValueError(f"Fleet {list(ship_lengths)} does not fit on a {rows}x{cols} board")
+            untried[depth] = None
+            depth -= 1
+            previous = chosen.pop()
+            masks.pop()
+            if untried[depth] is None:  # The previous ship came from a quick draw
+                untried[depth] = [option for option in free_placements(rows, cols, ship_lengths[depth], masks[depth])
+                                  if option != previous]
+                rng.shuffle(untried[depth])
+            continue
+
+        steps += 1
+        if steps > max_steps:
+            raise ValueError(f"Could not place fleet {list(ship_lengths)} within {max_steps} attempts")
+        chosen.append(placement)
+        masks.append(masks[depth] | placement.mask)
+        depth += 1
+    return chosen
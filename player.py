@@ -1,14 +1,17 @@
-from game_logic import GameBoard  # Import the GameBoard for board management
-import random
+import heatmap_cache
+from game_logic import GameBoard, FLEET_LENGTHS  # Import the GameBoard for board management
+from strategies import HuntTargetStrategy, ProbabilityDensityStrategy
 
-GRID_SIZE = 10
+from config import GRID_SIZE
 
 class Player:
-    def __init__(self, name):
+    def __init__(self, name, board=None):
         self.name = name
-        self.board = GameBoard(10, 10)  # Create a new 10x10 board for the player
+        # Create a new GRID_SIZE x GRID_SIZE board unless a board engine (e.g. SparseBoard) is given
+        self.board = board if board is not None else GameBoard(GRID_SIZE, GRID_SIZE)
         self.hits = []  # Coordinates of successful hits
         self.misses = []  # Coordinates of missed attacks
+        self.sunk_ships = []  # Coordinates of each opponent ship this player has sunk
 
     def place_ships(self, ships):
         """
@@ -25,24 +28,31 @@ class Player:
         x, y: Coordinates of the attack.
         Returns True if it's a hit, False if it's a miss.
         """
-        if opponent.board.grid[y][x] == "S":  # "S" marks a ship
+        hit, ship_id, sunk = opponent.board.receive_attack(x, y)  # Marks "X" on a ship, "O" otherwise
+        if hit:
             self.hits.append((x, y))
-            opponent.board.grid[y][x] = "X"  # Mark as hit
+            if sunk:
+                self.sunk_ships.append(opponent.board.ships[ship_id - 1]["coordinates"])
             return True  # Hit
         else:
             self.misses.append((x, y))
-            opponent.board.grid[y][x] = "O"  # Mark as miss
             return False  # Miss
 
 class AIPlayer(Player):
-    def __init__(self, name, difficulty, num_boats):
-        super().__init__(name)
+    def __init__(self, name, difficulty, num_boats, board=None):
+        super().__init__(name, board)
         self.difficulty = difficulty  # Assign the difficulty level to the instance
+        self.num_boats = num_boats  # The opponent's fleet has the same ships
+        self.hunt_target = None  # Medium mode target frontier, built on the first move
+        self.density = None  # Hard mode placement counts, built on the first move
+        self.opening = None  # Hard mode opening from heatmap_cache, read on the first move
 
-    def make_move(self, opponent_board):
+    def make_move(self, opponent_board, deadline=None):
         """
         Make a move based on AI difficulty level.
         opponent_board: The board of the opponent to attack.
+        deadline: time.monotonic() value by which a searching strategy returns its best move so
+        far; the Easy, Medium and Hard strategies always answer immediately.
         Returns the coordinates (x, y) of the move.
         """
         if self.difficulty == "Easy":
@@ -56,34 +66,53 @@ class AIPlayer(Player):
         """
         Easy mode: Randomly selects an unplayed cell.
         """
-        available_moves = [
-            (x, y)
-            for x in range(GRID_SIZE)
-            for y in range(GRID_SIZE)
-            if not opponent_board.is_attacked(x, y)
-        ]
-        return random.choice(available_moves) if available_moves else (None, None)
+        return opponent_board.random_untargeted()
 
     def medium_move(self, opponent_board):
         """
-        Medium mode: Targets surrounding cells of a previous hit.
+        Medium mode: Targets surrounding cells of hits on ships that are not sunk yet,
+        following the line of a partly hit ship, otherwise falls back to easy_move.
         """
-        for x, y in self.hits:
-            potential_targets = [
-                (x + dx, y + dy)
-                for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]
-                if 0 <= x + dx < GRID_SIZE and 0 <= y + dy < GRID_SIZE and not opponent_board.is_attacked(x + dx, y + dy)
-            ]
-            if potential_targets:
-                return random.choice(potential_targets)
-        return self.easy_move(opponent_board)
+        if self.hunt_target is None:
+            self.hunt_target = HuntTargetStrategy(opponent_board.rows, opponent_board.cols)
+        self.hunt_target.observe(self.hits, self.misses, self.sunk_ships)
+        x, y = self.hunt_target.choose_move()
+        if x is None or opponent_board.is_attacked(x, y):
+            return self.easy_move(opponent_board)
+        return x, y
 
     def hard_move(self, opponent_board):
         """
-        Hard mode: Directly targets ship cells if known, otherwise falls back to easy_move.
+        Hard mode: Shoots the cell covered by the most ship placements that fit the hits and misses so far.
+        Until the first hit, plays the precomputed opening for this fleet instead, and weights the
+        counts by its precomputed prior, if there is a table.
+        """
+        move = self.opening_move(opponent_board)
+        if move is not None:
+            return move
+        if self.density is None:
+            fleet = FLEET_LENGTHS[:self.num_boats]
+            self.density = ProbabilityDensityStrategy(
+                opponent_board.rows, opponent_board.cols, fleet,
+                heatmap_cache.prior(opponent_board.rows, opponent_board.cols, fleet))
+        self.density.observe(self.hits, self.misses, self.sunk_ships)
+        x, y = self.density.choose_move()
+        if x is None or opponent_board.is_attacked(x, y):
+            return self.easy_move(opponent_board)
+        return x, y
+
+    def opening_move(self, opponent_board):
+        """
+        Returns the next cell of the heatmap_cache opening, or None once a shot has hit, the
+        opening is used up, or the misses no longer follow it (e.g. after an Easy fallback).
         """
-        for x in range(GRID_SIZE):
-            for y in range(GRID_SIZE):
-                if opponent_board.grid[x][y] == "S" and not opponent_board.is_attacked(x, y):
-                    return x, y
-        return self.easy_move(opponent_board)
+        if self.opening is None:
+            self.opening = heatmap_cache.opening(
+                opponent_board.rows, opponent_board.cols, FLEET_LENGTHS[:self.num_boats])
+        shots = len(self.misses)
+        if self.hits or shots >= len(self.opening) or self.misses != self.opening[:shots]:
+            return None
+        x, y = self.opening[shots]
+        if opponent_board.is_attacked(x, y):
+            return None
+        return x, y
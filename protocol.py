@@ -0,0 +1,318 @@
+"""Compact binary wire protocol for server.py.
+
+Encodes the same message dicts the server exchanges as JSON lines, in a fraction of the bytes:
+fixed-width coordinates, flag bytes instead of booleans, code tables instead of English text and
+boards as bit-packed masks. A client opts in by sending PREAMBLE ("NAVW" and the protocol
+version) right after connecting; anything else is treated as a JSON client.
+
+Every message is a frame: a 2-byte length, a 1-byte message type and the body. All integers are
+big-endian. Boards are masks with cell (x, y) at bit y * size + x, the layout placement_index
+uses, sent as ceil(size * size / 8) little-endian bytes; decode() turns them straight back into
+ints with int.from_bytes on a memoryview of the frame, ready to compare or OR together.
+
+Message bodies (type code, layout):
+    join      1  boats B, name (rest, UTF-8)
+    move      2  x B, y B
+    resync    3  since I                       0 asks for a snapshot, n for the shots after turn n
+    queued   16
+    start    17  game I, size B, boats B, flags B, turn_timeout ms I, ships, opponent (rest)
+    shot     18  x B, y B, flags B             3 bytes instead of ~90 as JSON
+    sunk     19  flags B, ship
+    invalid  20  reason code B
+    end      21  reason code B, flags B, winner (rest)
+    error    22  error code B
+    delta    23  since I, turn I, count H, count * (x B, y B, flags B)
+    snapshot 24  game I, size B, boats B, turn I, flags B, 4 masks, ships, sunk ships
+
+A ship is x B, y B, length B, orientation B (its first cell and 0 horizontal, 1 vertical); a
+list of ships is a count B followed by the ships.
+"""
+
+import asyncio
+import json
+import struct
+
+PROTOCOL_VERSION = 1
+MAGIC = b"NAVW"
+PREAMBLE = MAGIC + bytes([PROTOCOL_VERSION])
+MAX_FRAME = 0xFFFF
+MAX_SIZE = 0xFF  # Largest grid size: coordinates and sizes are single bytes
+
+FRAME = struct.Struct("!HB")  # Length of type and body, message type
+BYTE = struct.Struct("!B")
+COORDINATES = struct.Struct("!BB")
+SHOT = struct.Struct("!BBB")
+SHIP = struct.Struct("!BBBB")
+RESYNC = struct.Struct("!I")
+START = struct.Struct("!IBBBI")
+END = struct.Struct("!BB")
+DELTA = struct.Struct("!IIH")
+SNAPSHOT = struct.Struct("!IBBIB")
+
+# Message type codes
+JOIN, MOVE, RESYNC_REQUEST = 1, 2, 3
+QUEUED, START_GAME, SHOT_RESULT, SUNK, INVALID, END_GAME, ERROR, DELTA_UPDATE, FULL_SNAPSHOT = range(16, 25)
+
+# Flag bits
+HIT = 0x01
+SUNK_SHIP = 0x02
+YOUR_TURN = 0x04
+BY_OPPONENT = 0x08
+YOU_WON = 0x01
+HAS_WINNER = 0x02
+
+# Code tables for the server's texts; unknown texts are sent as the first entry
+INVALID_REASONS = [
+    "Invalid move.",
+    "Not your turn.",
+    "Coordinates out of range.",
+    "Cell already attacked. Try again.",
+    "Invalid coordinates.",
+]
+ERRORS = [
+    "Malformed message.",
+    "Not in a game.",
+    "Already queued or playing.",
+    "boats must be 1 to 5.",
+    "Unknown message type.",
+    "Unsupported protocol version.",
+]
+END_REASONS = ["victory", "timeout", "disconnect", "shutdown"]
+
+
+class ProtocolError(ValueError):
+    """
+    Raised for a frame that cannot be decoded.
+    """
+
+
+class UnsupportedVersion(ProtocolError):
+    """
+    Raised by accept() for a binary client speaking another protocol version.
+    """
+
+
+def _code(table, text):
+    try:
+        return table.index(text)
+    except ValueError:
+        return 0
+
+
+def _mask_bytes(size):
+    return (size * size + 7) // 8
+
+
+def _shot_flags(shot):
+    return ((HIT if shot["hit"] else 0) | (SUNK_SHIP if shot["sunk"] else 0)
+            | (YOUR_TURN if shot.get("your_turn") else 0) | (BY_OPPONENT if shot["by"] == "opponent" else 0))
+
+
+def _encode_ships(ships):
+    parts = [BYTE.pack(len(ships))]
+    for coordinates in ships:
+        (x, y), length = coordinates[0], len(coordinates)
+        vertical = length > 1 and coordinates[1][0] == x
+        parts.append(SHIP.pack(x, y, length, 1 if vertical else 0))
+    return b"".join(parts)
+
+
+def _decode_ships(view, offset):
+    count = view[offset]
+    offset += 1
+    ships = []
+    for _ in range(count):
+        x, y, length, vertical = SHIP.unpack_from(view, offset)
+        offset += SHIP.size
+        if vertical:
+            ships.append([[x, y + i] for i in range(length)])
+        else:
+            ships.append([[x + i, y] for i in range(length)])
+    return ships, offset
+
+
+def _encode_body(message):
+    kind = message["type"]
+    if kind == "join":
+        return JOIN, BYTE.pack(message.get("boats", 5)) + str(message.get("name") or "").encode()
+    if kind == "move":
+        return MOVE, COORDINATES.pack(message["x"], message["y"])
+    if kind == "resync":
+        return RESYNC_REQUEST, RESYNC.pack(message.get("since", 0))
+    if kind == "queued":
+        return QUEUED, b""
+    if kind == "start":
+        header = START.pack(message["game"], message["size"], message["boats"],
+                            YOUR_TURN if message["your_turn"] else 0, round(message["turn_timeout"] * 1000))
+        return START_GAME, header + _encode_ships(message["ships"]) + message["opponent"].encode()
+    if kind == "shot":
+        return SHOT_RESULT, SHOT.pack(message["x"], message["y"], _shot_flags(message))
+    if kind == "sunk":
+        flags = BY_OPPONENT if message["by"] == "opponent" else 0
+        return SUNK, BYTE.pack(flags) + _encode_ships([message["ship"]])[1:]
+    if kind == "invalid":
+        return INVALID, BYTE.pack(_code(INVALID_REASONS, message["message"]))
+    if kind == "end":
+        winner = message["winner"]
+        flags = (YOU_WON if message["you_won"] else 0) | (HAS_WINNER if winner is not None else 0)
+        return END_GAME, END.pack(_code(END_REASONS, message["reason"]), flags) + (winner or "").encode()
+    if kind == "error":
+        return ERROR, BYTE.pack(_code(ERRORS, message["message"]))
+    if kind == "delta":
+        shots = message["shots"]
+        body = [DELTA.pack(message["since"], message["turn"], len(shots))]
+        body.extend(SHOT.pack(shot["x"], shot["y"], _shot_flags(shot)) for shot in shots)
+        return DELTA_UPDATE, b"".join(body)
+    if kind == "snapshot":
+        size = message["size"]
+        length = _mask_bytes(size)
+        body = [SNAPSHOT.pack(message["game"], size, message["boats"], message["turn"],
+                              YOUR_TURN if message["your_turn"] else 0)]
+        for name in ("hits_taken", "misses_taken", "hits", "misses"):
+            body.append(message[name].to_bytes(length, "little"))
+        body.append(_encode_ships(message["ships"]))
+        body.append(_encode_ships(message["sunk"]))
+        return FULL_SNAPSHOT, b"".join(body)
+    raise ValueError(f"Unknown message type {kind!r}")
+
+
+def encode(message):
+    """
+    Return the frame for a message dict.
+    """
+    kind, body = _encode_body(message)
+    if len(body) + 1 > MAX_FRAME:
+        raise ValueError(f"{message['type']} message too long ({len(body)} bytes)")
+    return FRAME.pack(len(body) + 1, kind) + body
+
+
+def _decode_shot(flags, x, y):
+    return {"by": "opponent" if flags & BY_OPPONENT else "you", "x": x, "y": y,
+            "hit": bool(flags & HIT), "sunk": bool(flags & SUNK_SHIP)}
+
+
+def decode(kind, body):
+    """
+    Return the message dict of a frame's type code and body (bytes or a memoryview).
+    """
+    view = memoryview(body)
+    try:
+        if kind == JOIN:
+            return {"type": "join", "boats": view[0], "name": bytes(view[1:]).decode()}
+        if kind == MOVE:
+            x, y = COORDINATES.unpack_from(view)
+            return {"type": "move", "x": x, "y": y}
+        if kind == RESYNC_REQUEST:
+            return {"type": "resync", "since": RESYNC.unpack_from(view)[0]}
+        if kind == QUEUED:
+            return {"type": "queued"}
+        if kind == START_GAME:
+            game, size, boats, flags, timeout = START.unpack_from(view)
+            ships, offset = _decode_ships(view, START.size)
+            return {"type": "start", "game": game, "opponent": bytes(view[offset:]).decode(), "size": size,
+                    "boats": boats, "ships": ships, "your_turn": bool(flags & YOUR_TURN),
+                    "turn_timeout": timeout / 1000}
+        if kind == SHOT_RESULT:
+            x, y, flags = SHOT.unpack_from(view)
+            return dict(type="shot", **_decode_shot(flags, x, y), your_turn=bool(flags & YOUR_TURN))
+        if kind == SUNK:
+            ships, _ = _decode_ships(b"\x01" + bytes(view[1:1 + SHIP.size]), 0)
+            return {"type": "sunk", "by": "opponent" if view[0] & BY_OPPONENT else "you", "ship": ships[0]}
+        if kind == INVALID:
+            return {"type": "invalid", "message": INVALID_REASONS[view[0]]}
+        if kind == END_GAME:
+            reason, flags = END.unpack_from(view)
+            winner = bytes(view[END.size:]).decode() if flags & HAS_WINNER else None
+            return {"type": "end", "winner": winner, "you_won": bool(flags & YOU_WON), "reason": END_REASONS[reason]}
+        if kind == ERROR:
+            return {"type": "error", "message": ERRORS[view[0]]}
+        if kind == DELTA_UPDATE:
+            since, turn, count = DELTA.unpack_from(view)
+            shots = []
+            for offset in range(DELTA.size, DELTA.size + count * SHOT.size, SHOT.size):
+                x, y, flags = SHOT.unpack_from(view, offset)
+                shots.append(_decode_shot(flags, x, y))
+            return {"type": "delta", "since": since, "turn": turn, "shots": shots}
+        if kind == FULL_SNAPSHOT:
+            game, size, boats, turn, flags = SNAPSHOT.unpack_from(view)
+            message = {"type": "snapshot", "game": game, "size": size, "boats": boats, "turn": turn,
+                       "your_turn": bool(flags & YOUR_TURN)}
+            length = _mask_bytes(size)
+            offset = SNAPSHOT.size
+            for name in ("hits_taken", "misses_taken", "hits", "misses"):
+                message[name] = int.from_bytes(view[offset:offset + length], "little")
+                offset += length
+            message["ships"], offset = _decode_ships(view, offset)
+            message["sunk"], offset = _decode_ships(view, offset)
+            return message
+    except (struct.error, IndexError, UnicodeDecodeError) as error:
+        raise ProtocolError(f"Malformed frame of type {kind}: {error}") from error
+    raise ProtocolError(f"Unknown message type code {kind}")
+
+
+class JsonCodec:
+    """
+    Newline-delimited JSON, the default for clients that don't send the preamble.
+    `pending` holds bytes already read from the stream while sniffing for the preamble.
+    """
+    binary = False
+
+    def __init__(self, pending=b""):
+        self.pending = pending
+
+    def encode(self, message):
+        return json.dumps(message).encode() + b"\n"
+
+    async def read(self, reader):
+        """
+        Return the next message, or None at the end of the stream.
+        """
+        line = self.pending + await reader.readline()
+        self.pending = b""
+        if not line:
+            return None
+        return json.loads(line)
+
+
+class BinaryCodec:
+    """
+    Length-prefixed binary frames.
+    """
+    binary = True
+
+    def encode(self, message):
+        return encode(message)
+
+    async def read(self, reader):
+        """
+        Return the next message, or None at the end of the stream.
+        """
+        try:
+            length, kind = FRAME.unpack(await reader.readexactly(FRAME.size))
+            body = await reader.readexactly(length - 1) if length > 1 else b""
+        except asyncio.IncompleteReadError:
+            return None
+        return decode(kind, body)
+
+
+async def accept(reader):
+    """
+    Read the start of a new connection and return the codec its client speaks, or None if it
+    closed straight away. Raises UnsupportedVersion for another protocol version, and
+    ProtocolError for any other bad preamble.
+    """
+    try:
+        first = await reader.readexactly(1)
+    except asyncio.IncompleteReadError:
+        return None
+    if first != MAGIC[:1]:
+        return JsonCodec(first)
+    try:
+        rest = await reader.readexactly(len(PREAMBLE) - 1)
+    except asyncio.IncompleteReadError:
+        return None
+    if first + rest[:len(MAGIC) - 1] != MAGIC:
+        raise ProtocolError(f"Unsupported protocol preamble {first + rest!r}")
+    if rest[-1] != PROTOCOL_VERSION:
+        raise UnsupportedVersion(f"Unsupported protocol version {rest[-1]}")
+    return BinaryCodec()
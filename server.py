@@ -0,0 +1,485 @@
+"""Asyncio Battleship server hosting many PvP games at once.
+
+One process and one event loop: every connection is served by its own coroutine, players are
+paired by fleet size in arrival order, and each pair plays a GamePlay on the --engine board
+(GameBoard by default, SparseBoard for very large grids). Fleets are placed at random by the server.
+A player who doesn't move within the turn timeout, or who disconnects, loses the game. When a
+game is over the connection can join again.
+
+Messages are JSON objects, one per line, unless the client starts with protocol.PREAMBLE: then
+the same messages travel as compact binary frames (see protocol.py).
+
+client -> server
+    {"type": "join", "name": "Ann", "boats": 5}
+    {"type": "move", "x": 3, "y": 7}
+    {"type": "resync", "since": 12}                  0 for a snapshot, n for the shots after turn n
+
+server -> client
+    {"type": "queued"}
+    {"type": "start", "game": 1, "opponent": "Bob", "size": 10, "boats": 5,
+     "ships": [[[0, 0], [1, 0]], ...], "your_turn": true, "turn_timeout": 30}
+    {"type": "shot", "by": "you", "x": 3, "y": 7, "hit": true, "sunk": false, "your_turn": false}
+    {"type": "sunk", "by": "you", "ship": [[3, 7], [4, 7]]}
+    {"type": "delta", "since": 12, "turn": 14, "shots": [{"by": ..., "x": ..., ...}, ...]}
+    {"type": "snapshot", "game": 1, "size": 10, "boats": 5, "turn": 14, "your_turn": true,
+     "ships": [...], "sunk": [...], "hits_taken": 0, "misses_taken": 0, "hits": 0, "misses": 0}
+    {"type": "invalid", "message": "Cell already attacked. Try again."}
+    {"type": "end", "winner": "Ann", "you_won": true, "reason": "victory"}
+    {"type": "error", "message": "Not in a game."}
+
+"by" is "you" or "opponent"; "reason" is victory, timeout, disconnect or shutdown (no winner).
+Each turn both players get the shot, and a sunk message when it sank a ship: only what changed.
+The snapshot's masks hold cell (x, y) at bit y * size + x, hits_taken and misses_taken on the
+player's own board and hits and misses on the opponent's.
+
+With --archive every turn of every game is checkpointed to a snapshot.SnapshotArchive under its
+game id (ids restart at 1 with each server run). The event loop only packs the snapshots; they are
+written and flushed in batches every ARCHIVE_FLUSH_SECONDS on a thread of their own.
+
+Usage:
+    python server.py --host 0.0.0.0 --port 8765 --turn-timeout 30 --stats 10
+    python server.py --archive games.snap --engine sparse
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from config import ARCHIVE_FLUSH_SECONDS, GRID_SIZE, SERVER_HOST, SERVER_PORT, TURN_TIMEOUT
+from game_logic import FLEET_LENGTHS
+from naval_warfare_game import GamePlay
+from placement_index import random_fleet
+from player import Player
+from protocol import MAX_SIZE, ProtocolError, UnsupportedVersion, accept, encode
+from simulation import BOARD_ENGINES
+from snapshot import SnapshotArchive, snapshot
+
+MAX_LINE = 4096  # Longest accepted message in bytes; longer ones close the connection
+MAX_NAME = 32
+BACKLOG = 1024  # Pending connections, for bursts of players joining at once
+
+
+class Connection:
+    """
+    One connected client and, while it plays, its Player and Session.
+    """
+    def __init__(self, number, reader, writer):
+        self.number = number
+        self.reader = reader
+        self.writer = writer
+        self.codec = None  # protocol.JsonCodec or BinaryCodec, picked by the client's first bytes
+        self.name = f"Player {number}"
+        self.boats = None  # Fleet size queued for
+        self.player = None
+        self.session = None
+        self.closed = False
+
+    def send(self, message):
+        """
+        Write a message to the client. Opponents write to each other's stream, each connection's
+        own coroutine waits for its buffer to drain.
+        """
+        if not self.closed:
+            self.writer.write(self.codec.encode(message))
+
+
+def cell_mask(cells, cols):
+    """
+    Return the mask of (x, y) cells, with cell (x, y) at bit y * cols + x.
+    """
+    mask = 0
+    for x, y in cells:
+        mask |= 1 << (y * cols + x)
+    return mask
+
+
+class Session:
+    """
+    A game between two connections, with the turn timer of the player to move.
+    """
+    def __init__(self, server, game_id, first, second, boats):
+        self.server = server
+        self.game_id = game_id
+        self.connections = (first, second)
+        self.boats = boats
+        for connection in self.connections:
+            connection.player = Player(connection.name, server.board_class(server.size, server.size))
+            connection.player.board.randomly_place_ships(FLEET_LENGTHS[:boats])
+            connection.session = self
+        self.game = GamePlay(first.player, second.player, verbose=False)
+        self.shots = []  # (connection, x, y, hit, sunk) of every shot, for resyncs
+        self.timer = None  # asyncio TimerHandle of the current turn
+        self.over = False
+
+    def other(self, connection):
+        first, second = self.connections
+        return second if connection is first else first
+
+    def to_move(self):
+        first, second = self.connections
+        return first if self.game.current_player is first.player else second
+
+    def start(self):
+        for connection in self.connections:
+            connection.send({
+                "type": "start",
+                "game": self.game_id,
+                "opponent": self.other(connection).name,
+                "size": self.server.size,
+                "boats": self.boats,
+                "ships": [ship["coordinates"] for ship in connection.player.board.ships],
+                "your_turn": connection is self.to_move(),
+                "turn_timeout": self.server.turn_timeout,
+            })
+        self._restart_timer()
+
+    def move(self, connection, x, y):
+        """
+        Play `connection`'s shot at (x, y) and tell both players what happened.
+        """
+        if connection is not self.to_move():
+            connection.send({"type": "invalid", "message": "Not your turn."})
+            return
+        size = self.server.size
+        if type(x) is not int or type(y) is not int or not (0 <= x < size and 0 <= y < size):
+            connection.send({"type": "invalid", "message": "Coordinates out of range."})
+            return
+
+        result = self.game.process_turn(x, y)
+        if not result["valid"]:
+            connection.send({"type": "invalid", "message": result["message"]})
+            return
+        self.server.moves += 1
+        if self.server.archive is not None:
+            self.server.archive_queue.append((self.game_id, snapshot(self.game)))
+        sunk = result.get("sunk", False)
+        self.shots.append((connection, x, y, result["hit"], sunk))
+        for player in self.connections:
+            player.send({
+                "type": "shot",
+                "by": "you" if player is connection else "opponent",
+                "x": x,
+                "y": y,
+                "hit": result["hit"],
+                "sunk": sunk,
+                "your_turn": not self.game.game_over and player is self.to_move(),
+            })
+            if sunk:
+                player.send({
+                    "type": "sunk",
+                    "by": "you" if player is connection else "opponent",
+                    "ship": self.other(connection).player.board.ships[result["ship_id"] - 1]["coordinates"],
+                })
+        if self.game.game_over:
+            self.end(connection, "victory")
+        else:
+            self._restart_timer()
+
+    def resync(self, connection, since):
+        """
+        Send `connection` the shots played after turn `since`, or a full snapshot for 0 or a turn
+        it cannot have seen.
+        """
+        if type(since) is int and 0 < since <= len(self.shots):
+            connection.send({
+                "type": "delta",
+                "since": since,
+                "turn": len(self.shots),
+                "shots": [{"by": "you" if shooter is connection else "opponent", "x": x, "y": y, "hit": hit, "sunk": sunk}
+                          for shooter, x, y, hit, sunk in self.shots[since:]],
+            })
+            return
+        board = connection.player.board
+        opponent = self.other(connection).player
+        connection.send({
+            "type": "snapshot",
+            "game": self.game_id,
+            "size": self.server.size,
+            "boats": self.boats,
+            "turn": len(self.shots),
+            "your_turn": connection is self.to_move(),
+            "ships": [ship["coordinates"] for ship in board.ships],
+            "sunk": connection.player.sunk_ships,
+            "hits_taken": cell_mask(opponent.hits, board.cols),
+            "misses_taken": cell_mask(opponent.misses, board.cols),
+            "hits": cell_mask(connection.player.hits, board.cols),
+            "misses": cell_mask(connection.player.misses, board.cols),
+        })
+
+    def _restart_timer(self):
+        if self.timer is not None:
+            self.timer.cancel()
+        if self.server.turn_timeout > 0:
+            self.timer = asyncio.get_running_loop().call_later(self.server.turn_timeout, self._timed_out)
+
+    def _timed_out(self):
+        self.end(self.other(self.to_move()), "timeout")
+
+    def end(self, winner, reason):
+        """
+        Finish the game, `winner` (a Connection, or None) taking it for `reason`.
+        """
+        if self.over:
+            return
+        self.over = True
+        if self.timer is not None:
+            self.timer.cancel()
+        for connection in self.connections:
+            connection.send({
+                "type": "end",
+                "winner": winner.name if winner else None,
+                "you_won": connection is winner,
+                "reason": reason,
+            })
+            connection.session = None
+            connection.player = None
+        self.server.finish(self, reason)
+
+
+class GameServer:
+    """
+    Accepts connections, pairs players and keeps the running sessions.
+    """
+    def __init__(self, size=GRID_SIZE, turn_timeout=TURN_TIMEOUT, archive=None, engine="grid"):
+        if not 1 <= size <= MAX_SIZE:
+            raise ValueError(f"Grid size must be 1 to {MAX_SIZE}, the binary protocol sends it in one byte")
+        self.size = size
+        self.turn_timeout = turn_timeout
+        self.board_class = BOARD_ENGINES[engine]
+        self.archive = archive  # SnapshotArchive that gets a snapshot after every move, or None
+        self.archive_queue = []  # (game id, snapshot bytes) not written to the archive yet
+        self.archive_executor = None  # The one thread that writes to the archive
+        if archive is not None:
+            self.archive_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archive")
+        self.archive_task = None
+        self.fleet_fits = {}  # Fleet size -> whether that fleet can be placed on this grid
+        self.waiting = {}  # Fleet size -> deque of connections waiting for an opponent
+        self.sessions = {}  # Game id -> running Session
+        self.connections = set()
+        self.game_ids = itertools.count(1)
+        self.connection_numbers = itertools.count(1)
+        self.games_finished = 0
+        self.endings = {}  # Reason -> games finished for it
+        self.moves = 0
+
+    async def start(self, host=SERVER_HOST, port=SERVER_PORT):
+        """
+        Start listening and return the asyncio Server; port 0 picks a free port.
+        """
+        if self.archive is not None and self.archive_task is None:
+            self.archive_task = asyncio.create_task(self.write_archive())
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_LINE, backlog=BACKLOG)
+
+    async def handle(self, reader, writer):
+        """
+        Serve one connection until the client leaves.
+        """
+        connection = Connection(next(self.connection_numbers), reader, writer)
+        self.connections.add(connection)
+        try:
+            try:
+                connection.codec = await accept(reader)
+            except UnsupportedVersion:
+                # Answer in this version's framing so the client can tell why it was dropped
+                writer.write(encode({"type": "error", "message": "Unsupported protocol version."}))
+                await writer.drain()
+                raise
+            while connection.codec is not None:
+                try:
+                    message = await connection.codec.read(reader)
+                except (json.JSONDecodeError, UnicodeDecodeError, ProtocolError):
+                    connection.send({"type": "error", "message": "Malformed message."})
+                    continue
+                except ValueError:  # A line longer than MAX_LINE: the stream can't be split into messages
+                    break
+                if message is None:
+                    break
+                self.dispatch(connection, message)
+                await writer.drain()
+        except (ConnectionError, ProtocolError):  # ProtocolError: a bad preamble
+            pass
+        finally:
+            self.disconnect(connection)
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    def dispatch(self, connection, message):
+        try:
+            kind = message["type"]
+        except (KeyError, TypeError):
+            connection.send({"type": "error", "message": "Malformed message."})
+            return
+        if kind == "join":
+            self.join(connection, message)
+        elif kind == "move":
+            if connection.session is None:
+                connection.send({"type": "error", "message": "Not in a game."})
+            else:
+                connection.session.move(connection, message.get("x"), message.get("y"))
+        elif kind == "resync":
+            if connection.session is None:
+                connection.send({"type": "error", "message": "Not in a game."})
+            else:
+                connection.session.resync(connection, message.get("since", 0))
+        else:
+            connection.send({"type": "error", "message": "Unknown message type."})
+
+    def join(self, connection, message):
+        """
+        Pair `connection` with a player waiting for the same fleet size, or queue it.
+        """
+        if connection.session is not None or connection.boats is not None:
+            connection.send({"type": "error", "message": "Already queued or playing."})
+            return
+        boats = message.get("boats", len(FLEET_LENGTHS))
+        if type(boats) is not int or not 1 <= boats <= len(FLEET_LENGTHS):
+            connection.send({"type": "error", "message": f"boats must be 1 to {len(FLEET_LENGTHS)}."})
+            return
+        if not self.fits(boats):
+            connection.send({"type": "error",
+                             "message": f"A {boats}-boat fleet doesn't fit on a {self.size}x{self.size} grid."})
+            return
+        if message.get("name"):
+            connection.name = str(message["name"])[:MAX_NAME]
+
+        queue = self.waiting.setdefault(boats, deque())
+        if not queue:
+            connection.boats = boats
+            queue.append(connection)
+            connection.send({"type": "queued"})
+            return
+        opponent = queue.popleft()
+        opponent.boats = None
+        session = Session(self, next(self.game_ids), opponent, connection, boats)
+        self.sessions[session.game_id] = session
+        session.start()
+
+    def fits(self, boats):
+        """
+        True if a fleet of `boats` ships can be placed on this server's grid.
+        """
+        if boats not in self.fleet_fits:
+            try:
+                random_fleet(self.size, self.size, FLEET_LENGTHS[:boats])
+                self.fleet_fits[boats] = True
+            except ValueError:
+                self.fleet_fits[boats] = False
+        return self.fleet_fits[boats]
+
+    def disconnect(self, connection):
+        connection.closed = True
+        self.connections.discard(connection)
+        if connection.session is not None:
+            connection.session.end(connection.session.other(connection), "disconnect")
+        elif connection.boats is not None:
+            self.waiting[connection.boats].remove(connection)
+            connection.boats = None
+
+    def finish(self, session, reason):
+        del self.sessions[session.game_id]
+        self.games_finished += 1
+        self.endings[reason] = self.endings.get(reason, 0) + 1
+
+    def _append_records(self, records):
+        for game_id, record in records:
+            self.archive.append_record(game_id, record)
+        self.archive.flush()
+
+    async def write_archive(self, interval=ARCHIVE_FLUSH_SECONDS):
+        """
+        Every `interval` seconds, write and flush the queued snapshots on the archive thread.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            records, self.archive_queue = self.archive_queue, []
+            if records:
+                await loop.run_in_executor(self.archive_executor, self._append_records, records)
+
+    def close_archive(self):
+        """
+        Stop the archive writer, write what is still queued and close the archive.
+        """
+        if self.archive_task is not None:
+            self.archive_task.cancel()
+        records, self.archive_queue = self.archive_queue, []
+        # Queued behind any batch still being written, so the files are only touched by one thread
+        self.archive_executor.submit(self._append_records, records).result()
+        self.archive_executor.shutdown()
+        self.archive.close()
+
+    def shutdown(self):
+        """
+        End every running game without a winner and close every connection.
+        """
+        for session in list(self.sessions.values()):
+            session.end(None, "shutdown")
+        for connection in list(self.connections):
+            connection.writer.close()
+
+    def status(self):
+        queued = sum(len(queue) for queue in self.waiting.values())
+        return (f"{len(self.connections)} connected, {queued} queued, {len(self.sessions)} games running, "
+                f"{self.games_finished} finished, {self.moves} moves")
+
+
+async def report_status(server, interval):
+    """
+    Print the server status and move rate every `interval` seconds.
+    """
+    moves = server.moves
+    started = time.perf_counter()
+    while True:
+        await asyncio.sleep(interval)
+        now = time.perf_counter()
+        print(f"{server.status()} ({(server.moves - moves) / (now - started):.0f} moves/s)", flush=True)
+        moves = server.moves
+        started = now
+
+
+async def serve(host, port, size, turn_timeout, stats_interval=None, archive_path=None, engine="grid"):
+    archive = SnapshotArchive(archive_path) if archive_path else None
+    server = GameServer(size, turn_timeout, archive, engine)
+    listener = await server.start(host, port)
+    address = listener.sockets[0].getsockname()
+    print(f"Serving Battleship on {address[0]}:{address[1]} ({size}x{size}, turn timeout {turn_timeout}s)", flush=True)
+    reporter = asyncio.create_task(report_status(server, stats_interval)) if stats_interval else None
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+        server.shutdown()
+        if archive is not None:
+            server.close_archive()
+        print(server.status())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host networked Battleship games.")
+    parser.add_argument("--host", default=SERVER_HOST, help="address to listen on")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="port to listen on")
+    parser.add_argument("--size", type=int, default=GRID_SIZE, help="grid size of every game")
+    parser.add_argument("--turn-timeout", type=float, default=TURN_TIMEOUT, help="seconds a player has to move, 0 for no limit")
+    parser.add_argument("--stats", type=float, default=None, help="print the server status every n seconds")
+    parser.add_argument("--archive", default=None, help="checkpoint every turn to this snapshot archive")
+    parser.add_argument("--engine", choices=sorted(BOARD_ENGINES), default="grid", help="board engine of every game")
+    args = parser.parse_args(argv)
+    if not 1 <= args.size <= MAX_SIZE:
+        parser.error(f"--size must be 1 to {MAX_SIZE}")
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.size, args.turn_timeout, args.stats, args.archive, args.engine))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,17 @@
 import pygame
-from game_logic import GameBoard
+from game_logic import GameBoard, FLEET_LENGTHS
+from config import GRID_SIZE
 import sys
 from game_state import select_number_of_boats
 from player import Player, AIPlayer
+from instrumentation import profiler
+from frame_loop import FrameLoop
+from assets import assets
+from fonts import get_font, render_text
 
 # Constants
-ROWS, COLS = 10, 10
-CELL_SIZE = 40
+ROWS, COLS = GRID_SIZE, GRID_SIZE
+CELL_SIZE = max(1, 400 // GRID_SIZE)  # The placement grid is drawn 400px wide
 WINDOW_WIDTH = 800  # Resized window width for game window
 WINDOW_HEIGHT = 600  # Resized window height for game window
 GRID_COLOR = (255, 255, 255)
@@ -17,13 +22,22 @@ BLUE = (0, 0, 255)
 LIGHT_GREY = (200, 200, 200)
 GREEN = (0, 255, 0)
 
+# Image of each ship class, by ship length
+SHIP_IMAGES = {
+    5: "AircraftCarrier.png",
+    4: "Destroyer.png",
+    3: "Submarine.png",
+    2: "PatrolBoat.png",
+    1: "ship.png",
+}
+
 # Ship Placement Class
 class Ship:
-    def __init__(self, length, orientation, position, image):
+    def __init__(self, length, orientation, position, image=None):
         self.length = length
         self.orientation = orientation
         self.position = position
-        self.image = image
+        self.image = image or SHIP_IMAGES.get(length, "ship.png")  # Image file in images/
         self.coordinates = self.calculate_coordinates()
         self.selected = False
 
@@ -63,6 +77,15 @@ class Ship:
         self.orientation = 'vertical' if self.orientation == 'horizontal' else 'horizontal'
         self.coordinates = self.calculate_coordinates()
 
+    def sprite(self, cell_size):
+        """
+        Return the ship's image stretched over its cells and turned to its orientation.
+        Each (image, length, orientation, cell size) sprite is built once by the asset manager
+        and reused on every frame.
+        """
+        rotation = 90 if self.orientation == 'vertical' else 0
+        return assets.image(self.image, (cell_size * self.length, cell_size), rotation, alpha=True)
+
 def draw_grid(window, rows, cols, cell_size, offset=(0, 0)):
     """
     Draw the grid lines for the ship placement area.
@@ -81,10 +104,7 @@ def draw_ships(window, ships, cell_size, offset=(0, 0)):
     """
     start_x, start_y = offset
     for ship in ships:
-        rotated_image = pygame.transform.scale(ship.image, (cell_size * ship.length, cell_size))
-        if ship.orientation == 'vertical':
-            rotated_image = pygame.transform.rotate(rotated_image, 90)
-        window.blit(rotated_image, (start_x + ship.position[0] * cell_size, start_y + ship.position[1] * cell_size))
+        window.blit(ship.sprite(cell_size), (start_x + ship.position[0] * cell_size, start_y + ship.position[1] * cell_size))
 
 def create_game_logic(rows, cols):
     """
@@ -94,7 +114,7 @@ def create_game_logic(rows, cols):
 
 def ship_placement_main(player, selected_boats, is_player1=True):
     if not is_player1 and player.name == "AI":  # AI-specific logic
-        ship_lengths = [5, 4, 3, 2, 1][:selected_boats]
+        ship_lengths = FLEET_LENGTHS[:selected_boats]
         print(f"{player.name} is placing ships in the backend...")
         player.board.randomly_place_ships(ship_lengths)
         print(f"{player.name}'s ship placement complete.")
@@ -105,32 +125,27 @@ def ship_placement_main(player, selected_boats, is_player1=True):
     pygame.display.set_caption(f"{player.name}'s Ship Placement")
 
     # Background Image
-    background_image = pygame.image.load("images/bg4.png").convert()
-    background_image = pygame.transform.scale(background_image, (WINDOW_WIDTH, WINDOW_HEIGHT))
+    background_image = assets.image("bg4.png", (WINDOW_WIDTH, WINDOW_HEIGHT))
 
     # Initialize Player's Board
     board = player.board
 
-    # Ship Images
-    ship_image = pygame.image.load("images/ship.png").convert_alpha()
-    ship_image = pygame.transform.scale(ship_image, (CELL_SIZE, CELL_SIZE))
-
     # Placeholder Text for Player
-    font = pygame.font.Font(None, 36)
+    font = get_font(36)
 
     # Buttons
-    button_font = pygame.font.Font(None, 28)
+    button_font = get_font(28)
     confirm_button = pygame.Rect(WINDOW_WIDTH - 300, WINDOW_HEIGHT - 50, 120, 40)
     next_button = pygame.Rect(WINDOW_WIDTH - 300, WINDOW_HEIGHT - 100, 120, 40)
     play_button = pygame.Rect(WINDOW_WIDTH - 150, WINDOW_HEIGHT - 50, 120, 40)
 
     # Initialize Ship Placement
     ships = [
-        Ship(5, "horizontal", (COLS + 1, 0), ship_image),
-        Ship(4, "horizontal", (COLS + 1, 2), ship_image),
-        Ship(3, "horizontal", (COLS + 1, 4), ship_image),
-        Ship(2, "horizontal", (COLS + 1, 6), ship_image),
-        Ship(1, "horizontal", (COLS + 1, 8), ship_image),
+        Ship(5, "horizontal", (COLS + 1, 0)),
+        Ship(4, "horizontal", (COLS + 1, 2)),
+        Ship(3, "horizontal", (COLS + 1, 4)),
+        Ship(2, "horizontal", (COLS + 1, 6)),
+        Ship(1, "horizontal", (COLS + 1, 8)),
     ]
 
     boats_placed = 0
@@ -141,53 +156,26 @@ def ship_placement_main(player, selected_boats, is_player1=True):
     play_button_active = False
 
     # Game Loop
+    loop = FrameLoop("ship_placement")
     running = True
     while running:
-        window.blit(background_image, (0, 0))  # Draw Background
-
-        # Draw Player Placeholder Text
-        player_text = f"{player.name}'s base"
-        text_surface = font.render(player_text, True, BLACK)
-        text_rect = text_surface.get_rect(center=(WINDOW_WIDTH // 2, 20))
-        window.blit(text_surface, text_rect)
-
-        # Draw Grid
-        draw_grid(window, ROWS, COLS, CELL_SIZE, offset=(CELL_SIZE, CELL_SIZE))
-
-        # Draw Ships
-        draw_ships(window, ships, CELL_SIZE)
-
-        # Draw Confirm Button
-        pygame.draw.rect(window, GREEN if boats_placed == selected_boats else LIGHT_GREY, confirm_button)
-        confirm_text = button_font.render("Confirm", True, BLACK)
-        window.blit(confirm_text, (confirm_button.x + 20, confirm_button.y + 10))
-
-        # Draw Next Button
-        pygame.draw.rect(window, GREEN if next_active else LIGHT_GREY, next_button)
-        next_text = button_font.render("Next", True, BLACK if next_active else (150, 150, 150))
-        window.blit(next_text, (next_button.x + 20, next_button.y + 10))
-
-        # Draw Play Button
-        pygame.draw.rect(window, GREEN if play_button_active else LIGHT_GREY, play_button)
-        play_text = button_font.render("Play", True, BLACK if play_button_active else (150, 150, 150))
-        window.blit(play_text, (play_button.x + 35, play_button.y + 10))
-
         # Event Handling
-        for event in pygame.event.get():
+        for event in loop.events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
 
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
+                mouse_x, mouse_y = event.pos
 
                 # Confirm Button Logic
                 if confirm_button.collidepoint(mouse_x, mouse_y) and boats_placed == selected_boats:
-                    for ship in ships:
-                        valid = board.place_ship(ship.length, ship.orientation, ship.position)
-                        if not valid:
-                            print(f"Invalid placement for ship {ship.length}.")
-                            break
+                    with profiler.section("logic"):
+                        for ship in ships:
+                            valid = board.place_ship(ship.length, ship.orientation, ship.position)
+                            if not valid:
+                                print(f"Invalid placement for ship {ship.length}.")
+                                break
                     print(f"{player.name} confirmed their ship placement.")
                     confirm_active = False
                     if is_player1:
@@ -221,7 +209,7 @@ def ship_placement_main(player, selected_boats, is_player1=True):
 
             elif event.type == pygame.MOUSEBUTTONUP:
                 if dragging and selected_ship:
-                    mouse_x, mouse_y = pygame.mouse.get_pos()
+                    mouse_x, mouse_y = event.pos
                     grid_x = min(max(mouse_x // CELL_SIZE, 0), COLS - (1 if selected_ship.orientation == 'horizontal' else selected_ship.length))
                     grid_y = min(max(mouse_y // CELL_SIZE, 0), ROWS - (selected_ship.length if selected_ship.orientation == 'vertical' else 1))
                      # Try placing the ship in its new position
@@ -247,7 +235,7 @@ def ship_placement_main(player, selected_boats, is_player1=True):
                 confirm_active = boats_placed == selected_boats
 
             elif event.type == pygame.MOUSEMOTION and dragging and selected_ship:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
+                mouse_x, mouse_y = event.pos
                 grid_x = min(max(mouse_x // CELL_SIZE, 0), COLS - (1 if selected_ship.orientation == 'horizontal' else selected_ship.length))
                 grid_y = min(max(mouse_y // CELL_SIZE, 0), ROWS - (selected_ship.length if selected_ship.orientation == 'vertical' else 1))
                 selected_ship.move((grid_x, grid_y))
@@ -256,7 +244,39 @@ def ship_placement_main(player, selected_boats, is_player1=True):
                 if event.key == pygame.K_r and selected_ship:
                     selected_ship.rotate()
 
-        pygame.display.flip()
+        # Redraw only when a ship or button changed
+        state = ([(ship.position, ship.orientation) for ship in ships], boats_placed, next_active, play_button_active)
+        if running and loop.redraw_needed(state):
+            window.blit(background_image, (0, 0))  # Draw Background
+
+            # Draw Player Placeholder Text
+            player_text = f"{player.name}'s base"
+            text_surface = render_text(font, player_text, BLACK)
+            text_rect = text_surface.get_rect(center=(WINDOW_WIDTH // 2, 20))
+            window.blit(text_surface, text_rect)
+
+            # Draw Grid
+            draw_grid(window, ROWS, COLS, CELL_SIZE, offset=(CELL_SIZE, CELL_SIZE))
+
+            # Draw Ships
+            draw_ships(window, ships, CELL_SIZE)
+
+            # Draw Confirm Button
+            pygame.draw.rect(window, GREEN if boats_placed == selected_boats else LIGHT_GREY, confirm_button)
+            confirm_text = render_text(button_font, "Confirm", BLACK)
+            window.blit(confirm_text, (confirm_button.x + 20, confirm_button.y + 10))
+
+            # Draw Next Button
+            pygame.draw.rect(window, GREEN if next_active else LIGHT_GREY, next_button)
+            next_text = render_text(button_font, "Next", BLACK if next_active else (150, 150, 150))
+            window.blit(next_text, (next_button.x + 20, next_button.y + 10))
+
+            # Draw Play Button
+            pygame.draw.rect(window, GREEN if play_button_active else LIGHT_GREY, play_button)
+            play_text = render_text(button_font, "Play", BLACK if play_button_active else (150, 150, 150))
+            window.blit(play_text, (play_button.x + 35, play_button.y + 10))
+
+            loop.present(window)
 
 
 
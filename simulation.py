@@ -0,0 +1,274 @@
+"""Headless AI-vs-AI simulation.
+
+Plays complete games through GamePlay with no pygame window and no terminal output, spread across
+a multiprocessing worker pool, and reports games/sec and the shots-to-win distribution (the shots
+the winner fired).
+
+Usage:
+    python simulation.py --games 10000 --p1 player:Hard --p2 ai:Medium --boats 5 --workers 4
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import random
+import time
+
+import ai
+from grid_view import GridView
+from config import GRID_SIZE
+from game_logic import GameBoard, FLEET_LENGTHS
+from naval_warfare_game import GamePlay
+from player import Player, AIPlayer
+from sparse_board import SparseBoard
+
+BOARD_ENGINES = {"grid": GameBoard, "sparse": SparseBoard}
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+STRATEGY_MODULES = ["player", "ai"]
+
+
+def fleet_for(num_boats):
+    """
+    Return the ship lengths used for a game with num_boats boats.
+    """
+    return FLEET_LENGTHS[:num_boats]
+
+
+def parse_strategy(spec):
+    """
+    Parse a strategy spec such as "player:Hard" or "ai:Easy" into (module, difficulty).
+    A bare difficulty uses player.AIPlayer.
+    """
+    module, _, difficulty = spec.rpartition(":")
+    module = module or "player"
+    difficulty = difficulty.capitalize()
+    if module not in STRATEGY_MODULES or difficulty not in DIFFICULTIES:
+        raise ValueError(f"Unknown strategy {spec!r}, expected e.g. player:Easy or ai:Hard")
+    return module, difficulty
+
+
+class LegacyBoardView:
+    """
+    Presents a GameBoard in ai.Board's format: grid[x][y] with 0 water, 1 ship, 2 hit and -1 miss.
+    """
+    CELL_VALUES = {'-': 0, 'S': 1, 'X': 2, 'O': -1}
+
+    def __init__(self, board):
+        self.board = board
+        self.grid = GridView(board.cols, board.rows, self._get_cell, self._set_cell)
+        self.boats = [ai.Boat(ship["length"]) for ship in board.ships]
+        self.untargeted = board.untargeted
+
+    def _get_cell(self, y, x):
+        return self.CELL_VALUES[self.board.grid[y][x]]
+
+    def _set_cell(self, y, x, value):
+        raise TypeError("LegacyBoardView is read-only, moves are applied through GamePlay")
+
+    def is_hit(self, x, y):
+        return self.grid[x][y] == 1
+
+
+class LegacyAIPlayer(Player, ai.AIPlayer):
+    """
+    Player driven by the ai.AIPlayer move methods, so they can play through GamePlay.
+    Only Player.__init__ runs: the strategy state is set up here, without the ai.Board and random
+    fleet that ai.AIPlayer.__init__ would build. The moves read the hits, misses and sunk_ships
+    GamePlay records on this player.
+    """
+    def __init__(self, name, difficulty, num_boats, board=None):
+        super().__init__(name, board)
+        self.difficulty = difficulty
+        self.hunt_target = None  # Medium mode target frontier, built on the first move
+        self.density = None  # Hard mode placement counts, built on the first move
+
+    def make_move(self, opponent_board, deadline=None):
+        """
+        Pick a move with the ai.AIPlayer strategy without letting it mark the board itself.
+        The legacy strategies answer immediately, so deadline is not used.
+        """
+        view = LegacyBoardView(opponent_board)
+        if self.difficulty == "Easy":
+            return self.easy_move(view)
+        elif self.difficulty == "Medium":
+            return self.medium_move(view)
+        return self.hard_move(view)
+
+
+def create_ai_player(name, spec, num_boats, board):
+    """
+    Build an AI player for a strategy spec on the given board.
+    """
+    module, difficulty = parse_strategy(spec)
+    if module == "ai":
+        return LegacyAIPlayer(name, difficulty, num_boats, board)
+    return AIPlayer(name, difficulty, num_boats, board)
+
+
+def play_game(p1_spec, p2_spec, num_boats=5, rows=GRID_SIZE, cols=GRID_SIZE, engine="grid", seed=None,
+              timed=False):
+    """
+    Play one complete headless game between two AI strategies.
+    Returns a dict with the winner (1 or 2), the winner's shots and the total number of turns.
+    timed also returns "move_seconds": each player's list of make_move() durations.
+    """
+    if seed is not None:
+        random.seed(seed)
+    board_class = BOARD_ENGINES[engine]
+    player1 = create_ai_player("Player 1", p1_spec, num_boats, board_class(rows, cols))
+    player2 = create_ai_player("Player 2", p2_spec, num_boats, board_class(rows, cols))
+    for player in (player1, player2):
+        player.board.randomly_place_ships(fleet_for(num_boats))
+
+    game = GamePlay(player1, player2, mode="PvP", verbose=False)
+    invalid_moves = 0
+    max_invalid = 100 * rows * cols  # Guard against a strategy that keeps picking played cells
+    move_seconds = {player1: [], player2: []}
+    while not game.game_over:
+        if timed:
+            start = time.perf_counter()
+            x, y = game.current_player.make_move(game.opponent.board)
+            move_seconds[game.current_player].append(time.perf_counter() - start)
+        else:
+            x, y = game.current_player.make_move(game.opponent.board)
+        result = game.process_turn(x, y)
+        if not result["valid"]:
+            invalid_moves += 1
+            if invalid_moves > max_invalid:
+                raise RuntimeError(f"{game.current_player.name} keeps choosing invalid moves")
+
+    winner = game.player1 if game.winner == game.player1.name else game.player2
+    result = {
+        "winner": 1 if winner is game.player1 else 2,
+        "shots": len(winner.hits) + len(winner.misses),
+        "turns": game.turns,
+        "invalid_moves": invalid_moves,
+    }
+    if timed:
+        result["move_seconds"] = [move_seconds[player1], move_seconds[player2]]
+    return result
+
+
+def _play_chunk(args):
+    """
+    Worker entry point: play a chunk of games and return their results.
+    """
+    p1_spec, p2_spec, num_boats, rows, cols, engine, first_seed, count = args
+    return [
+        play_game(p1_spec, p2_spec, num_boats, rows, cols, engine,
+                  None if first_seed is None else first_seed + i)
+        for i in range(count)
+    ]
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(results, elapsed):
+    """
+    Build the report dict for a list of game results.
+    """
+    shots = sorted(result["shots"] for result in results)
+    histogram = {}
+    for value in shots:
+        histogram[value] = histogram.get(value, 0) + 1
+    games = len(results)
+    return {
+        "games": games,
+        "elapsed_seconds": elapsed,
+        "games_per_second": games / elapsed if elapsed > 0 else float("inf"),
+        "player1_wins": sum(1 for result in results if result["winner"] == 1),
+        "player2_wins": sum(1 for result in results if result["winner"] == 2),
+        "invalid_moves": sum(result["invalid_moves"] for result in results),
+        "shots_to_win": {
+            "mean": sum(shots) / games if games else None,
+            "min": shots[0] if shots else None,
+            "p50": percentile(shots, 0.50),
+            "p90": percentile(shots, 0.90),
+            "p99": percentile(shots, 0.99),
+            "max": shots[-1] if shots else None,
+            "histogram": histogram,
+        },
+    }
+
+
+def run_simulation(games, p1_spec="player:Easy", p2_spec="player:Easy", num_boats=5, rows=GRID_SIZE, cols=GRID_SIZE,
+                   engine="grid", workers=None, chunk_size=None, seed=None):
+    """
+    Play `games` headless games across a worker pool and return the summary report.
+    workers=1 plays everything in this process.
+    """
+    parse_strategy(p1_spec)
+    parse_strategy(p2_spec)
+    workers = workers or multiprocessing.cpu_count()
+    chunk_size = chunk_size or max(1, min(1000, games // (workers * 4) or 1))
+
+    chunks = []
+    for start in range(0, games, chunk_size):
+        count = min(chunk_size, games - start)
+        chunks.append((p1_spec, p2_spec, num_boats, rows, cols, engine,
+                       None if seed is None else seed + start, count))
+
+    results = []
+    start_time = time.perf_counter()
+    if workers == 1:
+        for chunk in chunks:
+            results.extend(_play_chunk(chunk))
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            for chunk_results in pool.imap_unordered(_play_chunk, chunks):
+                results.extend(chunk_results)
+    elapsed = time.perf_counter() - start_time
+    return summarize(results, elapsed)
+
+
+def print_report(report, p1_spec, p2_spec):
+    """
+    Print a human readable simulation report.
+    """
+    shots = report["shots_to_win"]
+    print(f"{p1_spec} vs {p2_spec}: {report['games']} games in {report['elapsed_seconds']:.2f}s "
+          f"({report['games_per_second']:.1f} games/sec)")
+    print(f"Wins: Player 1 {report['player1_wins']}, Player 2 {report['player2_wins']}")
+    if report["games"]:
+        print(f"Shots to win: mean {shots['mean']:.2f}, min {shots['min']}, p50 {shots['p50']}, "
+              f"p90 {shots['p90']}, p99 {shots['p99']}, max {shots['max']}")
+        peak = max(shots["histogram"].values())
+        for value, count in sorted(shots["histogram"].items()):
+            bar = "#" * max(1, round(40 * count / peak))
+            print(f"{value:5d} {count:8d} {bar}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run headless AI-vs-AI Battleship simulations.")
+    parser.add_argument("--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("--p1", default="player:Easy", help="strategy for player 1, e.g. player:Hard or ai:Medium")
+    parser.add_argument("--p2", default="player:Easy", help="strategy for player 2")
+    parser.add_argument("--boats", type=int, default=5, choices=range(1, 6), help="number of boats per fleet")
+    parser.add_argument("--rows", type=int, default=GRID_SIZE)
+    parser.add_argument("--cols", type=int, default=GRID_SIZE)
+    parser.add_argument("--engine", choices=sorted(BOARD_ENGINES), default="grid", help="board implementation")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="games per worker task")
+    parser.add_argument("--seed", type=int, default=None, help="base random seed for reproducible runs")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run_simulation(args.games, args.p1, args.p2, args.boats, args.rows, args.cols,
+                            args.engine, args.workers, args.chunk_size, args.seed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.p1, args.p2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""Save and resume a GamePlay, and an archive of many saved games.
+
+snapshot(game) packs a complete match into a few dozen bytes: mode, turn counters, the player to
+move, both players' names, kinds and fleets, and the cells attacked on each board as a
+bit-packed mask. restore(data) rebuilds an equivalent GamePlay. Everything else (the grids and
+attack grids, the hits, misses and sunk_ships lists, the untargeted pools and ship health)
+follows from the fleets and the shots, so restore() replays the shots through the board's own
+methods instead of storing it. The hits and misses lists come back in row-major order rather
+than in the order the shots were fired.
+
+Format (version 2, big-endian):
+    header   version B, flags B, rows B, cols B, turns I, player1_turns I, player2_turns I
+    player   x2: kind B, name length B, name (UTF-8), ship count B, ships, attacked mask
+    ship     start cell index (1 byte, or 2 on boards over 256 cells), length << 1 | vertical B
+    mask     ceil(rows * cols / 8) little-endian bytes, cell (x, y) at bit y * cols + x
+
+Version 1 snapshots, whose turn counters are H, are still restored.
+
+flags: bit 0 PvAI, bit 1 player 2 to move, bit 2 game over, bits 4-5 the board engine.
+kind: 0 for a Player, 1-3 for an AIPlayer on Easy, Medium or Hard. Kind 4 was the retired Expert
+mode, which restores as Hard.
+
+SnapshotArchive appends snapshots to a data file and fixed-size (game id, offset, length)
+entries to a sidecar index. Both are memory-mapped for reading, so any snapshot is found and
+decoded without reading the rest of the archive.
+"""
+
+import mmap
+import os
+import struct
+
+from game_logic import GameBoard
+from naval_warfare_game import GamePlay
+from player import Player, AIPlayer
+from sparse_board import SparseBoard
+
+VERSION = 2
+# Board classes by engine code. Code 1 was the retired BitBoard engine; its games restore onto GameBoard
+ENGINES = [GameBoard, GameBoard, SparseBoard]
+DIFFICULTIES = ["Easy", "Medium", "Hard", "Hard"]  # By kind - 1; kind 4 was Expert
+
+HEADER = struct.Struct("!BBBBIII")
+HEADERS = {1: struct.Struct("!BBBBHHH"), VERSION: HEADER}  # Header of every version restore() reads
+PLAYER = struct.Struct("!BB")  # Kind, name length
+NARROW_SHIP = struct.Struct("!BB")
+WIDE_SHIP = struct.Struct("!HB")
+INDEX_ENTRY = struct.Struct("!IQI")  # Game id, offset in the data file, length
+
+PVAI = 0x01
+PLAYER2_TO_MOVE = 0x02
+GAME_OVER = 0x04
+
+
+def _attacked_mask(board):
+    mask = 0
+    for x, y in board.attacked_positions:
+        mask |= 1 << (y * board.cols + x)
+    return mask
+
+
+def _ship_struct(rows, cols):
+    if rows * cols <= 0x100:
+        return NARROW_SHIP
+    if rows * cols <= 0x10000:
+        return WIDE_SHIP
+    raise ValueError(f"Boards over 65536 cells can't be saved ({rows}x{cols})")
+
+
+def snapshot(game):
+    """
+    Return the bytes of a snapshot of `game`.
+    """
+    board = game.player1.board
+    rows, cols = board.rows, board.cols
+    if type(board) not in ENGINES or type(game.player2.board) is not type(board):
+        raise ValueError(f"Can't save a game played on {type(board).__name__} and {type(game.player2.board).__name__}")
+    ship = _ship_struct(rows, cols)
+    flags = ENGINES.index(type(board)) << 4
+    if game.mode == "PvAI":
+        flags |= PVAI
+    if game.current_player is game.player2:
+        flags |= PLAYER2_TO_MOVE
+    if game.game_over:
+        flags |= GAME_OVER
+
+    parts = [HEADER.pack(VERSION, flags, rows, cols, game.turns, game.player1_turns, game.player2_turns)]
+    mask_length = (rows * cols + 7) // 8
+    for player in (game.player1, game.player2):
+        kind = DIFFICULTIES.index(player.difficulty) + 1 if isinstance(player, AIPlayer) else 0
+        name = player.name.encode()
+        parts.append(PLAYER.pack(kind, len(name)))
+        parts.append(name)
+        parts.append(bytes([len(player.board.ships)]))
+        for placed in player.board.ships:
+            x, y = placed["coordinates"][0]
+            parts.append(ship.pack(y * cols + x, placed["length"] << 1 | (placed["orientation"] == "vertical")))
+        parts.append(_attacked_mask(player.board).to_bytes(mask_length, "little"))
+    return b"".join(parts)
+
+
+def restore(data, verbose=False):
+    """
+    Rebuild the GamePlay saved in `data` (bytes, or a memoryview such as a slice of an archive).
+    Raises ValueError for a snapshot of another version or one that doesn't describe a game.
+    """
+    with memoryview(data) as view:
+        version = view[0] if len(view) else None
+        header = HEADERS.get(version)
+        if header is None:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        _, flags, rows, cols, turns, player1_turns, player2_turns = header.unpack_from(view)
+        engine = ENGINES[flags >> 4 & 0x03]
+        ship = _ship_struct(rows, cols)
+        mask_length = (rows * cols + 7) // 8
+        offset = header.size
+
+        players = []
+        attacked = []  # Cells attacked on each player's board
+        for _ in range(2):
+            kind, name_length = PLAYER.unpack_from(view, offset)
+            offset += PLAYER.size
+            name = bytes(view[offset:offset + name_length]).decode()
+            offset += name_length
+            count = view[offset]
+            offset += 1
+            board = engine(rows, cols)
+            for _ in range(count):
+                cell, packed = ship.unpack_from(view, offset)
+                offset += ship.size
+                orientation = "vertical" if packed & 1 else "horizontal"
+                if not board.place_ship(packed >> 1, orientation, (cell % cols, cell // cols)):
+                    raise ValueError(f"Invalid ship in snapshot at cell {cell}")
+            attacked.append(int.from_bytes(view[offset:offset + mask_length], "little"))
+            offset += mask_length
+            if kind:
+                players.append(AIPlayer(name, DIFFICULTIES[kind - 1], count, board))
+            else:
+                players.append(Player(name, board))
+
+    player1, player2 = players
+    # Replay every shot: each player fired at the cells attacked on the other's board
+    for attacker, defender, mask in ((player1, player2, attacked[1]), (player2, player1, attacked[0])):
+        while mask:
+            low = mask & -mask
+            index = low.bit_length() - 1
+            mask ^= low
+            x, y = index % cols, index // cols
+            defender.board.mark_attacked(x, y)
+            hit, _, _ = defender.board.receive_attack(x, y)
+            attacker.board.update_attack_grid(x, y, hit)
+            (attacker.hits if hit else attacker.misses).append((x, y))
+        attacker.sunk_ships = [placed["coordinates"] for ship_id, placed in enumerate(defender.board.ships, 1)
+                               if defender.board.is_sunk(ship_id)]
+
+    game = GamePlay(player1, player2, mode="PvAI" if flags & PVAI else "PvP", verbose=verbose)
+    game.turns = turns
+    game.player1_turns = player1_turns
+    game.player2_turns = player2_turns
+    if flags & PLAYER2_TO_MOVE:
+        game.current_player, game.opponent = player2, player1
+    if flags & GAME_OVER:
+        game.game_over = True
+        game.winner = game.current_player.name  # The winner's turn is never switched away
+    return game
+
+
+class SnapshotArchive:
+    """
+    Append-only archive of snapshots: a data file at `path` and its index at `path` + ".idx".
+    Appends are buffered; reads flush them and map both files.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.data = open(path, "ab")
+        self.index = open(self.index_path, "ab")
+        # Drop an index entry torn by a crash mid-append; its data is simply never referenced
+        entries, torn = divmod(os.path.getsize(self.index_path), INDEX_ENTRY.size)
+        if torn:
+            self.index.truncate(entries * INDEX_ENTRY.size)
+        self.count = entries
+        self.data_size = os.path.getsize(path)  # Offset of the next snapshot
+        self.data_map = None
+        self.index_map = None
+        self.latest_records = None  # Game id -> number of its latest snapshot, built on first use
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def append(self, game_id, game):
+        """
+        Save a snapshot of `game` under `game_id` and return its record number.
+        """
+        return self.append_record(game_id, snapshot(game))
+
+    def append_record(self, game_id, record):
+        """
+        Save snapshot bytes made by snapshot() under `game_id` and return their record number.
+        """
+        self.data.write(record)
+        self.index.write(INDEX_ENTRY.pack(game_id, self.data_size, len(record)))
+        self.data_size += len(record)
+        number = self.count
+        self.count += 1
+        if self.latest_records is not None:
+            self.latest_records[game_id] = number
+        return number
+
+    def flush(self):
+        self.data.flush()
+        self.index.flush()
+
+    def _map(self):
+        """
+        Flush pending appends and (re)map the files if they grew since they were last mapped.
+        """
+        self.flush()
+        for name, file in (("data_map", self.data), ("index_map", self.index)):
+            current = getattr(self, name)
+            size = os.fstat(file.fileno()).st_size
+            if size and (current is None or len(current) < size):
+                if current is not None:
+                    current.close()
+                with open(file.name, "rb") as source:
+                    setattr(self, name, mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def entry(self, number):
+        """
+        Return (game id, offset, length) of record `number`.
+        """
+        if not 0 <= number < self.count:
+            raise IndexError(f"Snapshot {number} out of range")
+        if self.index_map is None or len(self.index_map) < (number + 1) * INDEX_ENTRY.size:
+            self._map()
+        return INDEX_ENTRY.unpack_from(self.index_map, number * INDEX_ENTRY.size)
+
+    def read(self, number):
+        """
+        Return (game id, snapshot bytes) of record `number`.
+        """
+        game_id, offset, length = self.entry(number)
+        if len(self.data_map) < offset + length:
+            self._map()
+        return game_id, self.data_map[offset:offset + length]
+
+    def load(self, number, verbose=False):
+        """
+        Return (game id, restored GamePlay) of record `number`, decoded straight from the map.
+        """
+        game_id, offset, length = self.entry(number)
+        if len(self.data_map) < offset + length:
+            self._map()
+        with memoryview(self.data_map) as view:
+            return game_id, restore(view[offset:offset + length], verbose)
+
+    def latest(self, game_id, verbose=False):
+        """
+        Return the GamePlay of the latest snapshot saved under `game_id`, or None.
+        """
+        if self.latest_records is None:
+            self.latest_records = {}
+            for number in range(self.count):
+                self.latest_records[self.entry(number)[0]] = number
+        number = self.latest_records.get(game_id)
+        return None if number is None else self.load(number, verbose)[1]
+
+    def close(self):
+        for current in (self.data_map, self.index_map):
+            if current is not None:
+                current.close()
+        self.data_map = self.index_map = None
+        self.data.close()
+        self.index.close()
@@ -0,0 +1,359 @@
+"""Sparse board for very large custom grids.
+
+Ship cells live in a hash map and shots are stored as run-length intervals of cell indices, so
+memory and per-move cost grow with the number of ships and shots, not with rows x cols.
+Cell (x, y) has index y * cols + x.
+"""
+
+import random
+from bisect import bisect_right
+
+from grid_view import GridView
+
+RANDOM_DRAWS = 64  # Random draws before falling back to an exact pick
+
+
+class IntervalSet:
+    """
+    A set of non-negative integers stored as sorted, disjoint [start, end) runs.
+    """
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, value):
+        index = bisect_right(self.starts, value) - 1
+        return index >= 0 and value < self.ends[index]
+
+    def __iter__(self):
+        for start, end in zip(self.starts, self.ends):
+            yield from range(start, end)
+
+    def add(self, value):
+        """
+        Add value, merging it into neighbouring runs. Returns False if it was already present.
+        """
+        index = bisect_right(self.starts, value) - 1
+        if index >= 0 and value < self.ends[index]:
+            return False
+        joins_left = index >= 0 and self.ends[index] == value
+        joins_right = index + 1 < len(self.starts) and self.starts[index + 1] == value + 1
+        if joins_left and joins_right:
+            self.ends[index] = self.ends[index + 1]
+            del self.starts[index + 1]
+            del self.ends[index + 1]
+        elif joins_left:
+            self.ends[index] = value + 1
+        elif joins_right:
+            self.starts[index + 1] = value
+        else:
+            self.starts.insert(index + 1, value)
+            self.ends.insert(index + 1, value + 1)
+        self.count += 1
+        return True
+
+    def discard(self, value):
+        """
+        Remove value if present, splitting its run when needed.
+        """
+        index = bisect_right(self.starts, value) - 1
+        if index < 0 or value >= self.ends[index]:
+            return
+        start, end = self.starts[index], self.ends[index]
+        if start == value and end == value + 1:
+            del self.starts[index]
+            del self.ends[index]
+        elif start == value:
+            self.starts[index] = value + 1
+        elif end == value + 1:
+            self.ends[index] = value
+        else:
+            self.ends[index] = value
+            self.starts.insert(index + 1, value + 1)
+            self.ends.insert(index + 1, end)
+        self.count -= 1
+
+    def nth_missing(self, n):
+        """
+        Return the n-th (0-based) non-negative integer that is not in the set.
+        """
+        for start, end in zip(self.starts, self.ends):
+            if n < start:
+                return n
+            n += end - start
+        return n
+
+
+class UntargetedCells:
+    """
+    CellPool-style view of the cells a SparseBoard has not been attacked on. Nothing is stored:
+    it reads and updates the board's attacked intervals, so it stays small on huge grids.
+    """
+    def __init__(self, board):
+        self.board = board
+
+    def __len__(self):
+        return self.board.rows * self.board.cols - len(self.board.attacked)
+
+    def remove(self, x, y):
+        """
+        Take (x, y) out of the pool, i.e. mark it attacked.
+        """
+        self.board.mark_attacked(x, y)
+
+    def random_cell(self):
+        """
+        Return a random (x, y) still in the pool, or (None, None) if it is empty.
+        """
+        return self.board.random_untargeted()
+
+
+class SparseBoard:
+    """
+    GameBoard-compatible board whose storage does not depend on the grid area.
+    grid and attack_grid are lazy views, so reading a cell is cheap but walking a whole row of a
+    huge grid (display_grid, get_ship_placements) still costs one lookup per cell.
+    """
+    def __init__(self, rows=10, cols=10):
+        self.rows = rows
+        self.cols = cols
+        self.ships = []
+        self.ship_at = {}  # Cell index -> id of the ship on that cell
+        self.ship_health = {}  # Ship id -> cells not hit yet
+        self.ship_cells_left = 0  # Unhit ship cells on the whole board
+        self.hits = set()  # Ship cells that have been hit ('X')
+        self.misses = IntervalSet()  # Water cells that have been hit ('O')
+        self.attacked = IntervalSet()  # Cells attacked on this board
+        self.untargeted = UntargetedCells(self)  # Same interface as GameBoard.untargeted
+        self.attack_hits = set()  # This player's hits on the opponent (attack_grid 'X')
+        self.attack_misses = IntervalSet()  # This player's misses on the opponent (attack_grid 'O')
+        self.grid = GridView(rows, cols, self._get_grid_cell, self._set_grid_cell)
+        self.attack_grid = GridView(rows, cols, self._get_attack_cell, self._set_attack_cell)
+
+    def _placement_cells(self, ship_length, orientation, start_position):
+        """
+        Return the cell indices of a placement, or None if it does not fit on the board.
+        """
+        x, y = start_position
+        if x < 0 or y < 0:
+            return None
+        if orientation == 'horizontal':
+            if x + ship_length > self.cols or y >= self.rows:
+                return None
+            start = y * self.cols + x
+            return range(start, start + ship_length)
+        elif orientation == 'vertical':
+            if y + ship_length > self.rows or x >= self.cols:
+                return None
+            start = y * self.cols + x
+            return range(start, start + ship_length * self.cols, self.cols)
+        return None
+
+    def is_valid_placement(self, ship_length, orientation, start_position):
+        """
+        Check if a ship placement is valid.
+        """
+        cells = self._placement_cells(ship_length, orientation, start_position)
+        return cells is not None and not any(cell in self.ship_at or cell in self.misses for cell in cells)
+
+    def is_attacked(self, x, y):
+        """
+        Checks if a position has already been attacked on this board.
+        """
+        return y * self.cols + x in self.attacked
+
+    def mark_attacked(self, x, y):
+        """
+        Marks a position as attacked on this board.
+        """
+        self.attacked.add(y * self.cols + x)
+
+    @property
+    def attacked_positions(self):
+        """
+        Set of attacked (x, y) positions, matching GameBoard.attacked_positions.
+        """
+        return {(cell % self.cols, cell // self.cols) for cell in self.attacked}
+
+    def random_untargeted(self):
+        """
+        Return a random position on this board that has not been attacked, or (None, None).
+        Draws at random while the board is mostly unplayed, then picks exactly from the gaps
+        between attacked runs.
+        """
+        area = self.rows * self.cols
+        free = area - len(self.attacked)
+        if free <= 0:
+            return None, None
+        if 2 * free > area:
+            for _ in range(RANDOM_DRAWS):
+                cell = random.randrange(area)
+                if cell not in self.attacked:
+                    return cell % self.cols, cell // self.cols
+        cell = self.attacked.nth_missing(random.randrange(free))
+        return cell % self.cols, cell // self.cols
+
+    def place_ship(self, ship_length, orientation, start_position):
+        """
+        Place a ship on the grid if valid.
+        """
+        if not self.is_valid_placement(ship_length, orientation, start_position):
+            return False
+
+        cells = self._placement_cells(ship_length, orientation, start_position)
+        ship_id = len(self.ships) + 1
+        self.ships.append({
+            "id": ship_id,
+            "length": ship_length,
+            "orientation": orientation,
+            "coordinates": [(cell % self.cols, cell // self.cols) for cell in cells]
+        })
+        for cell in cells:
+            self.ship_at[cell] = ship_id
+        self.ship_health[ship_id] = ship_length
+        self.ship_cells_left += ship_length
+        return True
+
+    def randomly_place_ships(self, ship_lengths, max_attempts=10000):
+        """
+        Randomly place multiple ships on the grid.
+        Each ship is drawn uniformly from the in-bounds placements and redrawn on overlap, which
+        is quick on a sparsely filled ocean. Raises ValueError if a ship cannot be fitted within
+        max_attempts draws.
+        """
+        for ship_length in ship_lengths:
+            horizontal = self.rows * max(0, self.cols - ship_length + 1)
+            vertical = max(0, self.rows - ship_length + 1) * self.cols if ship_length > 1 else 0
+            if horizontal + vertical == 0:
+                raise ValueError(f"A ship of length {ship_length} does not fit on a {self.rows}x{self.cols} board")
+            for _ in range(max_attempts):
+                pick = random.randrange(horizontal + vertical)
+                if pick < horizontal:
+                    span = self.cols - ship_length + 1
+                    placed = self.place_ship(ship_length, 'horizontal', (pick % span, pick // span))
+                else:
+                    pick -= horizontal
+                    placed = self.place_ship(ship_length, 'vertical', (pick % self.cols, pick // self.cols))
+                if placed:
+                    break
+            else:
+                raise ValueError(f"Could not place a ship of length {ship_length} within {max_attempts} attempts")
+
+    def is_ship(self, x, y):
+        """
+        Check if an unhit ship cell is at (x, y).
+        """
+        cell = y * self.cols + x
+        return cell in self.ship_at and cell not in self.hits
+
+    def receive_attack(self, x, y):
+        """
+        Resolve an attack on this board's grid.
+        Returns (hit, ship_id, sunk); ship_id is None on a miss.
+        """
+        cell = y * self.cols + x
+        ship_id = self.ship_at.get(cell)
+        if ship_id is not None:
+            if cell in self.hits:
+                return False, None, False
+            self.hits.add(cell)
+            self.ship_health[ship_id] -= 1
+            self.ship_cells_left -= 1
+            return True, ship_id, self.ship_health[ship_id] == 0
+        self.misses.add(cell)
+        return False, None, False
+
+    def is_sunk(self, ship_id):
+        """
+        Check if every cell of a ship has been hit.
+        """
+        return self.ship_health[ship_id] == 0
+
+    def has_remaining_ships(self):
+        """
+        Check if any ship cell on this board has not been hit yet.
+        """
+        return self.ship_cells_left > 0
+
+    def _get_grid_cell(self, x, y):
+        cell = y * self.cols + x
+        if cell in self.ship_at:
+            return 'X' if cell in self.hits else 'S'
+        return 'O' if cell in self.misses else '-'
+
+    def _set_grid_cell(self, x, y, value):
+        cell = y * self.cols + x
+        if value == 'X' and cell in self.ship_at:
+            self.receive_attack(x, y)  # Keeps ship_health and ship_cells_left in step
+        elif value == 'S' and cell in self.ship_at:
+            if cell in self.hits:  # Undo a hit
+                self.hits.discard(cell)
+                self.ship_health[self.ship_at[cell]] += 1
+                self.ship_cells_left += 1
+        elif value == 'O' and cell not in self.ship_at:
+            self.misses.add(cell)
+        elif value == '-' and cell not in self.ship_at:
+            self.misses.discard(cell)
+        else:
+            raise ValueError(f"SparseBoard grid cannot store {value!r} at {(x, y)}, use place_ship/receive_attack")
+
+    def _get_attack_cell(self, x, y):
+        cell = y * self.cols + x
+        if cell in self.attack_hits:
+            return 'X'
+        return 'O' if cell in self.attack_misses else '-'
+
+    def _set_attack_cell(self, x, y, value):
+        if value in ('X', 'O'):
+            self.update_attack_grid(x, y, value == 'X')
+        elif value == '-':
+            cell = y * self.cols + x
+            self.attack_hits.discard(cell)
+            self.attack_misses.discard(cell)
+        else:
+            raise ValueError(f"SparseBoard attack grid cannot store {value!r}")
+
+    def display_grid(self):
+        """
+        Print the current state of the grid for debugging.
+        """
+        for row in self.grid:
+            print(" ".join(str(cell) for cell in row))
+        print()
+
+    def get_ship_placements(self):
+        """
+        Return the current grid with ship placements for display or game logic.
+        """
+        return [[cell for cell in row] for row in self.grid]
+
+    def random_attack(self, opponent_board):
+        """
+        Randomly select an unplayed cell on the opponent's board for an attack.
+        Returns (None, None) if there are no available moves.
+        """
+        return opponent_board.random_untargeted()
+
+    def display_ship_placements(self):
+        """
+        Print the current grid with ship placements for debugging or display.
+        """
+        print("Current Ship Placements:")
+        for row in self.grid:
+            print(" ".join(str(cell) for cell in row))
+
+    def update_attack_grid(self, x, y, result):
+        """
+        Updates the attack grid based on the attack result.
+        """
+        cell = y * self.cols + x
+        if result:  # Hit
+            self.attack_hits.add(cell)
+            self.attack_misses.discard(cell)
+        else:  # Miss
+            self.attack_misses.add(cell)
+            self.attack_hits.discard(cell)
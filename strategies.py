@@ -0,0 +1,310 @@
+"""Targeting strategies shared by player.AIPlayer and ai.AIPlayer.
+
+A strategy only knows the board size, the opponent's fleet lengths and the results of its own
+shots. Coordinates are (x, y) with 0 <= x < cols and 0 <= y < rows.
+"""
+
+import abc
+import heapq
+import random
+from collections import Counter
+
+# Cell states as seen by the attacker
+UNKNOWN, HIT, MISS, SUNK = 0, 1, 2, 3
+HORIZONTAL, VERTICAL = 0, 1
+
+
+class Strategy(abc.ABC):
+    """
+    Base class for strategies that learn from the hits, misses and sunk ships their player records.
+    Subclasses implement record_shot, record_sunk and choose_move.
+    """
+    def __init__(self):
+        self._observed_hits = 0
+        self._observed_misses = 0
+        self._observed_sunk = 0
+
+    @abc.abstractmethod
+    def record_shot(self, x, y, hit):
+        """
+        Take in the result of a shot at (x, y).
+        """
+
+    @abc.abstractmethod
+    def record_sunk(self, coordinates):
+        """
+        Take in the cells of a ship that was just sunk.
+        """
+
+    @abc.abstractmethod
+    def choose_move(self):
+        """
+        Return the (x, y) to shoot next, or (None, None) if the strategy has no move.
+        """
+
+    def observe(self, hits, misses, sunk_ships=()):
+        """
+        Feed the hits, misses and sunk ships (lists of coordinates) appended to the given lists
+        since the last call.
+        """
+        for x, y in hits[self._observed_hits:]:
+            self.record_shot(x, y, True)
+        for x, y in misses[self._observed_misses:]:
+            self.record_shot(x, y, False)
+        for coordinates in sunk_ships[self._observed_sunk:]:
+            self.record_sunk(coordinates)
+        self._observed_hits = len(hits)
+        self._observed_misses = len(misses)
+        self._observed_sunk = len(sunk_ships)
+
+
+class HuntTargetStrategy(Strategy):
+    """
+    Medium mode: hunt at random until something is hit, then shoot the cells next to hits that
+    are not part of a sunk ship, continuing along the line once two hits of a ship line up.
+
+    The target frontier is a stack updated on every event: a hit pushes its neighbours and the
+    cells that extend its line, a miss just marks the cell, and a sunk ship lowers the number of
+    live hits next to each surrounding cell. Stale entries are dropped when they reach the top,
+    so each move costs O(1) amortised. State is kept in dicts, so memory follows the number of
+    shots rather than the board area and the strategy works on SparseBoard-sized grids.
+    """
+    def __init__(self, rows, cols):
+        super().__init__()
+        self.rows = rows
+        self.cols = cols
+        self.status = {}  # Cell -> HIT, MISS or SUNK; missing cells are UNKNOWN
+        self.live_neighbours = {}  # Cell -> unsunk hits next to it
+        self.line_targets = []  # Cells that extend a line of hits, tried first
+        self.frontier = []  # Cells next to unsunk hits
+
+    def _neighbours(self, x, y):
+        for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            if 0 <= x + dx < self.cols and 0 <= y + dy < self.rows:
+                yield x + dx, y + dy
+
+    def _is_live_hit(self, x, y):
+        return 0 <= x < self.cols and 0 <= y < self.rows and self.status.get(y * self.cols + x) == HIT
+
+    def record_shot(self, x, y, hit):
+        """
+        Update the frontier after a shot at (x, y).
+        """
+        cell = y * self.cols + x
+        if cell in self.status:
+            return
+        self.status[cell] = HIT if hit else MISS
+        if not hit:
+            return
+        for nx, ny in self._neighbours(x, y):
+            neighbour = ny * self.cols + nx
+            self.live_neighbours[neighbour] = self.live_neighbours.get(neighbour, 0) + 1
+            if neighbour not in self.status:
+                self.frontier.append(neighbour)
+        for dx, dy in ((1, 0), (0, 1)):
+            if not (self._is_live_hit(x - dx, y - dy) or self._is_live_hit(x + dx, y + dy)):
+                continue
+            # Part of a line of hits: queue the cells just past both ends of the run
+            for direction in (-1, 1):
+                end_x, end_y = x, y
+                while self._is_live_hit(end_x + direction * dx, end_y + direction * dy):
+                    end_x, end_y = end_x + direction * dx, end_y + direction * dy
+                next_x, next_y = end_x + direction * dx, end_y + direction * dy
+                if 0 <= next_x < self.cols and 0 <= next_y < self.rows:
+                    self.line_targets.append(next_y * self.cols + next_x)
+
+    def record_sunk(self, coordinates):
+        """
+        Retire the hits of a sunk ship so the cells around it stop being targets.
+        """
+        for x, y in coordinates:
+            cell = y * self.cols + x
+            if self.status.get(cell) == HIT:
+                for nx, ny in self._neighbours(x, y):
+                    self.live_neighbours[ny * self.cols + nx] -= 1
+            self.status[cell] = SUNK
+
+    def choose_move(self):
+        """
+        Return the next target next to a live hit, or (None, None) when it is time to hunt.
+        """
+        for stack in (self.line_targets, self.frontier):
+            while stack:
+                cell = stack[-1]
+                if cell not in self.status and self.live_neighbours.get(cell, 0) > 0:
+                    return cell % self.cols, cell // self.cols
+                stack.pop()
+        return None, None
+
+
+class ProbabilityDensityStrategy(Strategy):
+    """
+    Hard mode: for every cell, count the placements of each remaining ship that agree with the
+    hits and misses seen so far, and shoot the unplayed cell covered by the most placements.
+    Placements that cover hits are weighted up so the AI finishes the ships it has found.
+
+    Counts are kept up to date incrementally: a shot only revisits the placements that cover the
+    shot cell, and the best cell comes off a heap with lazily discarded stale entries. The counts
+    are dense per-cell arrays, so this suits boards up to a few hundred cells a side.
+
+    With a prior (heatmap_cache.prior: the chance of a ship on each cell for fleets placed by the
+    rules), each cell's count is scaled by the prior over its count on the empty board. The counts
+    treat ships as independent; the scale carries over how the real placement order and ships
+    blocking each other shift the odds.
+    """
+    TARGET_WEIGHT = 25  # Extra weight per hit a placement already covers
+
+    def __init__(self, rows, cols, ship_lengths, prior=None):
+        super().__init__()
+        self.rows = rows
+        self.cols = cols
+        self.remaining = Counter(ship_lengths)  # length -> ships of that length still afloat
+        cells = rows * cols
+        self.status = bytearray(cells)
+        self.density = [0] * cells
+        self.unknown = cells
+        self.valid = {}  # (length, orientation) -> 1 per start cell whose placement is still possible
+        self.hit_counts = {}  # (length, orientation) -> hits covered by the placement at each start cell
+        self.heap = []
+
+        for length, count in self.remaining.items():
+            for orientation in self._orientations(length):
+                valid = bytearray(cells)
+                for start in self._starts(length, orientation):
+                    valid[start] = 1
+                    for cell in self._cells(length, orientation, start):
+                        self.density[cell] += count
+                self.valid[length, orientation] = valid
+                self.hit_counts[length, orientation] = bytearray(cells)
+        self.scale = None  # Per-cell prior over empty-board count, or None to rank by the counts alone
+        if prior is not None:
+            self.scale = [chance / count if count else 0.0 for chance, count in zip(prior, self.density)]
+        self._rebuild_heap()
+
+    def _orientations(self, length):
+        # A one-cell ship has a single placement per cell
+        return (HORIZONTAL,) if length == 1 else (HORIZONTAL, VERTICAL)
+
+    def _starts(self, length, orientation):
+        """
+        Yield the start cell of every in-bounds placement.
+        """
+        if orientation == HORIZONTAL:
+            for y in range(self.rows):
+                for x in range(self.cols - length + 1):
+                    yield y * self.cols + x
+        else:
+            for y in range(self.rows - length + 1):
+                for x in range(self.cols):
+                    yield y * self.cols + x
+
+    def _cells(self, length, orientation, start):
+        step = 1 if orientation == HORIZONTAL else self.cols
+        return range(start, start + step * length, step)
+
+    def _placements_through(self, length, x, y):
+        """
+        Yield (orientation, start) for every in-bounds placement of `length` covering (x, y).
+        """
+        for start_x in range(max(0, x - length + 1), min(x, self.cols - length) + 1):
+            yield HORIZONTAL, y * self.cols + start_x
+        if length > 1:
+            for start_y in range(max(0, y - length + 1), min(y, self.rows - length) + 1):
+                yield VERTICAL, start_y * self.cols + x
+
+    def _unit_weight(self, length, orientation, start):
+        return 1 + self.TARGET_WEIGHT * self.hit_counts[length, orientation][start]
+
+    def _spread(self, length, orientation, start, delta, changed):
+        for cell in self._cells(length, orientation, start):
+            self.density[cell] += delta
+            changed.add(cell)
+
+    def _score(self, cell):
+        if self.scale is None:
+            return self.density[cell]
+        return self.density[cell] * self.scale[cell]
+
+    def _rebuild_heap(self):
+        self.heap = [(-self._score(cell), random.random(), cell)
+                     for cell in range(self.rows * self.cols) if self.status[cell] == UNKNOWN]
+        heapq.heapify(self.heap)
+
+    def _push(self, changed):
+        if len(self.heap) > 4 * self.unknown + 64:  # Too many stale entries, start over
+            self._rebuild_heap()
+            return
+        for cell in changed:
+            if self.status[cell] == UNKNOWN:
+                heapq.heappush(self.heap, (-self._score(cell), random.random(), cell))
+
+    def _block(self, cell, changed):
+        """
+        Rule out every remaining placement that covers `cell`.
+        """
+        x, y = cell % self.cols, cell // self.cols
+        for length, count in self.remaining.items():
+            if not count:
+                continue
+            for orientation, start in self._placements_through(length, x, y):
+                valid = self.valid[length, orientation]
+                if valid[start]:
+                    valid[start] = 0
+                    weight = count * self._unit_weight(length, orientation, start)
+                    self._spread(length, orientation, start, -weight, changed)
+
+    def record_shot(self, x, y, hit):
+        """
+        Update the placement counts after a shot at (x, y).
+        """
+        cell = y * self.cols + x
+        if self.status[cell] != UNKNOWN:
+            return
+        self.status[cell] = HIT if hit else MISS
+        self.unknown -= 1
+        changed = set()
+        if not hit:
+            self._block(cell, changed)
+        else:
+            for length, count in self.remaining.items():
+                if not count:
+                    continue
+                for orientation, start in self._placements_through(length, x, y):
+                    if self.valid[length, orientation][start]:
+                        self.hit_counts[length, orientation][start] += 1
+                        self._spread(length, orientation, start, count * self.TARGET_WEIGHT, changed)
+        self._push(changed)
+
+    def record_sunk(self, coordinates):
+        """
+        Remove a sunk ship, given its cells, from the fleet and from the counts.
+        """
+        changed = set()
+        length = len(coordinates)
+        if self.remaining[length] > 0:
+            self.remaining[length] -= 1
+            for orientation in self._orientations(length):
+                valid = self.valid[length, orientation]
+                for start in self._starts(length, orientation):
+                    if valid[start]:
+                        self._spread(length, orientation, start,
+                                     -self._unit_weight(length, orientation, start), changed)
+        for x, y in coordinates:
+            cell = y * self.cols + x
+            if self.status[cell] == UNKNOWN:
+                self.unknown -= 1
+            self.status[cell] = SUNK
+            self._block(cell, changed)
+        self._push(changed)
+
+    def choose_move(self):
+        """
+        Return the unplayed cell with the highest (scaled) placement count, or (None, None) if none
+        are left.
+        """
+        while self.heap:
+            score, _, cell = self.heap[0]
+            if self.status[cell] == UNKNOWN and -score == self._score(cell):
+                return cell % self.cols, cell // self.cols
+            heapq.heappop(self.heap)
+        return None, None
@@ -0,0 +1,335 @@
+"""Round-robin AI tournament.
+
+Every pair of strategies plays the same number of games on every combination of grid size and
+fleet size (1-5 boats, as offered by select_number_of_boats), spread across a multiprocessing
+worker pool. Games are mirrored: each seed is played once with each strategy moving first, so
+both sides see the same fleets and neither gains from the first move.
+
+Each game is streamed to --results as soon as its chunk finishes (CSV, or JSON Lines for a
+.jsonl/.json path), and the final report gives, per strategy: win rate, mean and percentile
+shots-to-win (the shots the winner fired), and per-move latency of make_move(). It also checks
+that each difficulty beats the one below it head to head and that the p99 move latency fits the
+GUI's AI_MOVE_BUDGET_MS.
+
+Usage:
+    python tournament.py --games 200 --sizes 10 12 --boats 1 2 3 4 5 --results games.csv
+    python tournament.py --strategies player:Easy player:Medium player:Hard --report report.json
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import random
+import time
+
+from config import AI_MOVE_BUDGET_MS, GRID_SIZE
+from simulation import BOARD_ENGINES, DIFFICULTIES, STRATEGY_MODULES, fleet_for, parse_strategy, percentile, play_game
+
+DEFAULT_STRATEGIES = [f"{module}:{difficulty}" for module in STRATEGY_MODULES for difficulty in DIFFICULTIES]
+FLEET_SIZES = [1, 2, 3, 4, 5]
+RESULT_FIELDS = ["size", "boats", "player1", "player2", "seed", "winner", "loser", "shots", "turns",
+                 "invalid_moves", "player1_move_ms", "player2_move_ms"]
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else None
+
+
+def _play_chunk(args):
+    """
+    Worker entry point: play a chunk of games between two strategies and return one result row per
+    game, plus each strategy's move latencies in seconds.
+    """
+    p1_spec, p2_spec, size, boats, engine, seeds = args
+    rows = []
+    latencies = {p1_spec: [], p2_spec: []}
+    for seed in seeds:
+        result = play_game(p1_spec, p2_spec, boats, size, size, engine, seed, timed=True)
+        first, second = result.pop("move_seconds")
+        latencies[p1_spec].extend(first)
+        latencies[p2_spec].extend(second)
+        winner, loser = (p1_spec, p2_spec) if result["winner"] == 1 else (p2_spec, p1_spec)
+        rows.append({
+            "size": size,
+            "boats": boats,
+            "player1": p1_spec,
+            "player2": p2_spec,
+            "seed": seed,
+            "winner": winner,
+            "loser": loser,
+            "shots": result["shots"],
+            "turns": result["turns"],
+            "invalid_moves": result["invalid_moves"],
+            "player1_move_ms": round(_mean(first) * 1000, 4) if first else None,
+            "player2_move_ms": round(_mean(second) * 1000, 4) if second else None,
+        })
+    return rows, latencies
+
+
+def schedule(strategies, sizes, fleet_sizes, games, engine="grid", seed=0, chunk_size=10):
+    """
+    Return the worker tasks of a tournament: for every grid size, fleet size and pair of
+    strategies, `games` seeds, each played once with either strategy as player 1.
+    """
+    tasks = []
+    for size, boats in itertools.product(sizes, fleet_sizes):
+        for index, (a, b) in enumerate(itertools.combinations(strategies, 2)):
+            # Distinct seeds per configuration and pairing, shared by both orientations
+            base = seed + ((size * 8 + boats) * 1000 + index) * games
+            for start in range(0, games, chunk_size):
+                seeds = range(base + start, base + min(games, start + chunk_size))
+                tasks.append((a, b, size, boats, engine, seeds))
+                tasks.append((b, a, size, boats, engine, seeds))
+    return tasks
+
+
+class ResultWriter:
+    """
+    Streams game result rows to a CSV or JSON Lines file, flushing after every chunk.
+    """
+    def __init__(self, path):
+        self.file = open(path, "w", newline="")
+        self.csv = None
+        if not path.endswith((".jsonl", ".json")):
+            self.csv = csv.DictWriter(self.file, RESULT_FIELDS)
+            self.csv.writeheader()
+
+    def write(self, rows):
+        for row in rows:
+            if self.csv is not None:
+                self.csv.writerow(row)
+            else:
+                self.file.write(json.dumps(row) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class Standings:
+    """
+    Running totals for one set of games: wins, shots-to-win and move latency per strategy, and
+    wins per ordered pair of strategies.
+    """
+    def __init__(self):
+        self.games = {}
+        self.wins = {}
+        self.shots = {}  # Strategy -> shots fired in each game it won
+        self.latencies = {}  # Strategy -> seconds per move
+        self.pairs = {}  # (strategy, opponent) -> [wins, games]
+
+    def add(self, row):
+        winner, loser = row["winner"], row["loser"]
+        for spec in (winner, loser):
+            self.games[spec] = self.games.get(spec, 0) + 1
+        self.wins[winner] = self.wins.get(winner, 0) + 1
+        self.shots.setdefault(winner, []).append(row["shots"])
+        self.pairs.setdefault((winner, loser), [0, 0])[0] += 1
+        for pair in ((winner, loser), (loser, winner)):
+            self.pairs.setdefault(pair, [0, 0])[1] += 1
+
+    def add_latencies(self, latencies):
+        for spec, values in latencies.items():
+            self.latencies.setdefault(spec, []).extend(values)
+
+    def win_rate(self, spec, opponent=None):
+        if opponent is None:
+            games = self.games.get(spec, 0)
+            return self.wins.get(spec, 0) / games if games else None
+        wins, games = self.pairs.get((spec, opponent), (0, 0))
+        return wins / games if games else None
+
+    def report(self, strategies):
+        standings = {}
+        for spec in strategies:
+            shots = sorted(self.shots.get(spec, []))
+            latencies = sorted(self.latencies.get(spec, []))
+            standings[spec] = {
+                "games": self.games.get(spec, 0),
+                "wins": self.wins.get(spec, 0),
+                "win_rate": self.win_rate(spec),
+                "shots_to_win": {
+                    "mean": _mean(shots),
+                    "p50": percentile(shots, 0.50),
+                    "p90": percentile(shots, 0.90),
+                    "p99": percentile(shots, 0.99),
+                },
+                "move_ms": {
+                    "mean": _mean(latencies) * 1000 if latencies else None,
+                    "p50": percentile(latencies, 0.50) * 1000 if latencies else None,
+                    "p90": percentile(latencies, 0.90) * 1000 if latencies else None,
+                    "p99": percentile(latencies, 0.99) * 1000 if latencies else None,
+                    "max": latencies[-1] * 1000 if latencies else None,
+                },
+            }
+        head_to_head = {spec: {opponent: self.win_rate(spec, opponent) for opponent in strategies if opponent != spec}
+                        for spec in strategies}
+        return {"standings": standings, "head_to_head": head_to_head}
+
+
+def difficulty_checks(strategies, standings, budget_ms=AI_MOVE_BUDGET_MS):
+    """
+    Check that each difficulty of a strategy module beats the next easier one head to head, and
+    that every strategy's p99 move latency fits the GUI's per-move budget.
+    """
+    checks = []
+    for module in STRATEGY_MODULES:
+        ladder = [f"{module}:{difficulty}" for difficulty in DIFFICULTIES if f"{module}:{difficulty}" in strategies]
+        for easier, harder in zip(ladder, ladder[1:]):
+            rate = standings.win_rate(harder, easier)
+            checks.append({"check": "harder", "strategy": harder, "against": easier, "value": rate,
+                           "passed": rate is not None and rate > 0.5})
+    for spec in strategies:
+        latencies = sorted(standings.latencies.get(spec, []))
+        p99 = percentile(latencies, 0.99) * 1000 if latencies else None
+        checks.append({"check": "latency", "strategy": spec, "against": f"{budget_ms} ms", "value": p99,
+                       "passed": p99 is not None and p99 <= budget_ms})
+    return checks
+
+
+def run_tournament(strategies=None, sizes=(GRID_SIZE,), fleet_sizes=FLEET_SIZES, games=100, engine="grid",
+                   workers=None, chunk_size=10, seed=None, results_path=None, progress=None):
+    """
+    Play a round-robin tournament and return its report.
+    results_path streams every game as it finishes; progress(done, total) is called after each chunk.
+    """
+    strategies = list(strategies or DEFAULT_STRATEGIES)
+    for spec in strategies:
+        parse_strategy(spec)
+    if len(set(strategies)) < 2:
+        raise ValueError("A tournament needs at least two different strategies")
+    for size, boats in itertools.product(sizes, fleet_sizes):
+        if max(fleet_for(boats)) > size:
+            raise ValueError(f"A fleet of {boats} boats does not fit on a {size}x{size} board")
+    if seed is None:
+        seed = random.randrange(2 ** 31)  # Still recorded, so the run can be repeated
+    workers = workers or multiprocessing.cpu_count()
+
+    tasks = schedule(strategies, sizes, fleet_sizes, games, engine, seed, chunk_size)
+    overall = Standings()
+    by_config = {key: Standings() for key in itertools.product(sizes, fleet_sizes)}
+    writer = ResultWriter(results_path) if results_path else None
+    start_time = time.perf_counter()
+
+    def record(rows, latencies):
+        for row in rows:
+            overall.add(row)
+            by_config[row["size"], row["boats"]].add(row)
+        overall.add_latencies(latencies)
+        if rows:
+            by_config[rows[0]["size"], rows[0]["boats"]].add_latencies(latencies)
+        if writer is not None:
+            writer.write(rows)
+
+    try:
+        if workers == 1:
+            for done, task in enumerate(tasks, 1):
+                record(*_play_chunk(task))
+                if progress:
+                    progress(done, len(tasks))
+        else:
+            with multiprocessing.Pool(workers) as pool:
+                for done, chunk in enumerate(pool.imap_unordered(_play_chunk, tasks), 1):
+                    record(*chunk)
+                    if progress:
+                        progress(done, len(tasks))
+    finally:
+        if writer is not None:
+            writer.close()
+    elapsed = time.perf_counter() - start_time
+
+    report = {
+        "strategies": strategies,
+        "sizes": list(sizes),
+        "fleet_sizes": list(fleet_sizes),
+        "games_per_pairing": 2 * games,
+        "engine": engine,
+        "seed": seed,
+        "games": sum(overall.wins.values()),
+        "elapsed_seconds": elapsed,
+    }
+    report.update(overall.report(strategies))
+    report["configurations"] = [dict(size=size, boats=boats, **by_config[size, boats].report(strategies))
+                                for size, boats in itertools.product(sizes, fleet_sizes)]
+    report["checks"] = difficulty_checks(strategies, overall)
+    return report
+
+
+def _format(value, digits=2):
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def print_report(report):
+    """
+    Print the standings, head-to-head win rates and checks of a tournament report.
+    """
+    strategies = report["strategies"]
+    print(f"{report['games']} games in {report['elapsed_seconds']:.2f}s on {report['sizes']} grids with "
+          f"{report['fleet_sizes']} boats (seed {report['seed']})")
+    width = max(len(spec) for spec in strategies)
+    print(f"{'strategy':{width}}  win rate  shots mean  p50  p90  p99  move ms mean   p50    p99    max")
+    ranked = sorted(strategies, key=lambda spec: report["standings"][spec]["win_rate"] or 0, reverse=True)
+    for spec in ranked:
+        entry = report["standings"][spec]
+        shots, move = entry["shots_to_win"], entry["move_ms"]
+        print(f"{spec:{width}}  {_format(entry['win_rate'], 3):>8}  {_format(shots['mean']):>10}  "
+              f"{shots['p50'] or '-':>3}  {shots['p90'] or '-':>3}  {shots['p99'] or '-':>3}  "
+              f"{_format(move['mean'], 3):>12}  {_format(move['p50'], 3):>5}  {_format(move['p99'], 3):>5}  "
+              f"{_format(move['max'], 3):>5}")
+
+    print("\nHead to head (row's win rate against column):")
+    print(" " * width + "".join(f"  {spec:>{width}}" for spec in ranked))
+    for spec in ranked:
+        rates = report["head_to_head"][spec]
+        print(f"{spec:{width}}" + "".join(f"  {_format(rates.get(opponent), 3) if opponent != spec else '':>{width}}"
+                                          for opponent in ranked))
+
+    print("\nChecks:")
+    for check in report["checks"]:
+        status = "ok  " if check["passed"] else "FAIL"
+        if check["check"] == "harder":
+            print(f"{status} {check['strategy']} beats {check['against']} in {_format(check['value'], 3)} of games")
+        else:
+            print(f"{status} {check['strategy']} p99 move {_format(check['value'], 3)} ms within {check['against']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a round-robin tournament between the AI strategies.")
+    parser.add_argument("--strategies", nargs="+", default=DEFAULT_STRATEGIES,
+                        help="strategy specs such as player:Hard or ai:Easy (default: all)")
+    parser.add_argument("--games", type=int, default=100,
+                        help="seeds per pairing and configuration, each played from both sides")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[GRID_SIZE], help="square grid sizes")
+    parser.add_argument("--boats", type=int, nargs="+", default=FLEET_SIZES, choices=FLEET_SIZES,
+                        help="fleet sizes to play")
+    parser.add_argument("--engine", choices=sorted(BOARD_ENGINES), default="grid", help="board implementation")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=10, help="seeds per worker task")
+    parser.add_argument("--seed", type=int, default=None, help="base random seed for reproducible runs")
+    parser.add_argument("--results", default=None, help="stream every game to this .csv or .jsonl file")
+    parser.add_argument("--report", default=None, help="write the final report to this JSON file")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    def progress(done, total):
+        print(f"\r{done}/{total} chunks", end="", flush=True)
+
+    try:
+        report = run_tournament(args.strategies, args.sizes, args.boats, args.games, args.engine, args.workers,
+                                args.chunk_size, args.seed, args.results, None if args.json else progress)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.report:
+        with open(args.report, "w") as file:
+            json.dump(report, file, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print()
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,10 @@
 import pygame
-from pygame.freetype import SysFont
+from fonts import get_sys_font, render_text
 
 def create_surface_with_text(text, font_size, text_rgb, bg_rgb):
-    """ Create a surface with the specified text written on it. """
-    font = SysFont("Courier", font_size, bold=True)
-    surface, _ = font.render(text=text, fgcolor=text_rgb, bgcolor=bg_rgb)
-    return surface.convert_alpha()
+    """ Create a surface with the specified text written on it (shared, cached by fonts). """
+    font = get_sys_font("Courier", font_size, bold=True)
+    return render_text(font, text, text_rgb, bg_rgb)
 
 class UIElement(pygame.sprite.Sprite):
     """ Represents a UI element such as a button. """